@@ -4,14 +4,44 @@ from __future__ import annotations
 
 import os
 import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 import typer
 from rich.console import Console
+from rich.filesize import decimal
+from rich.markup import escape
 from rich.panel import Panel
+from rich.progress import Progress
 from rich.table import Table
 from rich.tree import Tree
 
+from . import (
+    asyncfs,
+    catalog,
+    drift,
+    export,
+    footprint,
+    knowledge,
+    lint,
+    overlap,
+    packages,
+    payload,
+    planner,
+    scaffold,
+    sweep,
+    templating,
+    upgrade,
+    validate,
+)
+from .asyncfs import IOPool
+from .catalog import SkillCatalog, SkillRecord
+from .changeset import ChangeError, ChangeSet, changed_since
+from .registry import CliRegistry, RegistryError, builtin_registry, load_registry
+
 __version__ = "2.2.0"
 
 app = typer.Typer(
@@ -19,148 +49,22 @@ app = typer.Typer(
     help="Template-driven Agent Skill generator for 7 AI CLIs.",
     no_args_is_help=True,
 )
+knowledge_app = typer.Typer(
+    help="Index and query the knowledge/ base section by section.",
+    no_args_is_help=True,
+)
+app.add_typer(knowledge_app, name="knowledge")
 console = Console()
 
 # ── CLI Configuration ────────────────────────────────────────────────────────
 
-CLI_CONFIG: dict[str, dict] = {
-    "copilot": {
-        "name": "GitHub Copilot",
-        "folder": ".github",
-        "skills_dir": "skills",
-        "commands_dir": "agents",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": False,  # IDE-based
-    },
-    "claude": {
-        "name": "Claude Code",
-        "folder": ".claude",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "gemini": {
-        "name": "Gemini CLI",
-        "folder": ".gemini",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "{{args}}",
-        "requires_cli": True,
-    },
-    "cursor-agent": {
-        "name": "Cursor",
-        "folder": ".cursor",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": False,  # IDE-based
-    },
-    "qwen": {
-        "name": "Qwen Code",
-        "folder": ".qwen",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "{{args}}",
-        "requires_cli": True,
-    },
-    "opencode": {
-        "name": "opencode",
-        "folder": ".opencode",
-        "skills_dir": "skills",
-        "commands_dir": "command",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "codex": {
-        "name": "Codex CLI",
-        "folder": ".codex",
-        "skills_dir": "skills",
-        "commands_dir": "prompts",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "windsurf": {
-        "name": "Windsurf",
-        "folder": ".windsurf",
-        "skills_dir": "skills",
-        "commands_dir": "workflows",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": False,  # IDE-based
-    },
-    "kilocode": {
-        "name": "Kilo Code",
-        "folder": ".kilocode",
-        "skills_dir": "skills",
-        "commands_dir": "rules",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": False,  # IDE-based
-    },
-    "auggie": {
-        "name": "Auggie CLI",
-        "folder": ".augment",
-        "skills_dir": "skills",
-        "commands_dir": "rules",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "codebuddy": {
-        "name": "CodeBuddy",
-        "folder": ".codebuddy",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "qoder": {
-        "name": "Qoder CLI",
-        "folder": ".qoder",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "roo": {
-        "name": "Roo Code",
-        "folder": ".roo",
-        "skills_dir": "skills",
-        "commands_dir": "rules",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": False,  # IDE-based
-    },
-    "q": {
-        "name": "Amazon Q Developer CLI",
-        "folder": ".amazonq",
-        "skills_dir": "skills",
-        "commands_dir": "prompts",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "amp": {
-        "name": "Amp",
-        "folder": ".agents",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "shai": {
-        "name": "SHAI",
-        "folder": ".shai",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": True,
-    },
-    "bob": {
-        "name": "IBM Bob",
-        "folder": ".bob",
-        "skills_dir": "skills",
-        "commands_dir": "commands",
-        "var_syntax": "$ARGUMENTS",
-        "requires_cli": False,  # IDE-based
-    },
-}
+
+def __getattr__(name: str):
+    # CLI_CONFIG is resolved on first use through get_cli_registry(), so a
+    # broken .hefesto/clis.toml or plugin cannot break `--help` or import
+    if name == "CLI_CONFIG":
+        return get_cli_registry(get_project_root()).config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ── Utility Functions ────────────────────────────────────────────────────────
@@ -197,6 +101,18 @@ def get_templates_dir() -> Path:
     )
 
 
+def get_knowledge_dir() -> Path | None:
+    """Resolve the bundled knowledge base (source checkout or installed)."""
+    src_knowledge = Path(__file__).parent.parent.parent / "knowledge"
+    if src_knowledge.is_dir():
+        return src_knowledge
+
+    import sys
+
+    wheel_knowledge = Path(sys.prefix) / "share" / "hefesto_cli" / "knowledge"
+    return wheel_knowledge if wheel_knowledge.is_dir() else None
+
+
 def get_project_root(target_dir: Path | None = None) -> Path:
     """Find project root (looks for .git or uses current dir)."""
     current = target_dir or Path.cwd()
@@ -207,24 +123,110 @@ def get_project_root(target_dir: Path | None = None) -> Path:
     return target_dir or Path.cwd()
 
 
+def get_installer_dir() -> Path:
+    """installer/ of a source checkout (holds the scripts and payload.zip)."""
+    return Path(__file__).parent.parent.parent / "installer"
+
+
+def get_payload_archive() -> Path | None:
+    """The payload.zip shipped with Hefesto (source checkout or installed)."""
+    src_archive = get_installer_dir() / payload.ARCHIVE_NAME
+    if src_archive.is_file():
+        return src_archive
+
+    import sys
+
+    wheel_archive = Path(sys.prefix) / "share" / "hefesto_cli" / payload.ARCHIVE_NAME
+    return wheel_archive if wheel_archive.is_file() else None
+
+
+@lru_cache(maxsize=None)
+def get_cli_registry(project_root: Path) -> CliRegistry:
+    """CLI registry for a project (built-ins, entry points, .hefesto/clis.toml)."""
+    try:
+        clis = load_registry(project_root)
+        export.check_formats(clis)
+    except (RegistryError, export.ExportError) as e:
+        console.print(f"[red]-[/] Invalid CLI registry: {e}")
+        raise typer.Exit(1)
+    return clis
+
+
+async def detect_clis_async(project_root: Path, pool: IOPool) -> dict[str, Path]:
+    """Detect installed AI CLIs.
+
+    CLIs detected by their folder are looked up in one listing of the
+    project root; the remaining detection paths are probed concurrently.
+    """
+    clis = get_cli_registry(project_root)
+    paths = list({project_root / rel for _, rels in clis.probes for rel in rels})
+    entries, exists = await pool.gather(
+        [pool.scandir(project_root), pool.exists_many(paths)]
+    )
+    found = dict(zip(paths, exists))
+    probes = dict(clis.probes)
+    owners = [clis.by_folder.get(name) for name, is_dir in entries if is_dir]
+    detected = {cli_id for cli_id in owners if cli_id and cli_id not in probes}
+    detected.update(
+        cli_id
+        for cli_id, rels in probes.items()
+        if any(found[project_root / rel] for rel in rels)
+    )
+
+    return {
+        cli_id: project_root / cli["folder"]
+        for cli_id, cli in clis.config.items()
+        if cli_id in detected
+    }
+
+
 def detect_clis(project_root: Path) -> dict[str, Path]:
     """Detect installed AI CLIs by checking directories and PATH."""
-    detected = {}
+    return asyncfs.run(detect_clis_async(project_root, IOPool()))
+
+
+async def load_catalog_async(
+    project_root: Path,
+    detected_clis: dict[str, Path],
+    pool: IOPool,
+    changes: ChangeSet | None = None,
+) -> SkillCatalog:
+    """Catalog of the skills in every detected CLI, scanned concurrently.
+
+    With `changes`, only skills with changed files are probed instead of
+    listing every skills directory.
+    """
+    clis = get_cli_registry(project_root)
+    installs = catalog.installations(project_root, detected_clis, clis)
+    return await catalog.scan(installs, pool, changes)
+
 
-    for cli_id, config in CLI_CONFIG.items():
-        cli_folder = project_root / config["folder"]
+def get_changes(project_root: Path, ref: str | None) -> ChangeSet | None:
+    """Paths changed since a git ref (None when no ref was given)."""
+    if ref is None:
+        return None
+    try:
+        return changed_since(project_root, ref)
+    except ChangeError as e:
+        console.print(f"[red]-[/] Cannot compute changes: {escape(str(e))}")
+        raise typer.Exit(1)
 
-        # Special handling for Copilot
-        if cli_id == "copilot":
-            # Check for Copilot signals
-            if (project_root / ".github" / "copilot-instructions.md").exists() or (
-                project_root / ".github" / "agents"
-            ).exists():
-                detected[cli_id] = cli_folder
-        elif cli_folder.exists():
-            detected[cli_id] = cli_folder
 
-    return detected
+def touched_clis(
+    project_root: Path, detected_clis: dict[str, Path], changes: ChangeSet
+) -> dict[str, Path]:
+    """Detected CLIs whose skills or commands directory has changes."""
+    clis = get_cli_registry(project_root)
+    return {
+        cli_id: cli_path
+        for cli_id, cli_path in detected_clis.items()
+        if any(
+            changes.touches(
+                (cli_path / clis[cli_id][key]).relative_to(project_root).as_posix()
+            )
+            for key in ("skills_dir", "commands_dir")
+        )
+    }
 
 
 def get_hefesto_dir(project_root: Path) -> Path:
@@ -247,6 +249,231 @@ def get_hefesto_version(project_root: Path) -> str | None:
     return None
 
 
+TEMPLATES_TO_COPY = [
+    "skill-template.md",
+    "quality-checklist.md",
+    "cli-compatibility.md",
+    "agent-template.md",
+]
+
+
+async def _install_files_async(
+    project_root: Path,
+    templates_src: Path,
+    detected_clis: dict[str, Path],
+    pool: IOPool,
+    clis: CliRegistry | None = None,
+) -> tuple[list[Path], dict[Path, bytes]]:
+    """Directories and file contents Hefesto installs for the given CLIs."""
+    clis = clis or get_cli_registry(project_root)
+    hefesto_dir = get_hefesto_dir(project_root)
+    templates_target = hefesto_dir / "templates"
+    directories = [templates_target]
+    for cli_id, cli_path in detected_clis.items():
+        directories.append(cli_path / clis[cli_id]["skills_dir"])
+        directories.append(cli_path / clis[cli_id]["commands_dir"])
+
+    present = await pool.exists_many(templates_src / t for t in TEMPLATES_TO_COPY)
+    cmd_files = await pool.glob(templates_src / "commands", "hefesto.*.md")
+
+    sources = [templates_src / t for t, ok in zip(TEMPLATES_TO_COPY, present) if ok]
+    contents = await pool.gather(
+        pool.run(src.read_bytes) for src in [*sources, *cmd_files]
+    )
+    files = {
+        templates_target / src.name: content for src, content in zip(sources, contents)
+    }
+
+    # Each command is read and compiled once, then rendered per CLI so
+    # placeholders such as var_syntax match what that CLI expects, and
+    # written in the CLI's native format (e.g. TOML for Gemini)
+    engine = templating.TemplateEngine(
+        [templates_src / "commands", templates_src],
+        cache_dir=hefesto_dir / "cache" / "templates" if hefesto_dir.is_dir() else None,
+    )
+    compiled = {
+        cmd_file.name: engine.from_string(content.decode("utf-8"), cmd_file.name)
+        for cmd_file, content in zip(cmd_files, contents[len(sources) :])
+    }
+    try:
+        files.update(await export.export_commands(compiled, detected_clis, clis, pool))
+    except export.ExportError as e:
+        console.print(f"[red]-[/] Cannot export commands: {escape(str(e))}")
+        raise typer.Exit(1)
+    return directories, files
+
+
+async def _payload_files_async(
+    templates_src: Path, clis: CliRegistry, pool: IOPool
+) -> tuple[dict[str, bytes], dict[str, str]]:
+    """Payload members and CLI digests: what `init` renders for every CLI.
+
+    Files are rendered for a project root that does not exist, then named
+    by destination (`hefesto/...` or `clis/<id>/...`).
+    """
+    root = Path(tempfile.gettempdir()) / f"hefesto-payload-{os.getpid()}"
+    targets = {cli_id: root / cli["folder"] for cli_id, cli in clis.config.items()}
+    _, files = await _install_files_async(root, templates_src, targets, pool, clis)
+
+    members: dict[str, bytes] = {}
+    for target, content in files.items():
+        rel = target.relative_to(root)
+        if rel.parts[0] == ".hefesto":
+            members["/".join(("hefesto", *rel.parts[1:]))] = content
+            continue
+        cli_id = clis.cli_for_path(rel.as_posix())
+        cli_rel = target.relative_to(targets[cli_id]).as_posix()
+        members[f"clis/{cli_id}/{cli_rel}"] = content
+    return members, {cli_id: _payload_config(cli_id, clis) for cli_id in targets}
+
+
+def _payload_companions(members: dict[str, bytes], clis: CliRegistry) -> set[str]:
+    """Members the companion files of packed commands must appear as."""
+    expected: set[str] = set()
+    for cli_id, cli in clis.config.items():
+        native = export.emitter(cli["command_format"])
+        if native.companions is None:
+            continue
+        prefix = f"clis/{cli_id}/{cli['commands_dir']}/"
+        for member, data in members.items():
+            filename = member.removeprefix(prefix)
+            name = lint.command_name(filename) if member.startswith(prefix) else None
+            if name is None or "/" in filename:
+                continue
+            text = native.to_markdown(data.decode("utf-8", "replace"))
+            companions = native.companions(export.Command(name, text), cli)
+            expected.update(f"clis/{cli_id}/{rel}" for rel in companions)
+    return expected
+
+
+def _payload_config(cli_id: str, clis: CliRegistry) -> str:
+    """Digest of the registry fields a CLI's payload files depend on."""
+    cli = clis[cli_id]
+    context = templating.cli_context(cli_id, cli)
+    return payload.config_digest({**context, "command_format": cli["command_format"]})
+
+
+async def _install_plan_async(
+    project_root: Path,
+    templates_src: Path,
+    detected_clis: dict[str, Path],
+    pool: IOPool,
+) -> planner.Plan:
+    """Plan the templates, commands and directories `init` installs."""
+    hefesto_dir = get_hefesto_dir(project_root)
+    directories, files = await _install_files_async(
+        project_root, templates_src, detected_clis, pool
+    )
+    plan_files: dict[Path, Path | bytes] = dict(files)
+    plan_files.update(
+        upgrade.manifest_entries(files, project_root, hefesto_dir, __version__)
+    )
+
+    # Version goes last so a partial install is never reported as installed
+    plan_files[hefesto_dir / "version"] = __version__.encode()
+    return await planner.build_plan(directories, plan_files, pool)
+
+
+async def _upgrade_plan_async(
+    project_root: Path, pool: IOPool, force: bool
+) -> upgrade.UpgradeResult:
+    """Plan an upgrade of every CLI that has Hefesto commands installed."""
+    hefesto_dir = get_hefesto_dir(project_root)
+    clis = get_cli_registry(project_root)
+    detected_clis = await detect_clis_async(project_root, pool)
+    installed = await pool.gather(
+        pool.glob(cli_path / clis[cli_id]["commands_dir"], "hefesto.*")
+        for cli_id, cli_path in detected_clis.items()
+    )
+    targets = {
+        cli_id: cli_path
+        for (cli_id, cli_path), cmd_files in zip(detected_clis.items(), installed)
+        if cmd_files
+    } or detected_clis
+
+    _, files = await _install_files_async(
+        project_root, get_templates_dir(), targets, pool
+    )
+    return await upgrade.plan_upgrade(
+        project_root, hefesto_dir, files, __version__, pool, force
+    )
+
+
+def _print_plan(
+    plan: planner.Plan, project_root: Path, show_diffs: bool = True
+) -> None:
+    """Print a plan as a list of operations followed by file diffs."""
+    markers = {
+        planner.MKDIR: "[green]+[/] mkdir ",
+        planner.CREATE: "[green]+[/] create",
+        planner.UPDATE: "[yellow]~[/] update",
+    }
+    for op in plan.operations:
+        rel = op.target.relative_to(project_root).as_posix()
+        console.print(f"  {markers[op.kind]} {rel}", highlight=False, soft_wrap=True)
+
+    for op in plan.of_kind(planner.UPDATE) if show_diffs else []:
+        console.print()
+        for line in planner.render_diff(op, project_root):
+            style = {"+": "green", "-": "red", "@": "cyan"}.get(line[:1], "dim")
+            console.print(
+                line, style=style, markup=False, highlight=False, soft_wrap=True
+            )
+
+    console.print(
+        f"\n[bold]{len(plan.operations)}[/] change(s), "
+        f"[dim]{len(plan.unchanged)} file(s) unchanged[/]"
+    )
+
+
+async def _status_async(
+    project_root: Path,
+    templates_dir: Path,
+    required_templates: list[str],
+    pool: IOPool,
+    changes: ChangeSet | None = None,
+) -> dict:
+    """Gather everything `check` reports in one concurrent pass.
+
+    Returns ``{"templates": [present, ...], "clis": {cli_id: (skills_dir |
+    None, CommandHealth, skill_count)}}``. With `changes`, only CLIs with
+    changed skills or commands are reported and only changed skills counted.
+    """
+    templates, detected_clis, packaged = await pool.gather(
+        [
+            pool.exists_many(templates_dir / t for t in required_templates),
+            detect_clis_async(project_root, pool),
+            pool.glob(get_templates_dir() / "commands", lint.COMMAND_GLOB),
+        ]
+    )
+    if changes is not None:
+        detected_clis = touched_clis(project_root, detected_clis, changes)
+
+    clis = get_cli_registry(project_root)
+    expected_commands = [lint.command_name(path.name) for path in packaged]
+
+    cli_ids = list(detected_clis)
+    skills_dirs = [detected_clis[c] / clis[c]["skills_dir"] for c in cli_ids]
+    exists, skills, health = await pool.gather(
+        [
+            pool.exists_many(skills_dirs),
+            load_catalog_async(project_root, detected_clis, pool, changes),
+            lint.lint_clis(project_root, detected_clis, clis, expected_commands, pool),
+        ]
+    )
+    return {
+        "templates": templates,
+        "clis": {
+            cli_id: (
+                skills_dir if ok else None,
+                health[cli_id],
+                skills.count(cli_id),
+            )
+            for cli_id, skills_dir, ok in zip(cli_ids, skills_dirs, exists)
+        },
+    }
+
+
 # ── Commands ─────────────────────────────────────────────────────────────────
 
 
@@ -258,13 +485,20 @@ def init(
     ai_cli: str | None = typer.Option(
         None, "--ai", help="Specific AI CLI to install to (claude, gemini, etc.)"
     ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show planned changes as a diff without writing"
+    ),
 ):
     """
     Bootstrap Hefesto: detect CLIs, create directories, install commands.
 
+    Changes are planned against the current tree first and then applied
+    atomically, so an interrupted run can simply be repeated.
+
     This complements the bash/PowerShell installer scripts.
     """
     project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
 
     console.print(
         Panel(
@@ -280,6 +514,10 @@ def init(
         console.print(
             f"\n[yellow]![/] Hefesto v{installed_version} is already installed."
         )
+        if installed_version != __version__:
+            console.print(
+                f"\n[dim]Run `hefesto upgrade` to update to v{__version__}.[/]"
+            )
         console.print("\n[dim]Use `hefesto check` to verify installation.[/]")
         return
 
@@ -299,7 +537,7 @@ def init(
     table.add_column("Status", justify="center")
 
     for cli_id, cli_path in detected_clis.items():
-        cli_name = CLI_CONFIG[cli_id]["name"]
+        cli_name = clis[cli_id]["name"]
         status = "[green]+[/]" if cli_path.exists() else "[yellow]new[/]"
         table.add_row(cli_name, str(cli_path.relative_to(project_root)), status)
 
@@ -312,52 +550,36 @@ def init(
             raise typer.Exit(1)
         detected_clis = {ai_cli: detected_clis[ai_cli]}
 
-    # Create .hefesto directory
-    console.print("\n[bold]Creating .hefesto directory...[/]")
+    # Plan .hefesto directory, templates and commands against disk state
     hefesto_dir = get_hefesto_dir(project_root)
-    templates_target = hefesto_dir / "templates"
-    templates_target.mkdir(parents=True, exist_ok=True)
-
-    # Copy templates
     templates_src = get_templates_dir()
-    templates_to_copy = [
-        "skill-template.md",
-        "quality-checklist.md",
-        "cli-compatibility.md",
-        "agent-template.md",
-    ]
+    pool = IOPool()
+    plan = asyncfs.run(
+        _install_plan_async(project_root, templates_src, detected_clis, pool)
+    )
 
-    for template_file in templates_to_copy:
-        src = templates_src / template_file
-        if src.exists():
-            shutil.copy(src, templates_target / template_file)
-            console.print(f"  [green]+[/] {template_file}")
+    if dry_run:
+        console.print("\n[bold]Planned changes (dry run):[/]")
+        _print_plan(plan, project_root)
+        return
+
+    # Stage everything, then rename into place
+    asyncfs.run(planner.apply_plan(plan, project_root, pool))
 
-    # Write version
-    (hefesto_dir / "version").write_text(__version__)
+    console.print("\n[bold]Creating .hefesto directory...[/]")
+    for template_file in TEMPLATES_TO_COPY:
+        if (hefesto_dir / "templates" / template_file).exists():
+            console.print(f"  [green]+[/] {template_file}")
     console.print(f"  [green]+[/] version ({__version__})")
 
-    # Create skills directories and install commands
     console.print("\n[bold]Installing commands and creating skills directories...[/]")
+    for cli_id in detected_clis:
+        console.print(f"  [green]+[/] {clis[cli_id]['name']}")
 
-    for cli_id, cli_path in detected_clis.items():
-        cli_name = CLI_CONFIG[cli_id]["name"]
-        skills_dir = cli_path / CLI_CONFIG[cli_id]["skills_dir"]
-        commands_dir = cli_path / CLI_CONFIG[cli_id]["commands_dir"]
-
-        # Create skills directory
-        skills_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create commands directory
-        commands_dir.mkdir(parents=True, exist_ok=True)
-
-        # Install slash commands
-        commands_src = templates_src / "commands"
-        if commands_src.exists():
-            for cmd_file in commands_src.glob("hefesto.*.md"):
-                shutil.copy(cmd_file, commands_dir / cmd_file.name)
-
-        console.print(f"  [green]+[/] {cli_name}")
+    console.print(
+        f"\n[dim]{len(plan.operations)} change(s) applied, "
+        f"{len(plan.unchanged)} file(s) already up to date[/]"
+    )
 
     # Success summary
     console.print(
@@ -376,170 +598,1372 @@ def init(
     )
 
 
-@app.command()
-def check(
+@app.command(name="upgrade")
+def upgrade_install(
     target_dir: Path | None = typer.Argument(
         None, help="Target directory (defaults to current directory)"
     ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show planned changes as a diff without writing"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Overwrite locally modified files instead of merging"
+    ),
 ):
     """
-    Show Hefesto installation status and detected CLIs.
+    Upgrade installed templates and commands to this Hefesto version.
+
+    Only files that changed are rewritten. Locally modified files are
+    three-way merged; conflicting files are kept and reported.
     """
     project_root = get_project_root(target_dir)
 
     console.print(
         Panel(
-            "[bold cyan]Hefesto Status[/]",
-            title="Check",
+            f"[bold cyan]Hefesto Skill Generator v{__version__}[/]",
+            title="Upgrade",
             border_style="cyan",
         )
     )
 
-    # Check installation
-    hefesto_dir = get_hefesto_dir(project_root)
-
     if not is_hefesto_installed(project_root):
         console.print("\n[red]-[/] Hefesto is not installed in this project.")
         console.print("\n[dim]Run: hefesto init[/]")
         raise typer.Exit(1)
 
     installed_version = get_hefesto_version(project_root)
-    console.print(f"\n[green]+[/] Hefesto v{installed_version} installed")
-
-    # Check templates
-    console.print("\n[bold]Templates:[/]")
-    templates_dir = hefesto_dir / "templates"
-    required_templates = [
-        "skill-template.md",
-        "quality-checklist.md",
-        "cli-compatibility.md",
-    ]
+    console.print(f"\n[bold]Installed:[/] v{installed_version}")
 
-    for template in required_templates:
-        template_path = templates_dir / template
-        if template_path.exists():
-            console.print(f"  [green]+[/] {template}")
-        else:
-            console.print(f"  [red]-[/] {template} [dim](missing)[/]")
+    pool = IOPool()
+    result = asyncfs.run(_upgrade_plan_async(project_root, pool, force))
 
-    # Detect CLIs
-    console.print("\n[bold]Detected CLIs:[/]")
-    detected_clis = detect_clis(project_root)
+    if result.plan.is_empty and not result.conflicts:
+        console.print(f"\n[green]+[/] Already up to date (v{__version__}).")
+        return
 
-    if not detected_clis:
-        console.print("  [yellow]![/] No AI CLIs detected")
-    else:
-        table = Table(show_header=True, header_style="bold cyan")
-        table.add_column("CLI", style="cyan")
-        table.add_column("Skills Dir", style="dim")
-        table.add_column("Commands", justify="center")
-        table.add_column("Skills", justify="center")
-
-        for cli_id, cli_path in detected_clis.items():
-            cli_name = CLI_CONFIG[cli_id]["name"]
-            skills_dir = cli_path / CLI_CONFIG[cli_id]["skills_dir"]
-            commands_dir = cli_path / CLI_CONFIG[cli_id]["commands_dir"]
-
-            # Count commands
-            cmd_count = 0
-            if commands_dir.exists():
-                cmd_files = list(commands_dir.glob("hefesto.*.md"))
-                cmd_count = len(cmd_files)
-
-            # Count skills
-            skill_count = 0
-            if skills_dir.exists():
-                skill_count = len(
-                    [
-                        d
-                        for d in skills_dir.iterdir()
-                        if d.is_dir() and (d / "SKILL.md").exists()
-                    ]
-                )
+    console.print(
+        "\n[bold]Planned changes (dry run):[/]" if dry_run else "\n[bold]Changes:[/]"
+    )
+    _print_plan(result.plan, project_root, show_diffs=dry_run)
 
-            skills_path = (
-                str(skills_dir.relative_to(project_root))
-                if skills_dir.exists()
-                else "[dim]missing[/]"
-            )
-            table.add_row(
-                cli_name,
-                skills_path,
-                f"[cyan]{cmd_count}[/]/7" if cmd_count > 0 else "[dim]0[/]/7",
-                f"[green]{skill_count}[/]" if skill_count > 0 else "[dim]0[/]",
-            )
+    for path in result.merged:
+        rel = path.relative_to(project_root).as_posix()
+        console.print(f"  [cyan]~[/] {rel} [dim](merged with local changes)[/]")
+    for path in result.conflicts:
+        rel = path.relative_to(project_root).as_posix()
+        console.print(
+            f"  [red]![/] {rel} [dim](locally modified, kept; --force to overwrite)[/]"
+        )
 
-        console.print(table)
+    if dry_run:
+        return
 
-    # Show next steps
-    console.print(
-        f"\n[bold]Next steps:[/]\n"
-        f'  - [cyan]/hefesto.create "description"[/] - Create a skill\n'
-        f"  - [cyan]/hefesto.list[/] - List all skills\n"
-        f"  - [cyan]/hefesto.validate skill-name[/] - Validate a skill"
-    )
+    asyncfs.run(planner.apply_plan(result.plan, project_root, pool))
+    console.print(f"\n[green]+[/] Upgraded to v{__version__}")
 
 
-@app.command(name="list")
-def list_skills(
+@app.command(name="install-payload")
+def install_payload(
     target_dir: Path | None = typer.Argument(
         None, help="Target directory (defaults to current directory)"
     ),
+    archive: Path | None = typer.Option(
+        None,
+        "--archive",
+        help="Payload archive (defaults to the payload.zip shipped with Hefesto)",
+    ),
+    ai_cli: str | None = typer.Option(
+        None, "--ai", help="Specific AI CLI to install to (claude, gemini, etc.)"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show planned changes without writing"
+    ),
 ):
     """
-    List all installed skills across detected CLIs.
+    Install the installer payload archive into every detected CLI.
+
+    Files already identical to the archive are skipped without being
+    decompressed; the rest are extracted in parallel and applied
+    atomically, and recorded in .hefesto/manifest.json as `init` does, so
+    `upgrade` can merge against them. CLIs are detected by their folders
+    and, like the old install scripts did, by their executable on PATH.
+    install.sh and install.ps1 call this command. Without --archive the
+    bundled payload.zip is used; an installation that lacks it builds one
+    from its templates.
     """
+    if archive is not None:
+        _install_payload(target_dir, archive, ai_cli, dry_run)
+        return
+    with _bundled_payload() as archive:
+        _install_payload(target_dir, archive, ai_cli, dry_run)
+
+
+@contextmanager
+def _bundled_payload() -> Iterator[Path]:
+    """The shipped payload.zip, or a temporary one built like pack-payload."""
+    archive = get_payload_archive()
+    if archive is not None:
+        yield archive
+        return
+    with tempfile.TemporaryDirectory(prefix="hefesto-payload-") as tmp:
+        archive = Path(tmp) / payload.ARCHIVE_NAME
+        try:
+            members, configs = asyncfs.run(
+                _payload_files_async(get_templates_dir(), builtin_registry(), IOPool())
+            )
+            payload.pack(members, configs, archive, __version__)
+        except (RegistryError, payload.PayloadError, OSError) as e:
+            console.print(f"[red]-[/] Cannot build payload: {escape(str(e))}")
+            raise typer.Exit(1)
+        yield archive
+
+
+def _install_payload(
+    target_dir: Path | None, archive: Path, ai_cli: str | None, dry_run: bool
+) -> None:
     project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
+    hefesto_dir = get_hefesto_dir(project_root)
+
+    try:
+        index = payload.read_index(archive)
+    except payload.PayloadError as e:
+        console.print(f"[red]-[/] {escape(str(e))}")
+        raise typer.Exit(1)
 
     console.print(
         Panel(
-            "[bold cyan]Installed Skills[/]",
-            title="List",
+            f"[bold cyan]Hefesto Skill Generator v{index.version}[/]",
+            title="Install Payload",
             border_style="cyan",
         )
     )
 
-    detected_clis = detect_clis(project_root)
-
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+    # As the install scripts always did, a CLI on PATH counts even before
+    # its project folder exists
+    for cli_id, cli in clis.config.items():
+        executable = cli.get("executable")
+        if cli_id not in detected_clis and executable and shutil.which(executable):
+            detected_clis[cli_id] = project_root / cli["folder"]
     if not detected_clis:
         console.print("\n[yellow]![/] No AI CLIs detected.")
-        console.print("\n[dim]Run: hefesto init[/]")
+        console.print("[dim]Creating .claude/ as default...[/]")
+        detected_clis = {"claude": project_root / ".claude"}
+    if ai_cli:
+        if ai_cli not in detected_clis:
+            console.print(f"\n[red]-[/] CLI '{ai_cli}' not detected.")
+            raise typer.Exit(1)
+        detected_clis = {ai_cli: detected_clis[ai_cli]}
+
+    # Files rendered for another definition of a CLI (e.g. one overridden in
+    # .hefesto/clis.toml) would not match what `init` and `upgrade` render
+    shipped = {}
+    for cli_id, cli_path in detected_clis.items():
+        if index.configs.get(cli_id) == _payload_config(cli_id, clis):
+            shipped[cli_id] = cli_path
+        elif cli_id in index.configs:
+            console.print(
+                f"[yellow]![/] Payload does not match the registry entry of "
+                f"{clis[cli_id]['name']}, creating its skills directory only "
+                "[dim](run: hefesto init)[/]"
+            )
+        else:
+            console.print(
+                f"[yellow]![/] No payload for {clis[cli_id]['name']}, "
+                "creating its skills directory only"
+            )
+
+    destinations = index.targets(project_root, shipped)
+    digests = {
+        path.relative_to(project_root).as_posix(): index.files[member][1]
+        for member, path in destinations.items()
+    }
+    wanted = sorted(set(digests.values()))
+    objects = [hefesto_dir / upgrade.OBJECTS_DIR / digest for digest in wanted]
+    try:
+        changed, present = asyncfs.run(
+            pool.gather(
+                [
+                    payload.changed_members(index, destinations, pool),
+                    pool.exists_many(objects),
+                ]
+            )
+        )
+        # Changed files and missing upgrade bases share decompressed objects
+        missing = [digest for digest, ok in zip(wanted, present) if not ok]
+        needed = {index.files[member][1] for member in changed}.union(missing)
+        contents = asyncfs.run(payload.read_objects(archive, sorted(needed), pool))
+    except payload.PayloadError as e:
+        console.print(f"[red]-[/] {escape(str(e))}")
         raise typer.Exit(1)
 
-    # Collect all skills
-    all_skills = {}  # skill_name -> [cli_ids]
+    directories = [
+        cli_path / clis[cli_id]["skills_dir"]
+        for cli_id, cli_path in detected_clis.items()
+    ]
+    files: dict[Path, Path | bytes] = {
+        destinations[member]: contents[index.files[member][1]] for member in changed
+    }
+    for digest in missing:
+        files[hefesto_dir / upgrade.OBJECTS_DIR / digest] = contents[digest]
+    recorded = upgrade.load_manifest(hefesto_dir)["files"]
+    files[hefesto_dir / upgrade.MANIFEST_FILE] = upgrade.dump_manifest(
+        {**recorded, **digests}, index.version
+    )
+    # Version goes last so a partial install is never reported as installed
+    files[hefesto_dir / "version"] = index.version.encode()
+    plan = asyncfs.run(planner.build_plan(directories, files, pool))
+    changed_paths = {destinations[member] for member in changed}
+    plan.unchanged[:0] = [
+        path for path in destinations.values() if path not in changed_paths
+    ]
 
-    for cli_id, cli_path in detected_clis.items():
-        skills_dir = cli_path / CLI_CONFIG[cli_id]["skills_dir"]
-        if not skills_dir.exists():
-            continue
+    if dry_run:
+        console.print("\n[bold]Planned changes (dry run):[/]")
+        _print_plan(plan, project_root, show_diffs=False)
+        return
+
+    asyncfs.run(planner.apply_plan(plan, project_root, pool))
+    console.print("\n[bold]Applied changes:[/]")
+    _print_plan(plan, project_root, show_diffs=False)
+    console.print(
+        f"\n[green]+[/] Hefesto v{index.version} installed in "
+        f"{len(detected_clis)} CLI(s)"
+    )
 
-        for skill_dir in skills_dir.iterdir():
-            if skill_dir.is_dir() and (skill_dir / "SKILL.md").exists():
-                skill_name = skill_dir.name
-                if skill_name not in all_skills:
-                    all_skills[skill_name] = []
-                all_skills[skill_name].append(cli_id)
 
-    if not all_skills:
-        console.print("\n[dim]No skills installed yet.[/]")
-        console.print("\n[dim]Create your first skill:[/]")
-        console.print('  [cyan]/hefesto.create "description"[/]')
+@app.command(name="pack-payload")
+def pack_payload(
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Archive to write (default: installer/payload.zip)"
+    ),
+    check: bool = typer.Option(
+        False,
+        "--check",
+        help="Only verify the archive matches the templates; exit 1 if stale",
+    ),
+):
+    """
+    Build the installer payload archive from templates_hefesto/.
+
+    Commands are rendered for every built-in CLI exactly as `hefesto init`
+    renders them, so the payload never drifts from what init and upgrade
+    install. CI runs --check to catch a payload.zip left stale.
+    """
+    output = output or get_installer_dir() / payload.ARCHIVE_NAME
+    try:
+        clis = builtin_registry()
+    except RegistryError as e:
+        console.print(f"[red]-[/] Invalid CLI registry: {escape(str(e))}")
+        raise typer.Exit(1)
+    members, configs = asyncfs.run(
+        _payload_files_async(get_templates_dir(), clis, IOPool())
+    )
+
+    if check:
+        try:
+            index, _ = payload.build(members, configs, __version__)
+            current = payload.read_index(output)
+        except payload.PayloadError as e:
+            console.print(f"[red]-[/] {escape(str(e))}")
+            raise typer.Exit(1)
+        # Emitters with companion files (Copilot's prompts) must have them
+        # packed next to every command, whatever else is stale
+        missing = sorted(_payload_companions(members, clis) - current.files.keys())
+        if missing:
+            console.print(f"[red]-[/] {output} lacks companion files:")
+            for member in missing:
+                console.print(f"  [yellow]~[/] {escape(member)}", highlight=False)
+            raise typer.Exit(1)
+        if current != index:
+            stale = sorted(
+                m
+                for m in index.files.keys() | current.files.keys()
+                if index.files.get(m) != current.files.get(m)
+            )
+            console.print(f"[red]-[/] {output} is stale; run: hefesto pack-payload")
+            for member in stale:
+                console.print(f"  [yellow]~[/] {escape(member)}", highlight=False)
+            if current.version != index.version:
+                console.print(
+                    f"  [yellow]~[/] version {current.version} != {index.version}"
+                )
+            raise typer.Exit(1)
+        console.print(f"[green]+[/] {output} is up to date")
         return
 
-    # Display skills tree
-    tree = Tree("[bold cyan]Skills[/]")
+    try:
+        index = payload.pack(members, configs, output, __version__)
+    except (payload.PayloadError, OSError) as e:
+        console.print(f"[red]-[/] Cannot pack payload: {escape(str(e))}")
+        raise typer.Exit(1)
+    console.print(
+        f"[green]+[/] {output} [dim]({len(index.files)} file(s), "
+        f"{output.stat().st_size // 1024} KB)[/]"
+    )
 
-    for skill_name in sorted(all_skills.keys()):
-        cli_ids = all_skills[skill_name]
-        cli_names = [CLI_CONFIG[cli_id]["name"] for cli_id in cli_ids]
 
-        skill_node = tree.add(f"[green]{skill_name}[/]")
-        skill_node.add(f"[dim]Installed in: {', '.join(cli_names)}[/]")
+@app.command(name="scaffold")
+def scaffold_skills(
+    manifest: Path = typer.Option(
+        ..., "--manifest", "-m", help="TOML manifest listing the skills to create"
+    ),
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    ai_cli: str | None = typer.Option(
+        None, "--ai", help="Specific AI CLI to scaffold into (claude, gemini, etc.)"
+    ),
+):
+    """
+    Create many skills at once from a manifest, in every detected CLI.
 
-    console.print("\n")
-    console.print(tree)
-    console.print(f"\n[bold]Total:[/] {len(all_skills)} skill(s)")
+    Skills are written in atomic batches and recorded in a journal, so an
+    interrupted run resumes where it stopped. Existing skills are skipped.
+    """
+    project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
+
+    try:
+        specs = scaffold.load_manifest(manifest)
+    except scaffold.ScaffoldError as e:
+        console.print(f"[red]-[/] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+    if ai_cli:
+        if ai_cli not in detected_clis:
+            console.print(f"\n[red]-[/] CLI '{ai_cli}' not detected.")
+            raise typer.Exit(1)
+        detected_clis = {ai_cli: detected_clis[ai_cli]}
+    if not detected_clis:
+        console.print("\n[yellow]![/] No AI CLIs detected.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+
+    skills_dirs = [
+        cli_path / clis[cli_id]["skills_dir"]
+        for cli_id, cli_path in detected_clis.items()
+    ]
+    journal = scaffold.Journal.for_manifest(get_hefesto_dir(project_root), manifest)
+    pending = [spec for spec in specs if spec.name not in journal.done]
+    if len(pending) < len(specs):
+        console.print(
+            f"[dim]Resuming: {len(specs) - len(pending)} skill(s) already done[/]"
+        )
+
+    created = skipped = 0
+    with Progress(console=console, transient=True) as progress:
+        task = progress.add_task("Scaffolding skills", total=len(pending))
+        for i in range(0, len(pending), scaffold.BATCH_SIZE):
+            batch = pending[i : i + scaffold.BATCH_SIZE]
+            result = asyncfs.run(scaffold.plan_batch(batch, skills_dirs, pool))
+            asyncfs.run(planner.apply_plan(result.plan, project_root, pool))
+            journal.mark([spec.name for spec in batch])
+
+            created += len(batch) * len(skills_dirs) - len(result.skipped)
+            skipped += len(result.skipped)
+            progress.advance(task, len(batch))
+    journal.clear()
+
+    cli_names = ", ".join(clis[cli_id]["name"] for cli_id in detected_clis)
+    console.print(
+        f"[green]+[/] Scaffolded {len(pending)} skill(s) into {cli_names}: "
+        f"{created} created, {skipped} already existed"
+    )
+
+
+@app.command()
+def check(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    changed_since: str | None = typer.Option(
+        None,
+        "--changed-since",
+        help="Only consider skills and commands changed since this git ref",
+    ),
+):
+    """
+    Show Hefesto installation status and detected CLIs.
+    """
+    project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
+    changes = get_changes(project_root, changed_since)
+
+    console.print(
+        Panel(
+            "[bold cyan]Hefesto Status[/]",
+            title="Check",
+            border_style="cyan",
+        )
+    )
+
+    # Check installation
+    hefesto_dir = get_hefesto_dir(project_root)
+
+    if not is_hefesto_installed(project_root):
+        console.print("\n[red]-[/] Hefesto is not installed in this project.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+
+    installed_version = get_hefesto_version(project_root)
+    console.print(f"\n[green]+[/] Hefesto v{installed_version} installed")
+
+    # Check templates
+    console.print("\n[bold]Templates:[/]")
+    templates_dir = hefesto_dir / "templates"
+    required_templates = [
+        "skill-template.md",
+        "quality-checklist.md",
+        "cli-compatibility.md",
+    ]
+
+    status = asyncfs.run(
+        _status_async(
+            project_root, templates_dir, required_templates, IOPool(), changes
+        )
+    )
+
+    for template, present in zip(required_templates, status["templates"]):
+        if present:
+            console.print(f"  [green]+[/] {template}")
+        else:
+            console.print(f"  [red]-[/] {template} [dim](missing)[/]")
+
+    # Detect CLIs
+    if changes is None:
+        console.print("\n[bold]Detected CLIs:[/]")
+    else:
+        console.print(f"\n[bold]CLIs changed since {escape(changes.ref)}:[/]")
+    detected_clis = status["clis"]
+
+    if not detected_clis:
+        console.print(
+            "  [yellow]![/] No AI CLIs detected"
+            if changes is None
+            else "  [dim]No changes to skills or commands[/]"
+        )
+    else:
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("CLI", style="cyan")
+        table.add_column("Skills Dir", style="dim")
+        table.add_column("Commands", justify="center")
+        table.add_column("Skills" if changes is None else "Changed", justify="center")
+
+        for cli_id, (skills_dir, health, skill_count) in detected_clis.items():
+            cli_name = clis[cli_id]["name"]
+            skills_path = (
+                str(skills_dir.relative_to(project_root))
+                if skills_dir is not None
+                else "[dim]missing[/]"
+            )
+            commands = f"{health.found}/{health.expected}"
+            if health.ok:
+                commands = f"[green]{commands}[/]"
+            elif health.found:
+                commands = f"[yellow]{commands} ![/]"
+            else:
+                commands = f"[dim]{commands}[/]"
+            table.add_row(
+                cli_name,
+                skills_path,
+                commands,
+                f"[green]{skill_count}[/]" if skill_count > 0 else "[dim]0[/]",
+            )
+
+        console.print(table)
+
+        # Command health details (skip CLIs with no commands installed)
+        for cli_id, (_, health, _) in detected_clis.items():
+            if health.found and health.issues:
+                console.print(f"\n[yellow]![/] {clis[cli_id]['name']} commands:")
+                for issue in health.issues:
+                    console.print(f"  [dim]-[/] {issue}", highlight=False)
+
+    # Show next steps
+    console.print(
+        f"\n[bold]Next steps:[/]\n"
+        f'  - [cyan]/hefesto.create "description"[/] - Create a skill\n'
+        f"  - [cyan]/hefesto.list[/] - List all skills\n"
+        f"  - [cyan]/hefesto.validate skill-name[/] - Validate a skill"
+    )
+
+
+@app.command(name="list")
+def list_skills(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    changed_since: str | None = typer.Option(
+        None,
+        "--changed-since",
+        help="Only consider skills changed since this git ref",
+    ),
+):
+    """
+    List all installed skills across detected CLIs.
+    """
+    project_root = get_project_root(target_dir)
+    changes = get_changes(project_root, changed_since)
+
+    console.print(
+        Panel(
+            "[bold cyan]Installed Skills[/]",
+            title="List",
+            border_style="cyan",
+        )
+    )
+
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+
+    if not detected_clis:
+        console.print("\n[yellow]![/] No AI CLIs detected.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+
+    skills = asyncfs.run(load_catalog_async(project_root, detected_clis, pool, changes))
+
+    if not skills and changes is not None:
+        console.print(f"\n[dim]No skills changed since {escape(changes.ref)}.[/]")
+        return
+    if not skills:
+        console.print("\n[dim]No skills installed yet.[/]")
+        console.print("\n[dim]Create your first skill:[/]")
+        console.print('  [cyan]/hefesto.create "description"[/]')
+        return
+
+    # Display skills tree
+    tree = Tree("[bold cyan]Skills[/]")
+
+    for skill_name in skills:
+        cli_names = [record.installation.name for record in skills.copies(skill_name)]
+
+        skill_node = tree.add(f"[green]{skill_name}[/]")
+        skill_node.add(f"[dim]Installed in: {', '.join(cli_names)}[/]")
+
+    console.print("\n")
+    console.print(tree)
+    scope = "" if changes is None else f" changed since {escape(changes.ref)}"
+    console.print(f"\n[bold]Total:[/] {len(skills)} skill(s){scope}")
+
+
+@app.command(name="diff")
+def diff_skills(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    skill: list[str] | None = typer.Option(
+        None, "--skill", "-s", help="Only compare these skills (repeatable)"
+    ),
+    canonical: str | None = typer.Option(
+        None, "--canonical", help="CLI holding the reference copy (default: claude)"
+    ),
+    patch: bool = typer.Option(
+        False, "--patch", "-p", help="Show a diff for each modified file"
+    ),
+):
+    """
+    Report skills whose copies have drifted apart between CLIs.
+
+    Each copy is compared with the canonical one; differences every CLI is
+    expected to have (argument placeholder, skills path) are ignored.
+    Exits with status 1 when drift is found.
+    """
+    project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
+
+    console.print(
+        Panel(
+            "[bold cyan]Skill Drift[/]",
+            title="Diff",
+            border_style="cyan",
+        )
+    )
+
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+    if not detected_clis:
+        console.print("\n[yellow]![/] No AI CLIs detected.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+    if canonical and canonical not in detected_clis:
+        console.print(f"\n[red]-[/] CLI '{canonical}' not detected.")
+        raise typer.Exit(1)
+
+    skills = asyncfs.run(load_catalog_async(project_root, detected_clis, pool))
+    if skill:
+        for missing in sorted(set(skill) - set(skills)):
+            console.print(f"[yellow]![/] Skill '{missing}' not found")
+        skills = skills.select(skill)
+    shared = [copies for copies in map(skills.copies, skills) if len(copies) > 1]
+    records = [record for copies in shared for record in copies]
+    trees = asyncfs.run(drift.build_trees(project_root, records, clis, pool))
+
+    drifted = 0
+    for name in sorted(trees):
+        copies = trees[name]
+        base = drift.pick_canonical(list(copies), canonical)
+        result = drift.compare(name, copies, base, clis)
+        if not result.drifted:
+            continue
+        drifted += 1
+        console.print(
+            f"\n[yellow]![/] [bold]{name}[/] [dim](vs {clis[base]['name']})[/]"
+        )
+        for cli_id in result.drifted:
+            console.print(f"    {clis[cli_id]['name']}")
+            for rel in result.modified.get(cli_id, []):
+                console.print(f"      [yellow]~[/] {rel}", highlight=False)
+            for rel in result.missing.get(cli_id, []):
+                console.print(
+                    f"      [red]-[/] {rel} [dim](missing)[/]", highlight=False
+                )
+            for rel in result.extra.get(cli_id, []):
+                console.print(
+                    f"      [green]+[/] {rel} [dim](extra)[/]", highlight=False
+                )
+            for rel in result.modified.get(cli_id, []) if patch else []:
+                console.print()
+                for line in drift.render_patch(rel, copies[base], copies[cli_id], clis):
+                    style = {"+": "green", "-": "red", "@": "cyan"}.get(line[:1], "dim")
+                    console.print(
+                        line, style=style, markup=False, highlight=False, soft_wrap=True
+                    )
+
+    single = len(skills) - len(shared)
+    console.print(
+        f"\n[bold]{drifted}[/] drifted, "
+        f"[dim]{len(shared) - drifted} in sync, {single} in a single CLI[/]"
+    )
+    if drifted:
+        raise typer.Exit(1)
+
+
+@app.command(name="validate")
+def validate_skills(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    skill: list[str] | None = typer.Option(
+        None, "--skill", "-s", help="Only validate these skills (repeatable)"
+    ),
+    changed_since: str | None = typer.Option(
+        None,
+        "--changed-since",
+        help="Only validate skills changed since this git ref",
+    ),
+):
+    """
+    Validate SKILL.md frontmatter of every skill copy in every detected CLI.
+
+    Exits with status 1 when any copy is invalid.
+    """
+    project_root = get_project_root(target_dir)
+    changes = get_changes(project_root, changed_since)
+
+    console.print(
+        Panel(
+            "[bold cyan]Skill Validation[/]",
+            title="Validate",
+            border_style="cyan",
+        )
+    )
+
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+    if not detected_clis:
+        console.print("\n[yellow]![/] No AI CLIs detected.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+
+    skills = asyncfs.run(load_catalog_async(project_root, detected_clis, pool, changes))
+    if skill:
+        skills = skills.select(skill)
+
+    if not skills:
+        scope = "" if changes is None else f" changed since {escape(changes.ref)}"
+        console.print(f"\n[dim]No skills{scope} to validate.[/]")
+        return
+
+    records = list(skills.records())
+    results = asyncfs.run(validate.validate_many([r.path for r in records], pool))
+    by_skill: dict[str, list[tuple[SkillRecord, list[str]]]] = {}
+    for record, issues in zip(records, results):
+        by_skill.setdefault(record.name, []).append((record, issues))
+
+    invalid = 0
+    console.print()
+    for name in sorted(by_skill):
+        failures = [(record, issues) for record, issues in by_skill[name] if issues]
+        if not failures:
+            console.print(f"  [green]+[/] {name}")
+            continue
+        invalid += 1
+        console.print(f"  [red]-[/] {name}")
+        for record, issues in failures:
+            for issue in issues:
+                console.print(
+                    f"      [dim]{record.rel}:[/] {escape(issue)}", highlight=False
+                )
+
+    console.print(
+        f"\n[bold]{len(by_skill) - invalid}[/] valid, [bold]{invalid}[/] invalid"
+    )
+    if invalid:
+        raise typer.Exit(1)
+
+
+@app.command(name="overlap")
+def description_overlap(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    skill: list[str] | None = typer.Option(
+        None,
+        "--skill",
+        "-s",
+        help="Only report overlaps involving these skills (repeatable)",
+    ),
+):
+    """
+    Find skills whose descriptions or "Use when:" triggers nearly match.
+
+    Overlapping descriptions make agents load the wrong skill. Pairs are
+    found with MinHash/LSH in near-linear time instead of comparing every
+    pair. Exits with status 1 when any overlap is found.
+    """
+    project_root = get_project_root(target_dir)
+
+    console.print(
+        Panel(
+            "[bold cyan]Description Overlap[/]",
+            title="Overlap",
+            border_style="cyan",
+        )
+    )
+
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+    if not detected_clis:
+        console.print("\n[yellow]![/] No AI CLIs detected.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+
+    skills = asyncfs.run(load_catalog_async(project_root, detected_clis, pool))
+    if skill:
+        for missing in sorted(set(skill) - set(skills)):
+            console.print(f"[yellow]![/] Skill '{missing}' not found")
+    if len(skills) < 2:
+        console.print("\n[dim]Fewer than two skills to compare.[/]")
+        return
+
+    report = asyncfs.run(
+        overlap.analyze(project_root, skills, pool, set(skill) if skill else None)
+    )
+    for kind, title, marker in (
+        (overlap.DUPLICATE, "Near-duplicate descriptions", "[red]-[/]"),
+        (overlap.TRIGGER, "Conflicting triggers", "[yellow]![/]"),
+    ):
+        found = [o for o in report.overlaps if o.kind == kind]
+        if not found:
+            continue
+        console.print(f"\n[bold]{title}:[/]")
+        for item in found:
+            console.print(
+                f"  {marker} {escape(item.skills[0])} / {escape(item.skills[1])} "
+                f"[dim]({item.similarity:.0%}, {', '.join(item.clis)})[/]",
+                highlight=False,
+            )
+    if report.unreadable:
+        console.print("\n[bold]Skipped (no readable description):[/]")
+        for rel in report.unreadable:
+            console.print(f"  [dim]{escape(rel)}[/]", highlight=False)
+
+    console.print(
+        f"\n[bold]{report.descriptions}[/] description(s), "
+        f"[bold]{report.candidates}[/] candidate pair(s) checked, "
+        f"[bold]{len(report.overlaps)}[/] overlap(s)"
+    )
+    if report.overlaps:
+        console.print('\n[dim]Make each description\'s "Use when:" specific.[/]')
+        raise typer.Exit(1)
+
+
+@app.command(name="du")
+def disk_usage(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    skill: list[str] | None = typer.Option(
+        None, "--skill", "-s", help="Only measure these skills (repeatable)"
+    ),
+    top: int = typer.Option(
+        10, "--top", "-n", min=1, help="Number of largest assets and duplicates"
+    ),
+    dedupe: bool = typer.Option(
+        False,
+        "--dedupe",
+        help="Replace duplicate files with hardlinks to a single copy",
+    ),
+):
+    """
+    Show how many bytes skills take per skill and per CLI, and find
+    duplicate files across skills and CLIs.
+
+    With --dedupe, identical files on the same filesystem are hardlinked
+    together. Git still sees separate files, but editing one copy in place
+    changes every linked copy.
+    """
+    project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
+
+    console.print(
+        Panel(
+            "[bold cyan]Skill Footprint[/]",
+            title="Disk Usage",
+            border_style="cyan",
+        )
+    )
+
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+    if not detected_clis:
+        console.print("\n[yellow]![/] No AI CLIs detected.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+
+    skills = asyncfs.run(load_catalog_async(project_root, detected_clis, pool))
+    if skill:
+        for missing in sorted(set(skill) - set(skills)):
+            console.print(f"[yellow]![/] Skill '{missing}' not found")
+        skills = skills.select(skill)
+    if not skills:
+        console.print("\n[dim]No skills to measure.[/]")
+        return
+
+    records = list(skills.records())
+    usage = asyncfs.run(footprint.measure(project_root, records, pool))
+
+    table = Table(title="By CLI", show_header=True, header_style="bold cyan")
+    table.add_column("CLI", style="cyan")
+    table.add_column("Skills", justify="right")
+    table.add_column("Size", justify="right")
+    for cli_id in detected_clis:
+        table.add_row(
+            clis[cli_id]["name"],
+            str(skills.count(cli_id)),
+            decimal(usage.by_cli.get(cli_id, 0)),
+        )
+    console.print()
+    console.print(table)
+
+    table = Table(title="By Skill", show_header=True, header_style="bold cyan")
+    table.add_column("Skill", style="cyan")
+    table.add_column("Copies", justify="right")
+    table.add_column("Size", justify="right")
+    ranked = sorted(usage.by_skill, key=lambda n: (-usage.by_skill[n], n))
+    for name in ranked[:top]:
+        table.add_row(
+            name, str(len(skills.copies(name))), decimal(usage.by_skill[name])
+        )
+    console.print()
+    console.print(table)
+    if len(ranked) > top:
+        console.print(f"  [dim]... {len(ranked) - top} more[/]")
+
+    console.print("\n[bold]Largest assets:[/]")
+    for name, size, copies in usage.largest(top):
+        console.print(
+            f"  {decimal(size):>10}  {escape(name)} [dim](x{copies})[/]",
+            highlight=False,
+        )
+
+    if usage.duplicates:
+        console.print("\n[bold]Duplicate content:[/]")
+        for dup in usage.duplicates[:top]:
+            console.print(
+                f"  {decimal(dup.reclaimable):>10}  {escape(dup.assets[0].rel)} "
+                f"[dim](x{dup.inodes}, skills: {', '.join(dup.skills)})[/]",
+                highlight=False,
+            )
+        if len(usage.duplicates) > top:
+            console.print(f"  [dim]... {len(usage.duplicates) - top} more[/]")
+
+    console.print(
+        f"\n[bold]Total:[/] {decimal(usage.total)} in {len(usage.assets)} file(s), "
+        f"{decimal(usage.on_disk)} on disk, "
+        f"{decimal(usage.reclaimable)} reclaimable by dedupe"
+    )
+    if not dedupe or not usage.duplicates:
+        return
+
+    reclaimed = 0
+    for dup in usage.duplicates:
+        try:
+            reclaimed += footprint.hardlink(dup)
+        except OSError as e:
+            console.print(
+                f"[red]-[/] Cannot link {escape(dup.assets[0].rel)}: {escape(str(e))}"
+            )
+            raise typer.Exit(1)
+    console.print(f"\n[green]+[/] Hardlinked duplicates, {decimal(reclaimed)} freed")
+
+
+@app.command(name="push")
+def push_skills(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    registry: str = typer.Option(
+        ...,
+        "--registry",
+        "-r",
+        envvar="HEFESTO_REGISTRY",
+        help="Registry directory or file:// URL",
+    ),
+    skill: list[str] | None = typer.Option(
+        None, "--skill", "-s", help="Skills to publish (repeatable; default: all)"
+    ),
+    package: list[Path] | None = typer.Option(
+        None,
+        "--package",
+        "-p",
+        help=".skill files to publish, e.g. from package_skill.py (repeatable)",
+    ),
+    version: str | None = typer.Option(
+        None,
+        "--version",
+        help="Version to publish (default: metadata.version, else content hash)",
+    ),
+    canonical: str | None = typer.Option(
+        None, "--canonical", help="CLI whose copy is published (default: claude)"
+    ),
+):
+    """
+    Publish skills to a local registry as .skill packages.
+
+    Packages are stored by content hash, so content that is already in the
+    registry is never copied again. Published versions are immutable.
+    """
+    project_root = get_project_root(target_dir)
+
+    console.print(
+        Panel(
+            "[bold cyan]Skill Registry[/]",
+            title="Push",
+            border_style="cyan",
+        )
+    )
+
+    pool = IOPool()
+    sources: list[tuple[str, Path]] = []
+    if skill or not package:
+        detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+        if canonical and canonical not in detected_clis:
+            console.print(f"\n[red]-[/] CLI '{canonical}' not detected.")
+            raise typer.Exit(1)
+        skills = asyncfs.run(load_catalog_async(project_root, detected_clis, pool))
+        if skill:
+            missing = sorted(set(skill) - set(skills))
+            for name in missing:
+                console.print(f"[red]-[/] Skill '{name}' not found")
+            if missing:
+                raise typer.Exit(1)
+            skills = skills.select(skill)
+        for name in skills:
+            copies = {record.cli_id: record for record in skills.copies(name)}
+            base = drift.pick_canonical(list(copies), canonical)
+            sources.append((name, copies[base].path))
+
+    async def gather_packages() -> list[bytes]:
+        return await pool.gather(
+            [
+                *(pool.run(packages.build_package, path) for _, path in sources),
+                *(pool.run(path.read_bytes) for path in package or []),
+            ]
+        )
+
+    try:
+        contents = asyncfs.run(gather_packages())
+    except OSError as e:
+        console.print(f"[red]-[/] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    # Nothing is published unless every package is valid
+    releases: list[tuple[packages.Release, bytes]] = []
+    invalid = 0
+    for data in contents:
+        try:
+            releases.append((packages.make_release(data, version), data))
+        except packages.PackageError as e:
+            invalid += 1
+            console.print(f"[red]-[/] {escape(str(e))}")
+    if invalid:
+        console.print(f"\n[bold]{invalid}[/] invalid package(s), nothing published")
+        raise typer.Exit(1)
+
+    try:
+        added = packages.Registry(registry).publish(releases)
+    except (packages.PackageError, OSError) as e:
+        console.print(f"[red]-[/] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    console.print()
+    for release, _ in releases:
+        label = f"{release.name}@{release.version}"
+        if release in added:
+            console.print(f"  [green]+[/] {label}", highlight=False)
+        else:
+            console.print(f"  [dim]= {label} (already published)[/]", highlight=False)
+    console.print(
+        f"\n[bold]{len(added)}[/] published, "
+        f"[dim]{len(releases) - len(added)} unchanged in {escape(registry)}[/]"
+    )
+
+
+@app.command(name="pull")
+def pull_skills(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    registry: str = typer.Option(
+        ...,
+        "--registry",
+        "-r",
+        envvar="HEFESTO_REGISTRY",
+        help="Registry directory, tarball or file:// URL",
+    ),
+    skill: list[str] = typer.Option(
+        ...,
+        "--skill",
+        "-s",
+        help="Skill to install: name, name@version or name@<hash> (repeatable)",
+    ),
+    ai_cli: str | None = typer.Option(
+        None, "--ai", help="Specific AI CLI to install to (claude, gemini, etc.)"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show planned changes without writing"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Overwrite files edited since the last pull"
+    ),
+):
+    """
+    Install skills from a local registry into every detected CLI.
+
+    Copies that already match the release are left alone and their
+    packages are not read; everything else is installed in one atomic
+    batch. Files edited since the last pull are kept and reported unless
+    --force is given. Packages are cached in .hefesto/objects/.
+    """
+    project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
+    hefesto_dir = get_hefesto_dir(project_root)
+
+    console.print(
+        Panel(
+            "[bold cyan]Skill Registry[/]",
+            title="Pull",
+            border_style="cyan",
+        )
+    )
+
+    try:
+        source = packages.Registry(registry)
+        index = source.catalog()
+        resolved = {}
+        for spec in skill:
+            release = index.resolve(spec)
+            if resolved.get(release.name, release) != release:
+                raise packages.PackageError(
+                    f"Conflicting versions requested for '{release.name}'"
+                )
+            resolved[release.name] = release
+    except packages.PackageError as e:
+        console.print(f"[red]-[/] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    pool = IOPool()
+    detected_clis = asyncfs.run(detect_clis_async(project_root, pool))
+    if ai_cli:
+        if ai_cli not in detected_clis:
+            console.print(f"\n[red]-[/] CLI '{ai_cli}' not detected.")
+            raise typer.Exit(1)
+        detected_clis = {ai_cli: detected_clis[ai_cli]}
+    if not detected_clis:
+        console.print("\n[yellow]![/] No AI CLIs detected.")
+        console.print("\n[dim]Run: hefesto init[/]")
+        raise typer.Exit(1)
+
+    skills_dirs = [
+        cli_path / clis[cli_id]["skills_dir"]
+        for cli_id, cli_path in detected_clis.items()
+    ]
+    releases = list(resolved.values())
+    try:
+        result = asyncfs.run(
+            packages.plan_pull(
+                releases, skills_dirs, source, hefesto_dir, pool, force, dry_run
+            )
+        )
+    except (packages.PackageError, OSError) as e:
+        console.print(f"[red]-[/] {escape(str(e))}")
+        raise typer.Exit(1)
+
+    console.print()
+    for release in releases:
+        if release in result.fetched:
+            origin = "from registry"
+        elif release in result.cached:
+            origin = "from cache"
+        else:
+            origin = "up to date"
+        console.print(
+            f"  [green]+[/] {release.name}@{release.version} [dim]({origin})[/]",
+            highlight=False,
+        )
+
+    for path in result.modified:
+        rel = escape(path.relative_to(project_root).as_posix())
+        console.print(
+            f"  [red]![/] {rel} [dim](locally modified, kept; --force to overwrite)[/]"
+        )
+
+    if dry_run:
+        console.print("\n[bold]Planned changes (dry run):[/]")
+        _print_plan(result.plan, project_root, show_diffs=False)
+        return
+
+    asyncfs.run(planner.apply_plan(result.plan, project_root, pool))
+    packages.record_pull(hefesto_dir, releases, registry)
+    console.print(
+        f"\n[bold]{len(releases)}[/] skill(s) in {len(skills_dirs)} CLI(s): "
+        f"[dim]{len(result.plan.operations)} change(s), "
+        f"{len(result.fetched)} package(s) read from the registry[/]"
+    )
+
+
+GC_SECTIONS = {
+    sweep.ORPHAN_COMMAND: "Orphaned commands",
+    sweep.SKILL_DIR: "Skill directories without SKILL.md",
+    sweep.OBJECT: "Unreferenced objects",
+    sweep.CACHE: "Cache entries",
+    sweep.LEFTOVER: "Interrupted writes",
+}
+# Kinds that may hold user work: reported, and only removed on request
+GC_OPT_IN = {sweep.ORPHAN_COMMAND: "--commands", sweep.SKILL_DIR: "--skills"}
+
+
+@app.command(name="gc")
+def collect_garbage(
+    target_dir: Path | None = typer.Argument(
+        None, help="Target directory (defaults to current directory)"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="List what would be removed without deleting"
+    ),
+    max_cache_size: int = typer.Option(
+        sweep.DEFAULT_CACHE_BUDGET // (1024 * 1024),
+        "--max-cache-size",
+        min=0,
+        help="Cache budget in MB; least recently used entries are evicted",
+    ),
+    commands: bool = typer.Option(
+        False, "--commands", help="Also remove orphaned hefesto.* command files"
+    ),
+    skills: bool = typer.Option(
+        False,
+        "--skills",
+        help="Also remove skill directories without SKILL.md that hold only "
+        "unmodified scaffold examples",
+    ),
+):
+    """
+    Remove stale Hefesto artifacts and keep caches within budget.
+
+    Removes objects neither upgrade nor pull refers to, caches this version
+    cannot use, and leftovers of interrupted writes. Caches over budget are
+    evicted least recently used first. Command files of commands no longer
+    shipped and skill directories without SKILL.md are only reported unless
+    --commands / --skills is given; skill directories with files Hefesto did
+    not generate are never removed.
+    """
+    project_root = get_project_root(target_dir)
+    clis = get_cli_registry(project_root)
+    hefesto_dir = get_hefesto_dir(project_root)
+
+    console.print(
+        Panel(
+            "[bold cyan]Garbage Collection[/]",
+            title="GC",
+            border_style="cyan",
+        )
+    )
+
+    pool = IOPool()
+    detected_clis, packaged = asyncfs.run(
+        pool.gather(
+            [
+                detect_clis_async(project_root, pool),
+                pool.glob(get_templates_dir() / "commands", lint.COMMAND_GLOB),
+            ]
+        )
+    )
+    expected = {lint.command_name(path.name) for path in packaged}
+    if not expected:
+        console.print("[red]-[/] No packaged commands found; refusing to guess.")
+        raise typer.Exit(1)
+
+    found = asyncfs.run(
+        sweep.scan(
+            project_root,
+            detected_clis,
+            clis,
+            expected,
+            pool,
+            max_cache_size * 1024 * 1024,
+        )
+    )
+    if not found:
+        console.print("\n[green]+[/] Nothing to collect.")
+        return
+
+    requested = {sweep.ORPHAN_COMMAND: commands, sweep.SKILL_DIR: skills}
+    reclaimed = removed = kept = 0
+    for kind, title in GC_SECTIONS.items():
+        items = [garbage for garbage in found if garbage.kind == kind]
+        if not items:
+            continue
+        console.print(f"\n[bold]{title}:[/]")
+        for garbage in items:
+            rel = escape(garbage.path.relative_to(project_root).as_posix())
+            reason = f"{decimal(garbage.size)}, {garbage.reason}"
+            if not garbage.removable:
+                note = "kept"
+            elif not requested.get(kind, True):
+                note = f"pass {GC_OPT_IN[kind]} to remove"
+            elif dry_run or sweep.remove(garbage, hefesto_dir):
+                removed += 1
+                reclaimed += garbage.size
+                console.print(f"  [red]-[/] {rel} [dim]({reason})[/]", highlight=False)
+                continue
+            else:
+                note = "in use, kept"
+            kept += 1
+            console.print(
+                f"  [yellow]![/] {rel} [dim]({reason}; {note})[/]", highlight=False
+            )
+
+    verb = "would be reclaimed" if dry_run else "reclaimed"
+    console.print(
+        f"\n[bold]{removed}[/] item(s), {decimal(reclaimed)} {verb}"
+        + (f", [yellow]{kept} kept[/]" if kept else "")
+    )
+
+
+def _knowledge_dir(knowledge_dir: Path | None) -> Path:
+    """Resolve the knowledge directory.
+
+    Defaults to <project>/knowledge, then to the knowledge base shipped
+    with Hefesto, so installed commands can query it from any project.
+    """
+    path = knowledge_dir
+    if path is None:
+        path = get_project_root() / "knowledge"
+        if not path.is_dir():
+            path = get_knowledge_dir() or path
+    if not path.is_dir():
+        console.print(f"[red]-[/] Knowledge directory not found: {escape(str(path))}")
+        raise typer.Exit(1)
+    return path
+
+
+@knowledge_app.command("build")
+def knowledge_build(
+    knowledge_dir: Path | None = typer.Option(
+        None,
+        "--dir",
+        help="Knowledge directory (defaults to ./knowledge, then the bundled one)",
+    ),
+):
+    """
+    Build the section index (heading -> byte range, keyword -> sections).
+    """
+    path = _knowledge_dir(knowledge_dir)
+    index = knowledge.build_index(path)
+    index_path = knowledge.write_index(path, index)
+
+    corpus = sum(size for _, size in index["files"].values())
+    console.print(
+        f"[green]+[/] Indexed {len(index['files'])} file(s), "
+        f"{len(index['sections'])} section(s), {len(index['terms'])} term(s)"
+    )
+    console.print(
+        f"[dim]{escape(str(index_path))} "
+        f"({index_path.stat().st_size // 1024} KB index, "
+        f"{corpus // 1024} KB corpus)[/]"
+    )
+
+
+@knowledge_app.command("query")
+def knowledge_query(
+    query: str = typer.Argument(..., help="Keywords to search for"),
+    knowledge_dir: Path | None = typer.Option(
+        None,
+        "--dir",
+        help="Knowledge directory (defaults to ./knowledge, then the bundled one)",
+    ),
+    limit: int = typer.Option(3, "--limit", "-n", help="Maximum sections"),
+    list_only: bool = typer.Option(
+        False, "--list", help="List matching sections without their content"
+    ),
+):
+    """
+    Print only the knowledge sections relevant to a query.
+
+    The index is rebuilt automatically when the corpus changed.
+    """
+    path = _knowledge_dir(knowledge_dir)
+    index = knowledge.load_index(path)
+    results = knowledge.search(index, query, limit)
+
+    if not results:
+        console.print(f"[yellow]![/] No sections match '{escape(query)}'.")
+        raise typer.Exit(1)
+
+    if list_only:
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Score", justify="right")
+        table.add_column("File", style="dim")
+        table.add_column("Section", style="cyan")
+        table.add_column("Bytes", justify="right")
+        for section, score in results:
+            table.add_row(
+                f"{score:.2f}",
+                escape(section.file),
+                escape(section.heading),
+                str(section.size),
+            )
+        console.print(table)
+        return
+
+    sections = [section for section, _ in results]
+    for section, text in zip(sections, knowledge.read_sections(path, sections)):
+        console.print(
+            f"<!-- {path.name}/{section.file} | {section.heading} -->",
+            style="dim",
+            markup=False,
+            highlight=False,
+            soft_wrap=True,
+        )
+        console.print(text.rstrip(), markup=False, highlight=False, soft_wrap=True)
+        console.print()
 
 
 @app.command()
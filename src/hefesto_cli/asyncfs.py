@@ -0,0 +1,97 @@
+"""Async filesystem core - thread-offloaded, concurrency-limited I/O."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import weakref
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Enough in-flight calls to hide disk/network-FS latency without
+# exhausting the default thread pool.
+DEFAULT_CONCURRENCY = 32
+
+
+class IOPool:
+    """Run blocking filesystem calls in threads, at most `limit` at a time."""
+
+    def __init__(self, limit: int = DEFAULT_CONCURRENCY):
+        self.limit = limit
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: weakref.ref | None = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per event loop: each `run()` starts a fresh loop
+        # and asyncio primitives cannot be shared between loops. A weakref
+        # is used because a new loop may reuse a collected loop's id.
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop() is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = weakref.ref(loop)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Offload `func(*args)` to a worker thread under the limiter."""
+        async with self.semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    async def gather(self, calls: Iterable[Awaitable[T]]) -> list[T]:
+        """Await many coroutines concurrently, preserving input order."""
+        return list(await asyncio.gather(*calls))
+
+    # ── Stat batching ────────────────────────────────────────────────────
+
+    async def stat_many(self, paths: Iterable[Path]) -> list[os.stat_result | None]:
+        """Stat every path concurrently; missing paths yield None."""
+        return await self.gather(self.run(_stat_or_none, p) for p in paths)
+
+    async def exists_many(self, paths: Iterable[Path]) -> list[bool]:
+        """Check existence of every path concurrently."""
+        return [st is not None for st in await self.stat_many(paths)]
+
+    # ── Directory scanning ───────────────────────────────────────────────
+
+    async def scandir(self, directory: Path) -> list[tuple[str, bool]]:
+        """List `(name, is_dir)` entries of a directory ([] if missing)."""
+        return await self.run(_scandir, directory)
+
+    async def glob(self, directory: Path, pattern: str) -> list[Path]:
+        """Glob a directory in a worker thread ([] if missing)."""
+        return await self.run(_glob, directory, pattern)
+
+    async def subdirs_with(self, directory: Path, marker: str) -> list[str]:
+        """Names of subdirectories of `directory` that contain `marker`."""
+        names = [name for name, is_dir in await self.scandir(directory) if is_dir]
+        found = await self.exists_many(directory / name / marker for name in names)
+        return [name for name, ok in zip(names, found) if ok]
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Drive a coroutine from synchronous code (typer entry points)."""
+    return asyncio.run(coro)
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _scandir(directory: Path) -> list[tuple[str, bool]]:
+    try:
+        with os.scandir(directory) as it:
+            return [(entry.name, entry.is_dir()) for entry in it]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _glob(directory: Path, pattern: str) -> list[Path]:
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(pattern))
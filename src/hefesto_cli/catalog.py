@@ -0,0 +1,173 @@
+"""Skill catalog - one compact in-memory model of the installed skills."""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .asyncfs import IOPool
+from .changeset import ChangeSet
+from .registry import CliRegistry
+
+
+class CliInstallation:
+    """A detected CLI and where its skills and commands live in the project."""
+
+    __slots__ = ("cli_id", "name", "root", "skills_path", "commands_path", "skills_rel")
+
+    def __init__(self, cli_id: str, cli: dict, project_root: Path, root: Path):
+        self.cli_id = sys.intern(cli_id)
+        self.name = cli["name"]
+        self.root = root
+        self.skills_path = root / cli["skills_dir"]
+        self.commands_path = root / cli["commands_dir"]
+        self.skills_rel = sys.intern(
+            self.skills_path.relative_to(project_root).as_posix()
+        )
+
+    def __repr__(self) -> str:
+        return f"CliInstallation({self.cli_id!r}, {self.skills_rel!r})"
+
+
+class SkillRecord:
+    """One copy of a skill, in one CLI."""
+
+    __slots__ = ("name", "installation")
+
+    def __init__(self, name: str, installation: CliInstallation):
+        self.name = name
+        self.installation = installation
+
+    @property
+    def cli_id(self) -> str:
+        return self.installation.cli_id
+
+    @property
+    def path(self) -> Path:
+        return self.installation.skills_path / self.name
+
+    @property
+    def rel(self) -> str:
+        """Project-relative POSIX path of the skill directory."""
+        return f"{self.installation.skills_rel}/{self.name}"
+
+    def __repr__(self) -> str:
+        return f"SkillRecord({self.name!r}, {self.cli_id!r})"
+
+
+class SkillCatalog:
+    """Every skill copy in the project, stored column-wise.
+
+    Skill names are interned and sorted. Copies are a single array of
+    installation indexes ordered by name, where `offsets[i]:offsets[i + 1]`
+    spans the copies of `names[i]`. This avoids a dict and a list per skill
+    in very large repos; SkillRecords are only built on request.
+    """
+
+    __slots__ = ("installations", "names", "_cli_index", "_offsets")
+
+    def __init__(
+        self,
+        installations: Iterable[CliInstallation],
+        skills_by_cli: Iterable[Iterable[str]],
+    ):
+        self.installations = tuple(installations)
+        pairs = sorted(
+            (sys.intern(name), index)
+            for index, names in enumerate(skills_by_cli)
+            for name in names
+        )
+        self.names: list[str] = []
+        self._cli_index = array("H")
+        self._offsets = array("I")
+        for name, index in pairs:
+            if not self.names or self.names[-1] != name:
+                self._offsets.append(len(self._cli_index))
+                self.names.append(name)
+            self._cli_index.append(index)
+        self._offsets.append(len(self._cli_index))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return self._position(name) >= 0
+
+    def copies(self, name: str) -> list[SkillRecord]:
+        """Copies of one skill, in CLI detection order ([] if unknown)."""
+        i = self._position(name)
+        if i < 0:
+            return []
+        return [
+            SkillRecord(self.names[i], self.installations[index])
+            for index in self._cli_index[self._offsets[i] : self._offsets[i + 1]]
+        ]
+
+    def records(self) -> Iterator[SkillRecord]:
+        """Every copy of every skill, ordered by skill name."""
+        for i, name in enumerate(self.names):
+            for index in self._cli_index[self._offsets[i] : self._offsets[i + 1]]:
+                yield SkillRecord(name, self.installations[index])
+
+    def count(self, cli_id: str) -> int:
+        """Number of skills installed in one CLI."""
+        return self._cli_index.count(self._cli_position(cli_id))
+
+    def select(self, names: Iterable[str]) -> SkillCatalog:
+        """A catalog restricted to the given skill names."""
+        keep = set(names)
+        by_cli: list[list[str]] = [[] for _ in self.installations]
+        for i, name in enumerate(self.names):
+            if name in keep:
+                for index in self._cli_index[self._offsets[i] : self._offsets[i + 1]]:
+                    by_cli[index].append(name)
+        return SkillCatalog(self.installations, by_cli)
+
+    def _cli_position(self, cli_id: str) -> int:
+        for index, installation in enumerate(self.installations):
+            if installation.cli_id == cli_id:
+                return index
+        raise KeyError(cli_id)
+
+    def _position(self, name: object) -> int:
+        i = bisect_left(self.names, name)
+        return i if i < len(self.names) and self.names[i] == name else -1
+
+
+def installations(
+    project_root: Path, detected_clis: dict[str, Path], clis: CliRegistry
+) -> list[CliInstallation]:
+    """Installation records for detected CLIs, in detection order."""
+    return [
+        CliInstallation(cli_id, clis[cli_id], project_root, cli_path)
+        for cli_id, cli_path in detected_clis.items()
+    ]
+
+
+async def scan(
+    installs: list[CliInstallation],
+    pool: IOPool,
+    changes: ChangeSet | None = None,
+) -> SkillCatalog:
+    """Scan skills (dirs containing SKILL.md) of every CLI concurrently.
+
+    With `changes`, only skills with changed files are probed instead of
+    listing every skills directory.
+    """
+
+    async def scan_one(installation: CliInstallation) -> list[str]:
+        if changes is None:
+            return await pool.subdirs_with(installation.skills_path, "SKILL.md")
+        names = sorted(changes.skill_names(installation.skills_rel))
+        found = await pool.exists_many(
+            installation.skills_path / name / "SKILL.md" for name in names
+        )
+        return [name for name, ok in zip(names, found) if ok]
+
+    return SkillCatalog(installs, await pool.gather(scan_one(i) for i in installs))
@@ -0,0 +1,85 @@
+"""Change detection - scope work to paths modified since a git ref."""
+
+from __future__ import annotations
+
+import bisect
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+
+class ChangeError(ValueError):
+    """Raised when changes cannot be computed (no git, bad ref, no repo)."""
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    """Project-relative POSIX paths changed since `ref`, kept sorted so
+    directory queries are a binary search rather than a scan."""
+
+    ref: str
+    paths: tuple[str, ...]
+
+    def under(self, rel_dir: str) -> list[str]:
+        """Changed paths inside a project-relative directory."""
+        prefix = rel_dir.rstrip("/") + "/"
+        found = []
+        for i in range(bisect.bisect_left(self.paths, prefix), len(self.paths)):
+            if not self.paths[i].startswith(prefix):
+                break
+            found.append(self.paths[i])
+        return found
+
+    def touches(self, rel_dir: str) -> bool:
+        """True if anything inside `rel_dir` changed."""
+        prefix = rel_dir.rstrip("/") + "/"
+        i = bisect.bisect_left(self.paths, prefix)
+        return i < len(self.paths) and self.paths[i].startswith(prefix)
+
+    def skill_names(self, skills_rel: str) -> set[str]:
+        """Names of skills with a changed file (including deleted skills)."""
+        offset = len(skills_rel.rstrip("/")) + 1
+        return {
+            path[offset:].split("/", 1)[0]
+            for path in self.under(skills_rel)
+            if "/" in path[offset:]
+        }
+
+
+def changed_since(project_root: Path, ref: str) -> ChangeSet:
+    """Paths changed between `ref` and the working tree, from local git only.
+
+    Covers committed, staged and unstaged changes to tracked files plus
+    untracked files that are not ignored. Renames count as a deletion and
+    an addition so both sides are in scope.
+    """
+    try:
+        _git(project_root, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    except ChangeError as e:
+        raise ChangeError(str(e) or f"unknown git ref '{ref}'") from None
+    diff = _git(
+        project_root,
+        "diff",
+        "--name-only",
+        "-z",
+        "--no-renames",
+        "--relative",
+        ref,
+        "--",
+    )
+    untracked = _git(project_root, "ls-files", "--others", "--exclude-standard", "-z")
+    paths = {p for p in (diff + untracked).split("\0") if p}
+    return ChangeSet(ref, tuple(sorted(paths)))
+
+
+def _git(project_root: Path, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(project_root), *args], capture_output=True, check=False
+        )
+    except FileNotFoundError as e:
+        raise ChangeError("git is not installed") from e
+    if result.returncode != 0:
+        # Empty message lets the caller say what failed (rev-parse --quiet)
+        raise ChangeError(result.stderr.decode("utf-8", "replace").strip())
+    return result.stdout.decode("utf-8", "surrogateescape")
@@ -0,0 +1,262 @@
+"""Drift detection - Merkle hashes of skill copies, compared across CLIs."""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .asyncfs import IOPool
+from .catalog import SkillRecord
+from .registry import CliRegistry
+from .store import Store
+
+CACHE_NAME = "drift"  # .hefesto/cache/drift.json
+CACHE_FORMAT = 2  # leaves hash raw bytes
+PREFERRED_CANONICAL = "claude"  # commands treat .claude/skills/ as the source
+IGNORED = frozenset({"__pycache__", ".DS_Store"})
+
+# Stand-ins for text that legitimately differs between CLI copies
+ARGS_TOKEN = b"\0ARGS\0"
+SKILLS_TOKEN = b"\0SKILLS\0"
+
+
+@dataclass(frozen=True)
+class SkillTree:
+    """One CLI's copy of a skill: a leaf hash per file plus the root hash."""
+
+    cli: str
+    path: Path
+    leaves: dict[str, str]  # path relative to the skill dir -> leaf hash
+    root: str
+
+
+@dataclass
+class SkillDrift:
+    """How each copy of a skill differs from the canonical copy."""
+
+    name: str
+    canonical: str
+    in_sync: list[str] = field(default_factory=list)
+    modified: dict[str, list[str]] = field(default_factory=dict)
+    missing: dict[str, list[str]] = field(default_factory=dict)
+    extra: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def drifted(self) -> list[str]:
+        """CLIs whose copy differs, in first-seen order."""
+        return list(dict.fromkeys([*self.modified, *self.missing, *self.extra]))
+
+
+def normalize(content: bytes, clis: CliRegistry) -> bytes:
+    """Neutralise expected per-CLI differences in a text file.
+
+    Every known CLI's argument placeholder (`var_syntax`) and skills path
+    (`.gemini/skills/`, `.claude/skills/`, ...) is replaced with a fixed
+    token, so both sides of a comparison are normalised the same way
+    whichever CLI they came from. Binary files are returned unchanged.
+    """
+    if b"\0" in content:
+        return content
+    for text, token in _replacements(clis):
+        content = content.replace(text, token)
+    return content
+
+
+def _replacements(clis: CliRegistry) -> list[tuple[bytes, bytes]]:
+    """(text, token) pairs, longest text first so no path is cut short."""
+    pairs = {
+        f"{cli['folder']}/{cli['skills_dir']}/".encode(): SKILLS_TOKEN
+        for cli in clis.config.values()
+    }
+    pairs.update(
+        (cli["var_syntax"].encode(), ARGS_TOKEN)
+        for cli in clis.config.values()
+        if cli["var_syntax"]
+    )
+    return sorted(pairs.items(), key=lambda pair: -len(pair[0]))
+
+
+def merkle_root(leaves: dict[str, str]) -> str:
+    """Hash of a skill's (path, leaf hash) pairs, in path order."""
+    h = hashlib.sha256()
+    for rel in sorted(leaves):
+        h.update(f"{rel}\0{leaves[rel]}\n".encode())
+    return h.hexdigest()
+
+
+def pick_canonical(cli_ids: list[str], preferred: str | None = None) -> str:
+    """Copy the others are compared against: `preferred`, else Claude, else
+    the first CLI that has the skill."""
+    for candidate in (preferred, PREFERRED_CANONICAL):
+        if candidate in cli_ids:
+            return candidate
+    return cli_ids[0]
+
+
+async def build_trees(
+    project_root: Path,
+    records: list[SkillRecord],
+    clis: CliRegistry,
+    pool: IOPool,
+) -> dict[str, dict[str, SkillTree]]:
+    """Merkle trees for the given skill copies, as `{name: {cli: tree}}`.
+
+    Leaves are digests of the raw bytes. All files are stat'ed in one
+    batch; only files whose (mtime, size) changed since the last run are
+    read and hashed.
+    """
+    listings = await pool.gather(pool.run(_walk, r.path) for r in records)
+    files = [
+        record.path / rel
+        for record, listing in zip(records, listings)
+        for rel in listing
+    ]
+    rel_paths = [
+        f"{record.rel}/{rel}"
+        for record, listing in zip(records, listings)
+        for rel in listing
+    ]
+    stats = await pool.stat_many(files)
+
+    store = Store(project_root / ".hefesto")
+    cache = store.load(CACHE_NAME, CACHE_FORMAT) or {"files": {}}
+    leaves: dict[str, str] = {}
+    stale: list[tuple[str, Path]] = []
+    for rel, path, st in zip(rel_paths, files, stats):
+        entry = cache["files"].get(rel)
+        if st is not None and entry and entry[:2] == [st.st_mtime_ns, st.st_size]:
+            leaves[rel] = entry[2]
+        else:
+            stale.append((rel, path))
+
+    contents = await pool.gather(pool.run(p.read_bytes) for _, p in stale)
+    for (rel, _), content in zip(stale, contents):
+        leaves[rel] = hashlib.sha256(content).hexdigest()
+
+    trees: dict[str, dict[str, SkillTree]] = {}
+    for record, listing in zip(records, listings):
+        skill_leaves = {rel: leaves[f"{record.rel}/{rel}"] for rel in listing}
+        trees.setdefault(record.name, {})[record.cli_id] = SkillTree(
+            record.cli_id, record.path, skill_leaves, merkle_root(skill_leaves)
+        )
+
+    # Entries under the skills this run walked are replaced by what it saw;
+    # entries parallel runs stored for other skills are kept.
+    live = {
+        rel: [st.st_mtime_ns, st.st_size, leaves[rel]]
+        for rel, st in zip(rel_paths, stats)
+        if st is not None
+    }
+    scanned = tuple(f"{record.rel}/" for record in records)
+
+    def merge(current: dict | None) -> dict:
+        files = {
+            rel: entry
+            for rel, entry in (current or {"files": {}})["files"].items()
+            if not rel.startswith(scanned)
+        }
+        files.update(live)
+        return {"files": files}
+
+    seen = {rel: e for rel, e in cache["files"].items() if rel.startswith(scanned)}
+    if live != seen:
+        store.publish(CACHE_NAME, CACHE_FORMAT, merge=merge)
+    return trees
+
+
+def compare(
+    name: str, trees: dict[str, SkillTree], canonical: str, clis: CliRegistry
+) -> SkillDrift:
+    """Compare every copy with the canonical one.
+
+    Equal roots mean identical copies, so only drifted skills are compared
+    file by file, and only files whose raw digests differ are read back
+    and normalised to tell expected CLI differences from real drift.
+    """
+    base = trees[canonical]
+    result = SkillDrift(name, canonical)
+    for cli_id, tree in trees.items():
+        if cli_id == canonical:
+            continue
+        if tree.root == base.root:
+            result.in_sync.append(cli_id)
+            continue
+        modified = [
+            rel
+            for rel, leaf in base.leaves.items()
+            if rel in tree.leaves
+            and tree.leaves[rel] != leaf
+            and _normalized(base.path / rel, clis) != _normalized(tree.path / rel, clis)
+        ]
+        missing = [rel for rel in base.leaves if rel not in tree.leaves]
+        extra = [rel for rel in tree.leaves if rel not in base.leaves]
+        if not (modified or missing or extra):
+            result.in_sync.append(cli_id)
+        for bucket, rels in (
+            (result.modified, modified),
+            (result.missing, missing),
+            (result.extra, extra),
+        ):
+            if rels:
+                bucket[cli_id] = sorted(rels)
+    return result
+
+
+def render_patch(
+    rel: str, canonical: SkillTree, copy: SkillTree, clis: CliRegistry
+) -> list[str]:
+    """Unified diff of one file, with expected CLI differences removed.
+
+    Lines are matched on their normalised form, so a line that differs
+    only by a CLI's path or placeholder is context, not a change; every
+    line printed is the real text of its file.
+    """
+    base_raw, copy_raw = (
+        (tree.path / rel).read_bytes().decode("utf-8", "replace").splitlines()
+        for tree in (canonical, copy)
+    )
+    base_norm, copy_norm = (
+        [normalize(line.encode(), clis) for line in lines]
+        for lines in (base_raw, copy_raw)
+    )
+    matcher = difflib.SequenceMatcher(None, base_norm, copy_norm, autojunk=False)
+    diff = []
+    for group in matcher.get_grouped_opcodes():
+        if not diff:
+            diff += [f"--- {canonical.cli}/{rel}", f"+++ {copy.cli}/{rel}"]
+        first, last = group[0], group[-1]
+        diff.append(f"@@ -{_range(first[1], last[2])} +{_range(first[3], last[4])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                diff += [f" {line}" for line in base_raw[i1:i2]]
+                continue
+            diff += [f"-{line}" for line in base_raw[i1:i2]]
+            diff += [f"+{line}" for line in copy_raw[j1:j2]]
+    return diff
+
+
+def _normalized(path: Path, clis: CliRegistry) -> str:
+    return hashlib.sha256(normalize(path.read_bytes(), clis)).hexdigest()
+
+
+def _range(start: int, stop: int) -> str:
+    """A unified diff hunk range, as difflib writes it."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def _walk(skill_dir: Path) -> list[str]:
+    """Files under a skill directory, relative and in POSIX form."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(skill_dir):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED]
+        rel_dir = Path(dirpath).relative_to(skill_dir)
+        for filename in filenames:
+            if filename not in IGNORED:
+                found.append((rel_dir / filename).as_posix())
+    return sorted(found)
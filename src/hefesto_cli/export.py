@@ -0,0 +1,185 @@
+"""Command export - every CLI's native command format in one pass.
+
+Command sources in `templates_hefesto/commands/` are Markdown with a
+`description` frontmatter. Each source is compiled once, rendered per CLI,
+and handed to the emitter named by the CLI's `command_format` registry
+field, so the work grows with the number of sources, not sources x CLIs
+re-reading them. Packages can add formats under the `hefesto_cli.emitters`
+entry point group.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import tomllib
+import warnings
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.metadata import entry_points
+from pathlib import Path
+
+from .asyncfs import IOPool
+from .registry import CliRegistry
+from .templating import Template, cli_context
+from .validate import FrontmatterError, parse_frontmatter
+
+ENTRY_POINT_GROUP = "hefesto_cli.emitters"
+
+_FRONTMATTER = re.compile(r"\A---\r?\n(.*?)\r?\n---\r?\n", re.S)
+
+
+class ExportError(ValueError):
+    """Raised for unknown command formats and unconvertible sources."""
+
+
+@dataclass(frozen=True)
+class Command:
+    """One command rendered for one CLI, before conversion."""
+
+    name: str  # "hefesto.create"
+    text: str  # rendered Markdown, frontmatter included
+
+    def split(self) -> tuple[str, str]:
+        """`(description, body)`, for formats that store them apart."""
+        match = _FRONTMATTER.match(self.text)
+        if not match:
+            raise ExportError(f"{self.name}: missing frontmatter")
+        try:
+            description = parse_frontmatter(match.group(1)).get("description")
+        except FrontmatterError as e:
+            raise ExportError(f"{self.name}: {e}") from None
+        if not isinstance(description, str):
+            raise ExportError(f"{self.name}: frontmatter needs a 'description'")
+        return description, self.text[match.end() :].lstrip("\r\n")
+
+
+@dataclass(frozen=True)
+class Emitter:
+    """A native command format: how to write it, and how to read it back."""
+
+    extension: str
+    emit: Callable[[Command], bytes]
+    # Native file -> Markdown with frontmatter, so `check` lints every format
+    to_markdown: Callable[[str], str]
+    # Files a command needs besides its own, relative to the CLI folder
+    companions: Callable[[Command, dict], dict[str, bytes]] | None = None
+
+
+# ── Built-in formats ─────────────────────────────────────────────────────────
+
+
+def emit_markdown(command: Command) -> bytes:
+    return command.text.encode()
+
+
+def emit_toml(command: Command) -> bytes:
+    """Gemini CLI format: `description` plus the body as `prompt`."""
+    description, body = command.split()
+    # A multi-line basic string: escape backslashes and break up any """
+    body = body.replace("\\", "\\\\").replace('"""', '""\\"')
+    if not body.endswith("\n"):
+        body += "\n"
+    description = json.dumps(description, ensure_ascii=False)
+    return f'description = {description}\n\nprompt = """\n{body}"""\n'.encode()
+
+
+def toml_to_markdown(text: str) -> str:
+    try:
+        data = tomllib.loads(text)
+    except tomllib.TOMLDecodeError:
+        return text  # linted as-is, so its problems still show
+    description = json.dumps(str(data.get("description", "")), ensure_ascii=False)
+    return f"---\ndescription: {description}\n---\n\n{data.get('prompt', '')}"
+
+
+def copilot_prompts(command: Command, cli: dict) -> dict[str, bytes]:
+    """GitHub Copilot dual files: the agent holds the command, and a prompt
+    file in `prompts/` makes it available as a slash command."""
+    agent = f"{cli['folder']}/{cli['commands_dir']}/{command.name}.agent.md"
+    prompt = (
+        f"---\nagent: {command.name}\n---\n\n# /{command.name}\n\n"
+        f"This prompt invokes the {command.name} agent.\n"
+        f"See `{agent}` for the full specification.\n"
+    )
+    return {f"prompts/{command.name}.prompt.md": prompt.encode()}
+
+
+EMITTERS: dict[str, Emitter] = {
+    "markdown": Emitter(".md", emit_markdown, lambda text: text),
+    "toml": Emitter(".toml", emit_toml, toml_to_markdown),
+    "copilot": Emitter(".agent.md", emit_markdown, lambda text: text, copilot_prompts),
+}
+
+
+@lru_cache(maxsize=None)
+def emitter(command_format: str) -> Emitter:
+    """Emitter for a format, built-in or from the entry point group."""
+    if command_format in EMITTERS:
+        return EMITTERS[command_format]
+    failure = None
+    for ep in entry_points(group=ENTRY_POINT_GROUP, name=command_format):
+        try:
+            found = ep.load()
+            if callable(found) and not isinstance(found, Emitter):
+                found = found()
+        except Exception as e:  # a broken plugin must not take down every command
+            failure = f"entry point '{ep.name}' failed to load: {e}"
+            warnings.warn(failure, RuntimeWarning, stacklevel=2)
+            continue
+        if not isinstance(found, Emitter):
+            raise ExportError(f"entry point '{ep.name}' must provide an Emitter")
+        return found
+    raise ExportError(failure or f"unknown command format '{command_format}'")
+
+
+def check_formats(clis: CliRegistry) -> None:
+    """Fail early if a CLI names a format no emitter provides."""
+    for cli_id, cli in clis.config.items():
+        try:
+            emitter(cli["command_format"])
+        except ExportError as e:
+            raise ExportError(f"CLI '{cli_id}': {e}") from None
+
+
+def command_file(cli: dict, name: str) -> str:
+    """File name of a command in a CLI's native format."""
+    return f"{name}{emitter(cli['command_format']).extension}"
+
+
+# ── Pipeline ─────────────────────────────────────────────────────────────────
+
+
+async def export_commands(
+    templates: dict[str, Template],
+    detected_clis: dict[str, Path],
+    clis: CliRegistry,
+    pool: IOPool,
+) -> dict[Path, bytes]:
+    """Render compiled command sources into every CLI's commands directory.
+
+    `templates` maps source file names (`hefesto.create.md`) to compiled
+    templates. CLIs are exported concurrently; the caller writes the
+    result through the planner.
+    """
+
+    def export_cli(cli_id: str) -> dict[Path, bytes]:
+        cli = clis[cli_id]
+        commands_dir = detected_clis[cli_id] / cli["commands_dir"]
+        context = cli_context(cli_id, cli)
+        native = emitter(cli["command_format"])
+        files = {}
+        for filename, template in templates.items():
+            name = filename.removesuffix(".md")
+            command = Command(name, template.render(context))
+            files[commands_dir / command_file(cli, name)] = native.emit(command)
+            if native.companions is not None:
+                for rel, content in native.companions(command, cli).items():
+                    files[detected_clis[cli_id] / rel] = content
+        return files
+
+    exported: dict[Path, bytes] = {}
+    for files in await pool.gather(pool.run(export_cli, c) for c in detected_clis):
+        exported.update(files)
+    return exported
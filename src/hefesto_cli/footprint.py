@@ -0,0 +1,239 @@
+"""Asset footprint - bytes per skill and CLI, and duplicate file content."""
+
+from __future__ import annotations
+
+import filecmp
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .asyncfs import IOPool
+from .catalog import SkillRecord
+from .drift import IGNORED
+from .store import Store
+
+CACHE_NAME = "footprint"  # .hefesto/cache/footprint.json
+CACHE_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class Asset:
+    """One file inside one CLI's copy of a skill."""
+
+    skill: str
+    cli: str
+    path: Path
+    rel: str  # project-relative POSIX path
+    size: int
+    mtime_ns: int
+    inode: tuple[int, int]  # (device, inode): hardlinks share it
+
+    @property
+    def skill_rel(self) -> str:
+        """Path relative to the skill directory, equal across CLI copies."""
+        return self.rel.split(f"/{self.skill}/", 1)[1]
+
+
+@dataclass
+class DuplicateSet:
+    """Files with identical content, possibly already sharing inodes."""
+
+    digest: str
+    size: int
+    assets: list[Asset]
+
+    @property
+    def inodes(self) -> int:
+        return len({asset.inode for asset in self.assets})
+
+    @property
+    def reclaimable(self) -> int:
+        """Bytes freed if every copy were hardlinked to one file."""
+        return self.size * (self.inodes - 1)
+
+    @property
+    def skills(self) -> list[str]:
+        return sorted({asset.skill for asset in self.assets})
+
+
+@dataclass
+class Footprint:
+    """Sizes of every scanned skill copy and the duplicates among them."""
+
+    assets: list[Asset]
+    duplicates: list[DuplicateSet]
+    by_skill: dict[str, int] = field(default_factory=dict)
+    by_cli: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        """Apparent size: every copy counted."""
+        return sum(asset.size for asset in self.assets)
+
+    @property
+    def on_disk(self) -> int:
+        """Size with hardlinked files counted once."""
+        return sum({asset.inode: asset.size for asset in self.assets}.values())
+
+    @property
+    def reclaimable(self) -> int:
+        return sum(dup.reclaimable for dup in self.duplicates)
+
+    def largest(self, limit: int) -> list[tuple[str, int, int]]:
+        """Biggest `(skill/path, size, copies)`, CLI copies folded together."""
+        folded: dict[str, list[int]] = {}
+        for asset in self.assets:
+            entry = folded.setdefault(f"{asset.skill}/{asset.skill_rel}", [0, 0])
+            entry[0] = max(entry[0], asset.size)
+            entry[1] += 1
+        ranked = sorted(folded.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(name, size, copies) for name, (size, copies) in ranked[:limit]]
+
+
+async def measure(
+    project_root: Path, records: list[SkillRecord], pool: IOPool
+) -> Footprint:
+    """Size every file of the given skill copies and find duplicate content.
+
+    Files are grouped by size first, and only sizes shared by files on
+    different inodes are hashed - a file with a unique size cannot have a
+    duplicate. Hashes are cached by (mtime, size) between runs.
+    """
+    listings = await pool.gather(pool.run(_walk, r.path) for r in records)
+    assets = [
+        Asset(
+            record.name,
+            record.cli_id,
+            record.path / rel,
+            f"{record.rel}/{rel}",
+            st.st_size,
+            st.st_mtime_ns,
+            (st.st_dev, st.st_ino),
+        )
+        for record, listing in zip(records, listings)
+        for rel, st in listing
+    ]
+
+    result = Footprint(assets, [])
+    for asset in assets:
+        result.by_skill[asset.skill] = result.by_skill.get(asset.skill, 0) + asset.size
+        result.by_cli[asset.cli] = result.by_cli.get(asset.cli, 0) + asset.size
+
+    by_size: dict[int, list[Asset]] = {}
+    for asset in assets:
+        if asset.size:
+            by_size.setdefault(asset.size, []).append(asset)
+    candidates = [
+        bucket
+        for bucket in by_size.values()
+        if len({asset.inode for asset in bucket}) > 1
+    ]
+
+    # Hash each candidate inode once; its hardlinks share the digest
+    store = Store(project_root / ".hefesto")
+    cache = store.load(CACHE_NAME, CACHE_FORMAT) or {"files": {}}
+    digests: dict[tuple[int, int], str] = {}
+    stale: dict[tuple[int, int], Asset] = {}
+    for bucket in candidates:
+        for asset in bucket:
+            entry = cache["files"].get(asset.rel)
+            if entry and entry[:2] == [asset.mtime_ns, asset.size]:
+                digests.setdefault(asset.inode, entry[2])
+    for bucket in candidates:
+        for asset in bucket:
+            if asset.inode not in digests:
+                stale.setdefault(asset.inode, asset)
+    hashed = await pool.gather(pool.run(_digest, a.path) for a in stale.values())
+    digests.update(zip(stale, hashed))
+
+    groups: dict[str, list[Asset]] = {}
+    for bucket in candidates:
+        for asset in bucket:
+            groups.setdefault(digests[asset.inode], []).append(asset)
+    result.duplicates = sorted(
+        (
+            DuplicateSet(digest, group[0].size, sorted(group, key=lambda a: a.rel))
+            for digest, group in groups.items()
+            if len({asset.inode for asset in group}) > 1
+        ),
+        key=lambda dup: (-dup.reclaimable, dup.assets[0].rel),
+    )
+
+    live = {
+        asset.rel: [asset.mtime_ns, asset.size, digests[asset.inode]]
+        for bucket in candidates
+        for asset in bucket
+    }
+    scanned = tuple(f"{record.rel}/" for record in records)
+
+    def merge(current: dict | None) -> dict:
+        files = {
+            rel: entry
+            for rel, entry in (current or {"files": {}})["files"].items()
+            if not rel.startswith(scanned)
+        }
+        files.update(live)
+        return {"files": files}
+
+    seen = {rel: e for rel, e in cache["files"].items() if rel.startswith(scanned)}
+    if live != seen:
+        store.publish(CACHE_NAME, CACHE_FORMAT, merge=merge)
+    return result
+
+
+def hardlink(duplicate: DuplicateSet) -> int:
+    """Replace every copy in a duplicate set with a hardlink to the first.
+
+    Each copy is compared byte for byte before it is replaced, and the link
+    is created under a temporary name and renamed over the copy, so a copy
+    is never missing. Copies on another device are left alone. Returns
+    the bytes reclaimed.
+    """
+    source = duplicate.assets[0]
+    same: dict[tuple[int, int], bool] = {source.inode: False}
+    reclaimed = 0
+    for asset in duplicate.assets[1:]:
+        if asset.inode[0] != source.inode[0]:
+            continue
+        if asset.inode not in same:
+            same[asset.inode] = filecmp.cmp(source.path, asset.path, shallow=False)
+            reclaimed += asset.size if same[asset.inode] else 0
+        if not same[asset.inode]:
+            continue
+        tmp = asset.path.with_name(f".{asset.path.name}.{uuid.uuid4().hex[:12]}.tmp")
+        os.link(source.path, tmp)
+        try:
+            os.replace(tmp, asset.path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+    return reclaimed
+
+
+def _walk(skill_dir: Path) -> list[tuple[str, os.stat_result]]:
+    """Regular files under a skill directory with their stats, relative."""
+    found = []
+    stack = [(skill_dir, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in entries:
+            if entry.name in IGNORED:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((Path(entry.path), f"{prefix}{entry.name}/"))
+            elif entry.is_file(follow_symlinks=False):
+                # DirEntry.stat() has no inode numbers on Windows
+                found.append((f"{prefix}{entry.name}", os.stat(entry.path)))
+    return sorted(found, key=lambda item: item[0])
+
+
+def _digest(path: Path) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
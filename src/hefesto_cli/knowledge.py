@@ -0,0 +1,191 @@
+"""Knowledge base index - serve only the Markdown sections a query needs."""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from .store import atomic_write
+
+INDEX_FILE = ".index.json"  # inside the knowledge directory
+INDEX_FORMAT = 1
+HEADING_WEIGHT = 3  # heading terms count this many times in a section
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_TOKEN = re.compile(r"\w{3,}")
+_STOPWORDS = frozenset(
+    "the and for with that this from are use when you your not can will into "
+    "como para com que uma por mais dos das nos nas ser são sem sua seu "
+    "este esta isso pelo pela entre".split()
+)
+
+
+@dataclass(frozen=True)
+class Section:
+    """A heading and the byte range of its body within a file."""
+
+    file: str  # relative to the knowledge directory
+    heading: str  # "Parent > Child" heading path
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens (3+ chars, stopwords removed)."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def split_sections(rel: str, content: bytes) -> list[tuple[Section, list[str]]]:
+    """Split a Markdown file at every heading (ignoring fenced code).
+
+    Returns each section with its tokens; heading tokens are weighted.
+    """
+    sections = []
+    stack: list[tuple[int, str]] = []  # (level, title) of enclosing headings
+    start, heading, in_fence = 0, Path(rel).stem, False
+    offset = 0
+
+    def close(end: int) -> None:
+        if end > start:
+            body = content[start:end].decode("utf-8", "replace")
+            tokens = tokenize(body) + tokenize(heading) * (HEADING_WEIGHT - 1)
+            sections.append((Section(rel, heading, start, end), tokens))
+
+    for line in content.splitlines(keepends=True):
+        text = line.decode("utf-8", "replace")
+        if _FENCE.match(text):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(text)
+        if match:
+            close(offset)
+            level, title = len(match.group(1)), match.group(2)
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, title))
+            start, heading = offset, " > ".join(t for _, t in stack)
+        offset += len(line)
+    close(offset)
+    return sections
+
+
+def build_index(knowledge_dir: Path) -> dict:
+    """Index every Markdown file under `knowledge_dir`.
+
+    The index maps each section to its byte range and each term to the
+    sections containing it (with term frequency), plus the file stamps used
+    to detect staleness.
+    """
+    files: dict[str, list[int]] = {}
+    sections: list[list] = []
+    lengths: list[int] = []
+    terms: dict[str, list[list[int]]] = {}
+
+    for path in sorted(knowledge_dir.rglob("*.md")):
+        rel = path.relative_to(knowledge_dir).as_posix()
+        st = path.stat()
+        files[rel] = [st.st_mtime_ns, st.st_size]
+        for section, tokens in split_sections(rel, path.read_bytes()):
+            sid = len(sections)
+            sections.append([section.file, section.heading, section.start, section.end])
+            lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                terms.setdefault(term, []).append([sid, count])
+
+    return {
+        "format": INDEX_FORMAT,
+        "files": files,
+        "sections": sections,
+        "lengths": lengths,
+        "terms": terms,
+    }
+
+
+def write_index(knowledge_dir: Path, index: dict) -> Path:
+    """Write the index next to the corpus (atomically)."""
+    path = knowledge_dir / INDEX_FILE
+    atomic_write(path, json.dumps(index, ensure_ascii=False).encode("utf-8"))
+    return path
+
+
+def is_stale(knowledge_dir: Path, index: dict) -> bool:
+    """True if any indexed file changed, or files were added/removed."""
+    if index.get("format") != INDEX_FORMAT:
+        return True
+    current = {}
+    for path in knowledge_dir.rglob("*.md"):
+        st = path.stat()
+        current[path.relative_to(knowledge_dir).as_posix()] = [
+            st.st_mtime_ns,
+            st.st_size,
+        ]
+    return current != index["files"]
+
+
+def load_index(knowledge_dir: Path) -> dict:
+    """Load the index, rebuilding it first if missing or stale."""
+    try:
+        index = json.loads((knowledge_dir / INDEX_FILE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        index = None
+    if index is None or is_stale(knowledge_dir, index):
+        index = build_index(knowledge_dir)
+        try:
+            write_index(knowledge_dir, index)
+        except OSError:
+            pass  # Read-only checkout: serve from memory
+    return index
+
+
+def search(index: dict, query: str, limit: int = 5) -> list[tuple[Section, float]]:
+    """Rank sections for a query with BM25."""
+    k1, b = 1.2, 0.75
+    lengths = index["lengths"]
+    if not lengths:
+        return []
+    avg_len = sum(lengths) / len(lengths)
+
+    scores: Counter[int] = Counter()
+    for term in set(tokenize(query)):
+        postings = index["terms"].get(term, [])
+        if not postings:
+            continue
+        idf = math.log(1 + (len(lengths) - len(postings) + 0.5) / (len(postings) + 0.5))
+        for sid, tf in postings:
+            norm = tf + k1 * (1 - b + b * lengths[sid] / avg_len)
+            scores[sid] += idf * tf * (k1 + 1) / norm
+
+    return [
+        (Section(*index["sections"][sid]), score)
+        for sid, score in scores.most_common(limit)
+    ]
+
+
+def read_sections(knowledge_dir: Path, sections: list[Section]) -> list[str]:
+    """Read section bodies via memory-mapped files (one map per file)."""
+    by_file: dict[str, list[int]] = {}
+    for i, section in enumerate(sections):
+        by_file.setdefault(section.file, []).append(i)
+
+    texts = [""] * len(sections)
+    for rel, positions in by_file.items():
+        with open(knowledge_dir / rel, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                continue
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for i in positions:
+                    section = sections[i]
+                    texts[i] = mm[section.start : section.end].decode(
+                        "utf-8", "replace"
+                    )
+    return texts
@@ -0,0 +1,234 @@
+"""Command linter - structural checks for installed slash-command files."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .asyncfs import IOPool
+from .export import command_file, emitter
+from .registry import CliRegistry
+from .store import Store
+from .templating import unrendered
+
+COMMAND_GLOB = "hefesto.*.md"  # command sources; installed files use the CLI format
+PLACEHOLDERS = ("$ARGUMENTS", "{{args}}")
+REQUIRED_SECTIONS = ("Rules",)
+CACHE_NAME = "lint"  # .hefesto/cache/lint.json
+CACHE_FORMAT = 3
+
+_COMMAND_NAME = re.compile(r"^(hefesto\.[\w-]+)")
+_FRONTMATTER = re.compile(r"\A---\r?\n(.*?)\r?\n---\r?\n", re.S)
+_DESCRIPTION = re.compile(r"^description:\s*\S", re.M)
+_TITLE = re.compile(r"^# (/\S+)", re.M)
+_SECTION = re.compile(r"^## (.+?)\s*$", re.M)
+_INPUT = re.compile(r"^\*\*Input:\*\*(.*)$", re.M)
+_TEMPLATE_REF = re.compile(r"(?<![\w/.-])(?:\.hefesto/)?templates/([\w.-]+\.md)")
+
+
+@dataclass(frozen=True)
+class ParsedCommand:
+    """Everything the checks need from a command file (CLI-independent)."""
+
+    has_description: bool
+    title: str | None
+    sections: list[str]
+    placeholders: dict[str, int]
+    input_line: str | None
+    template_refs: list[str]
+    template_tags: list[str]  # engine tags a raw copy of a source left behind
+
+
+@dataclass
+class CommandHealth:
+    """Lint outcome for one CLI's commands directory."""
+
+    found: int = 0
+    expected: int = 0
+    issues: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues and self.found >= self.expected
+
+
+def command_name(filename: str) -> str | None:
+    """`hefesto.create` for `hefesto.create.md` or `hefesto.create.agent.md`."""
+    match = _COMMAND_NAME.match(filename)
+    return match.group(1) if match else None
+
+
+def parse_command(text: str) -> ParsedCommand:
+    """Parse a command file once into the facts the rules check."""
+    frontmatter = _FRONTMATTER.match(text)
+    title = _TITLE.search(text)
+    input_line = _INPUT.search(text)
+    return ParsedCommand(
+        has_description=bool(frontmatter and _DESCRIPTION.search(frontmatter.group(1))),
+        title=title.group(1) if title else None,
+        sections=_SECTION.findall(text),
+        placeholders={p: text.count(p) for p in PLACEHOLDERS},
+        input_line=input_line.group(1) if input_line else None,
+        template_refs=sorted(set(_TEMPLATE_REF.findall(text))),
+        template_tags=sorted(set(unrendered(text))),
+    )
+
+
+def lint_command(
+    filename: str,
+    parsed: ParsedCommand,
+    cli: dict,
+    templates: set[str],
+) -> list[str]:
+    """Check one parsed command against the CLI it is installed in."""
+    issues = []
+    name = command_name(filename)
+
+    if not parsed.has_description:
+        issues.append("missing frontmatter 'description'")
+    if parsed.title is None:
+        issues.append("missing '# /hefesto.<command>' title")
+    elif name and parsed.title != f"/{name}":
+        issues.append(f"title '{parsed.title}' does not match file name")
+    for section in REQUIRED_SECTIONS:
+        if section not in parsed.sections:
+            issues.append(f"missing '## {section}' section")
+
+    # Other placeholders may be mentioned in prose (e.g. conversion notes);
+    # the file is wrong only if the CLI's own syntax is never used, or the
+    # Input line uses a foreign one.
+    expected = cli["var_syntax"]
+    foreign = [p for p in PLACEHOLDERS if p != expected and parsed.placeholders[p]]
+    if foreign and not parsed.placeholders.get(expected):
+        issues.append(f"uses {foreign[0]} but {cli['name']} expects {expected}")
+    elif parsed.input_line and expected not in parsed.input_line:
+        for placeholder in foreign:
+            if placeholder in parsed.input_line:
+                issues.append(f"Input line uses {placeholder}, expected {expected}")
+
+    for tag in parsed.template_tags:
+        issues.append(f"unrendered template tag {tag} (run: hefesto upgrade --force)")
+
+    for ref in parsed.template_refs:
+        if ref not in templates:
+            issues.append(f"references missing template .hefesto/templates/{ref}")
+
+    return [f"{filename}: {issue}" for issue in issues]
+
+
+def _read_bytes(path: Path) -> bytes | OSError:
+    """Read a command file; a failure is returned so it becomes a finding."""
+    try:
+        return path.read_bytes()
+    except OSError as e:
+        return e
+
+
+async def lint_clis(
+    project_root: Path,
+    detected_clis: dict[str, Path],
+    clis: CliRegistry,
+    expected_commands: list[str],
+    pool: IOPool,
+) -> dict[str, CommandHealth]:
+    """Lint every detected CLI's installed Hefesto commands.
+
+    Files are stat'ed in one batch; only files whose (mtime, size) changed
+    since the last run are read, and each distinct content is parsed once
+    no matter how many CLIs it is installed in.
+    """
+    hefesto_dir = project_root / ".hefesto"
+    cli_ids = list(detected_clis)
+    formats = [emitter(clis[c]["command_format"]) for c in cli_ids]
+    listings = await pool.gather(
+        pool.glob(
+            detected_clis[c] / clis[c]["commands_dir"],
+            command_file(clis[c], "hefesto.*"),
+        )
+        for c in cli_ids
+    )
+    template_entries = await pool.scandir(hefesto_dir / "templates")
+    templates = {name for name, is_dir in template_entries if not is_dir}
+
+    store = Store(hefesto_dir)
+    cache = store.load(CACHE_NAME, CACHE_FORMAT) or {"files": {}, "parsed": {}}
+    files = [path for listing in listings for path in listing]
+    stats = await pool.stat_many(files)
+
+    rel_paths = [path.relative_to(project_root).as_posix() for path in files]
+    digests: dict[str, str] = {}
+    stale: list[tuple[str, Path]] = []
+    for rel, path, st in zip(rel_paths, files, stats):
+        stamp = [st.st_mtime_ns, st.st_size] if st else None
+        entry = cache["files"].get(rel)
+        if entry and entry[:2] == stamp and entry[2] in cache["parsed"]:
+            digests[rel] = entry[2]
+        else:
+            stale.append((rel, path))
+
+    # Native formats are read back as Markdown; the digest covers the
+    # suffix because the same bytes parse differently in another format
+    native = {path: fmt for listing, fmt in zip(listings, formats) for path in listing}
+    contents = await pool.gather(pool.run(_read_bytes, p) for _, p in stale)
+    unreadable: dict[str, str] = {}
+    for (rel, path), content in zip(stale, contents):
+        if isinstance(content, OSError):
+            unreadable[rel] = f"could not be read: {content.strerror or content}"
+            continue
+        digest = hashlib.sha256(path.suffix.encode() + b"\0" + content).hexdigest()
+        digests[rel] = digest
+        if digest not in cache["parsed"]:
+            text = content.decode("utf-8", "replace")
+            text = native[path].to_markdown(text)
+            cache["parsed"][digest] = asdict(parse_command(text))
+
+    health: dict[str, CommandHealth] = {}
+    for cli_id, listing in zip(cli_ids, listings):
+        result = CommandHealth(found=len(listing), expected=len(expected_commands))
+        names = {command_name(path.name) for path in listing}
+        for missing in expected_commands:
+            if missing not in names:
+                result.issues.append(f"{missing}: not installed")
+        for path in listing:
+            rel = path.relative_to(project_root).as_posix()
+            if rel in unreadable:
+                result.issues.append(f"{path.name}: {unreadable[rel]}")
+                continue
+            parsed = ParsedCommand(**cache["parsed"][digests[rel]])
+            result.issues += lint_command(path.name, parsed, clis[cli_id], templates)
+        health[cli_id] = result
+
+    # Entries for the directories this run listed are replaced by what it
+    # saw, so the cache cannot grow without bound; entries other runs
+    # stored for other CLIs are kept.
+    live = {
+        rel: [st.st_mtime_ns, st.st_size, digests[rel]]
+        for rel, st in zip(rel_paths, stats)
+        if st is not None and rel in digests
+    }
+    scanned = tuple(
+        (detected_clis[c] / clis[c]["commands_dir"])
+        .relative_to(project_root)
+        .as_posix()
+        + "/"
+        for c in cli_ids
+    )
+
+    def merge(current: dict | None) -> dict:
+        current = current or {"files": {}, "parsed": {}}
+        merged = {
+            rel: entry
+            for rel, entry in current["files"].items()
+            if not rel.startswith(scanned)
+        }
+        merged.update(live)
+        known = {**current["parsed"], **cache["parsed"]}
+        used = {entry[2] for entry in merged.values()}
+        return {"files": merged, "parsed": {d: known[d] for d in used if d in known}}
+
+    seen = {rel: e for rel, e in cache["files"].items() if rel.startswith(scanned)}
+    if live != seen:
+        store.publish(CACHE_NAME, CACHE_FORMAT, merge=merge)
+    return health
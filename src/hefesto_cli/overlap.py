@@ -0,0 +1,260 @@
+"""Description overlap - near-duplicate descriptions and conflicting triggers.
+
+Agents pick a skill by its frontmatter `description`, so two skills whose
+descriptions (or "Use when:" triggers) say nearly the same thing make the
+wrong one load. Comparing every pair is quadratic; instead each text gets
+a MinHash signature over word shingles, and locality-sensitive hashing on
+bands of the signature yields only the pairs likely to be similar.
+Signatures are cached per description hash.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import random
+import re
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+from .asyncfs import IOPool
+from .catalog import SkillCatalog
+from .store import Store
+from .validate import FrontmatterError, read_frontmatter
+
+CACHE_NAME = "overlap"  # .hefesto/cache/overlap.json
+CACHE_FORMAT = 1  # bump when the shingling or hash functions change
+
+DUPLICATE = "description"
+TRIGGER = "trigger"
+# Minimum estimated Jaccard similarity of whole descriptions and of the
+# "Use when:" clauses for a pair to be reported
+THRESHOLDS = {DUPLICATE: 0.8, TRIGGER: 0.5}
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands of 4 rows: pairs above ~0.42 similarity become candidates
+ROWS = NUM_PERM // BANDS
+SHINGLE = 2  # words per shingle
+
+_PRIME = (1 << 31) - 1
+_rng = random.Random(0x4E5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)
+]
+_WORD = re.compile(r"\w+")
+_TRIGGER = re.compile(r"\buse when\b\s*:?\s*(.+)", re.I | re.S)
+
+
+@dataclass(frozen=True)
+class Overlap:
+    """Two skills an agent may confuse, in the CLIs that have both."""
+
+    kind: str  # DUPLICATE or TRIGGER
+    skills: tuple[str, str]
+    similarity: float  # estimated Jaccard similarity
+    clis: tuple[str, ...]
+
+
+@dataclass
+class OverlapReport:
+    overlaps: list[Overlap]
+    descriptions: int  # distinct descriptions compared
+    candidates: int  # pairs LSH let through to the similarity check
+    unreadable: list[str]  # project-relative SKILL.md paths without a description
+
+
+def shingles(text: str) -> set[str]:
+    """Lowercased word n-grams; single words for very short texts."""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE:
+        return set(words)
+    return {" ".join(words[i : i + SHINGLE]) for i in range(len(words) - SHINGLE + 1)}
+
+
+def minhash(text: str) -> array:
+    """MinHash signature of a text, NUM_PERM unsigned 32-bit values."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little")
+        for s in shingles(text)
+    ]
+    if not hashes:
+        return array("I", [_PRIME] * NUM_PERM)  # matches only other empty texts
+    return array(
+        "I", [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+    )
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def trigger(description: str) -> str | None:
+    """The text after "Use when:", if the description has one."""
+    match = _TRIGGER.search(description)
+    return match.group(1).strip() if match else None
+
+
+def candidate_pairs(signatures: list[array]) -> set[tuple[int, int]]:
+    """Index pairs sharing at least one identical band of their signatures."""
+    buckets: dict[tuple[int, bytes], list[int]] = {}
+    for index, signature in enumerate(signatures):
+        for band in range(BANDS):
+            key = signature[band * ROWS : (band + 1) * ROWS].tobytes()
+            buckets.setdefault((band, key), []).append(index)
+    pairs: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1 :]:
+                pairs.add((first, second))
+    return pairs
+
+
+async def analyze(
+    project_root: Path,
+    skills: SkillCatalog,
+    pool: IOPool,
+    focus: set[str] | None = None,
+) -> OverlapReport:
+    """Find skills whose descriptions or triggers overlap.
+
+    Every copy's SKILL.md is stat'ed in one batch and only files whose
+    (mtime, size) changed are read and parsed. Skills are compared within
+    each CLI, so a pair is reported with the CLIs that install both. With
+    `focus`, only pairs involving those skills are reported; they are
+    still compared against the whole catalog.
+    """
+    records = list(skills.records())
+    paths = [record.path / "SKILL.md" for record in records]
+    rels = [f"{record.rel}/SKILL.md" for record in records]
+    stats = await pool.stat_many(paths)
+
+    store = Store(project_root / ".hefesto")
+    cache = store.load(CACHE_NAME, CACHE_FORMAT) or {"files": {}, "signatures": {}}
+    digests: dict[str, str | None] = {}
+    stale: list[tuple[str, Path]] = []
+    for rel, path, st in zip(rels, paths, stats):
+        if st is None:
+            continue
+        entry = cache["files"].get(rel)
+        if (
+            entry
+            and entry[:2] == [st.st_mtime_ns, st.st_size]
+            and (entry[2] is None or entry[2] in cache["signatures"])
+        ):
+            digests[rel] = entry[2]
+        else:
+            stale.append((rel, path))
+
+    descriptions = await pool.gather(pool.run(_description, p) for _, p in stale)
+    fresh: dict[str, dict] = {}
+    for (rel, _), description in zip(stale, descriptions):
+        if description is None:
+            digests[rel] = None
+            continue
+        digest = hashlib.sha256(description.encode()).hexdigest()
+        digests[rel] = digest
+        if digest not in cache["signatures"] and digest not in fresh:
+            clause = trigger(description)
+            fresh[digest] = {
+                DUPLICATE: _encode(minhash(description)),
+                TRIGGER: _encode(minhash(clause)) if clause else None,
+            }
+    known = {**cache["signatures"], **fresh}
+
+    # Distinct (skill, description) variants and the CLIs holding each
+    variants: dict[tuple[str, str], set[str]] = {}
+    for record, rel in zip(records, rels):
+        if digests.get(rel):
+            variants.setdefault((record.name, digests[rel]), set()).add(record.cli_id)
+    keys = sorted(variants)
+    best: dict[tuple[str, tuple[str, str]], tuple[float, set[str]]] = {}
+    candidates = 0
+    for kind in (DUPLICATE, TRIGGER):
+        indexed = [key for key in keys if known[key[1]][kind] is not None]
+        signatures = [_decode(known[digest][kind]) for _, digest in indexed]
+        pairs = candidate_pairs(signatures)
+        candidates += len(pairs)
+        for i, j in pairs:
+            first, second = indexed[i][0], indexed[j][0]
+            if first == second:
+                continue  # two CLIs' copies of one skill
+            if focus is not None and first not in focus and second not in focus:
+                continue
+            clis = variants[indexed[i]] & variants[indexed[j]]
+            score = similarity(signatures[i], signatures[j])
+            if not clis or score < THRESHOLDS[kind]:
+                continue
+            key = (kind, tuple(sorted((first, second))))
+            previous_score, previous_clis = best.get(key, (0.0, set()))
+            best[key] = (max(score, previous_score), clis | previous_clis)
+
+    # Near-duplicate descriptions are not repeated as trigger conflicts
+    duplicates = {names for kind, names in best if kind == DUPLICATE}
+    overlaps = sorted(
+        (
+            Overlap(kind, names, score, _ordered(clis, skills))
+            for (kind, names), (score, clis) in best.items()
+            if kind == DUPLICATE or names not in duplicates
+        ),
+        key=lambda o: (o.kind != DUPLICATE, -o.similarity, o.skills),
+    )
+
+    live = {
+        rel: [st.st_mtime_ns, st.st_size, digests[rel]]
+        for rel, st in zip(rels, stats)
+        if st is not None
+    }
+    scanned = tuple(f"{i.skills_rel}/" for i in skills.installations)
+
+    def merge(current: dict | None) -> dict:
+        current = current or {"files": {}, "signatures": {}}
+        files = {
+            rel: entry
+            for rel, entry in current["files"].items()
+            if not rel.startswith(scanned)
+        }
+        files.update(live)
+        signatures = {**current["signatures"], **known}
+        used = {entry[2] for entry in files.values() if entry[2]}
+        return {
+            "files": files,
+            "signatures": {d: signatures[d] for d in used if d in signatures},
+        }
+
+    seen = {rel: e for rel, e in cache["files"].items() if rel.startswith(scanned)}
+    if live != seen or fresh:
+        store.publish(CACHE_NAME, CACHE_FORMAT, merge=merge)
+
+    unreadable = sorted(rel for rel in live if digests[rel] is None)
+    return OverlapReport(overlaps, len({d for _, d in keys}), candidates, unreadable)
+
+
+def _description(path: Path) -> str | None:
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+        description = read_frontmatter(text).get("description")
+    except (OSError, FrontmatterError):
+        return None
+    return description.strip() if isinstance(description, str) else None
+
+
+def _ordered(clis: set[str], skills: SkillCatalog) -> tuple[str, ...]:
+    """CLI ids in detection order."""
+    return tuple(i.cli_id for i in skills.installations if i.cli_id in clis)
+
+
+def _encode(signature: array) -> str:
+    if sys.byteorder == "big":
+        signature = array("I", signature)
+        signature.byteswap()
+    return base64.b64encode(signature.tobytes()).decode("ascii")
+
+
+def _decode(text: str) -> array:
+    signature = array("I", base64.b64decode(text))
+    if sys.byteorder == "big":
+        signature.byteswap()
+    return signature
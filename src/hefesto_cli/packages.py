@@ -0,0 +1,543 @@
+"""Skill packages and local registries.
+
+A package is a `.skill` zip holding one `<name>/` directory, as produced by
+skill-creator's package_skill.py. A registry is a directory (or a tarball
+of one, read-only) with a `catalog.json` and content-addressed packages:
+
+    catalog.json
+    objects/ab/ab12...ef.skill
+
+Packages are identified by the Merkle root of their files (the same hash
+`hefesto diff` uses), not by the zip bytes, so re-packing identical
+content never creates a second object.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import re
+import tarfile
+import threading
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from .asyncfs import IOPool
+from .drift import IGNORED, merkle_root
+from .planner import Plan, build_plan
+from .store import atomic_write, try_lock
+from .validate import FrontmatterError, read_frontmatter, validate_frontmatter
+
+CATALOG = "catalog.json"
+CATALOG_FORMAT = 1
+OBJECTS_DIR = "objects"
+PACKAGE_SUFFIX = ".skill"
+LOCKFILE = "packages.json"  # .hefesto/packages.json: what pull installed
+ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz")
+
+_SKILL_NAME = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+
+class PackageError(ValueError):
+    """Raised for malformed packages, registries or unresolvable names."""
+
+
+@dataclass(frozen=True)
+class Release:
+    """One published version of a skill."""
+
+    name: str
+    version: str
+    hash: str  # Merkle root of the package files
+    size: int  # bytes of the .skill file
+    description: str
+    files: dict[str, str] = field(default_factory=dict)  # rel -> sha256
+
+    @property
+    def package(self) -> str:
+        """Registry-relative path of the package object."""
+        return f"{OBJECTS_DIR}/{self.hash[:2]}/{self.hash}{PACKAGE_SUFFIX}"
+
+    def to_json(self) -> dict:
+        return {
+            "version": self.version,
+            "hash": self.hash,
+            "size": self.size,
+            "description": self.description,
+            "files": self.files,
+        }
+
+
+@dataclass
+class Catalog:
+    """Releases of every skill in a registry, oldest first."""
+
+    skills: dict[str, list[Release]] = field(default_factory=dict)
+
+    def resolve(self, spec: str) -> Release:
+        """Find `name`, `name@version` or `name@<hash prefix>`.
+
+        A bare name resolves to the most recently published release.
+        """
+        name, _, wanted = spec.partition("@")
+        releases = self.skills.get(name)
+        if not releases:
+            raise PackageError(f"Skill '{name}' is not in the registry")
+        if not wanted:
+            return releases[-1]
+        for release in reversed(releases):
+            if release.version == wanted:
+                return release
+        by_hash = [
+            r for r in releases if len(wanted) >= 7 and r.hash.startswith(wanted)
+        ]
+        if by_hash:
+            return by_hash[-1]
+        known = ", ".join(r.version for r in releases)
+        raise PackageError(f"No release '{wanted}' of '{name}' (known: {known})")
+
+    def add(self, release: Release) -> bool:
+        """Record a release; False if the same content is already published.
+
+        Published versions are immutable: re-publishing a version with
+        different content raises PackageError.
+        """
+        releases = self.skills.setdefault(release.name, [])
+        for existing in releases:
+            if existing.version == release.version:
+                if existing.hash == release.hash:
+                    return False
+                raise PackageError(
+                    f"{release.name}@{release.version} is already published "
+                    "with different content"
+                )
+        releases.append(release)
+        return True
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "format": CATALOG_FORMAT,
+                "skills": {
+                    name: [r.to_json() for r in releases]
+                    for name, releases in sorted(self.skills.items())
+                },
+            },
+            indent=2,
+        )
+
+    @classmethod
+    def loads(cls, text: str | bytes, where: str) -> Catalog:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise PackageError(f"Malformed catalog in {where}: {e}") from None
+        if not isinstance(data, dict) or data.get("format") != CATALOG_FORMAT:
+            raise PackageError(f"Unsupported catalog format in {where}")
+        try:
+            catalog = cls(
+                {
+                    name: [
+                        Release(
+                            name,
+                            str(entry["version"]),
+                            entry["hash"],
+                            int(entry["size"]),
+                            entry.get("description", ""),
+                            dict(entry.get("files", {})),
+                        )
+                        for entry in releases
+                    ]
+                    for name, releases in data["skills"].items()
+                }
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise PackageError(f"Malformed catalog in {where}: {e}") from None
+        # Names and paths become install paths: never trust them
+        for name, releases in catalog.skills.items():
+            if not _SKILL_NAME.match(name):
+                raise PackageError(f"Malformed catalog in {where}: skill {name!r}")
+            for release in releases:
+                unsafe = [rel for rel in release.files if not _safe_rel(rel)]
+                if unsafe:
+                    raise PackageError(
+                        f"Malformed catalog in {where}: unsafe path {unsafe[0]!r}"
+                    )
+        return catalog
+
+
+class Registry:
+    """A registry on the local filesystem: a directory, or a tarball of one.
+
+    `location` is a path or a `file://` URL; nothing is fetched over the
+    network.
+    """
+
+    def __init__(self, location: str):
+        self.location = location
+        self.path = _local_path(location)
+        self.is_archive = self.path.name.endswith(ARCHIVE_SUFFIXES)
+        # Archive members by registry-relative path, indexed on first read
+        self._members: dict[str, tarfile.TarInfo] | None = None
+        self._index_lock = threading.Lock()
+
+    def catalog(self) -> Catalog:
+        """The registry catalog (empty for a new directory registry)."""
+        try:
+            text = self._read(CATALOG)
+        except FileNotFoundError:
+            if self.is_archive or self.path.is_file():
+                raise PackageError(f"No {CATALOG} in {self.location}") from None
+            return Catalog()
+        return Catalog.loads(text, self.location)
+
+    def fetch(self, release: Release) -> bytes:
+        """Read a release's package (check it with `verify`)."""
+        try:
+            data = self._read(release.package)
+        except FileNotFoundError:
+            raise PackageError(
+                f"Package of {release.name}@{release.version} missing from "
+                f"{self.location}"
+            ) from None
+        return data
+
+    def publish(self, packages: list[tuple[Release, bytes]]) -> list[Release]:
+        """Add packages under the registry lock; returns the new releases.
+
+        Objects already present (by content hash) are not copied again,
+        and the catalog is replaced atomically after every object is in
+        place, so readers never see a release without its package.
+        """
+        if self.is_archive:
+            raise PackageError(f"Cannot push to a registry archive: {self.location}")
+        self.path.mkdir(parents=True, exist_ok=True)
+        with try_lock(self.path / "catalog.lock") as locked:
+            if not locked:
+                raise PackageError(
+                    f"Registry is locked by another push: {self.location}"
+                )
+            catalog = self.catalog()
+            added = [release for release, _ in packages if catalog.add(release)]
+            for release, data in packages:
+                target = self.path / release.package
+                if release in added and not target.exists():
+                    atomic_write(target, data)
+            if added:
+                atomic_write(self.path / CATALOG, catalog.dumps().encode())
+        return added
+
+    def _read(self, rel: str) -> bytes:
+        if not self.is_archive:
+            return (self.path / rel).read_bytes()
+        try:
+            info = self._index().get(rel)
+            if info is None:
+                raise FileNotFoundError(rel)
+            # Seek straight to the indexed member instead of rescanning
+            with tarfile.open(self.path) as tar:
+                member = tar.extractfile(info)
+                if member is None:
+                    raise FileNotFoundError(rel)
+                return member.read()
+        except (tarfile.TarError, OSError) as e:
+            if isinstance(e, FileNotFoundError):
+                raise
+            raise PackageError(f"Cannot read registry {self.location}: {e}") from None
+
+    def _index(self) -> dict[str, tarfile.TarInfo]:
+        """Scan the archive once; concurrent fetches share the index."""
+        with self._index_lock:
+            if self._members is None:
+                with tarfile.open(self.path) as tar:
+                    infos = tar.getmembers()
+                # Accept tarballs of the registry directory itself
+                prefix = _tar_prefix([info.name for info in infos])
+                self._members = {
+                    info.name[len(prefix) :]: info
+                    for info in infos
+                    if info.isfile() and info.name.startswith(prefix)
+                }
+            return self._members
+
+
+# ── Packages ─────────────────────────────────────────────────────────────────
+
+
+def build_package(skill_dir: Path) -> bytes:
+    """Zip a skill directory the way package_skill.py does, reproducibly.
+
+    Members are sorted and carry a fixed timestamp, so the same files
+    always produce the same bytes.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(skill_dir.rglob("*")):
+            rel = path.relative_to(skill_dir)
+            if not path.is_file() or IGNORED.intersection(rel.parts):
+                continue
+            info = zipfile.ZipInfo(
+                f"{skill_dir.name}/{rel.as_posix()}", date_time=(1980, 1, 1, 0, 0, 0)
+            )
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (path.stat().st_mode & 0o777) << 16
+            zf.writestr(info, path.read_bytes())
+    return buffer.getvalue()
+
+
+def read_package(data: bytes) -> tuple[str, dict[str, bytes], dict[str, int]]:
+    """Skill name, `{rel: content}` and `{rel: mode}` of a `.skill` package.
+
+    Modes are only given for members stored as executable, as 0o755.
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            entries = [info for info in zf.infolist() if not info.is_dir()]
+            contents = [zf.read(info) for info in entries]
+    except (zipfile.BadZipFile, OSError) as e:
+        raise PackageError(f"Not a .skill package: {e}") from None
+
+    for info in entries:
+        if not _safe_rel(info.filename):
+            raise PackageError(f"Unsafe path in package: {info.filename}")
+    tops = {info.filename.split("/", 1)[0] for info in entries}
+    if len(tops) != 1:
+        raise PackageError("A .skill package must contain exactly one skill directory")
+    name = tops.pop()
+    if not _SKILL_NAME.match(name):
+        raise PackageError(f"Skill directory must be kebab-case, got {name!r}")
+    files = {}
+    modes = {}
+    for info, content in zip(entries, contents):
+        rel = info.filename.split("/", 1)[1] if "/" in info.filename else ""
+        if not rel:
+            raise PackageError(f"File outside the skill directory: {info.filename}")
+        if not IGNORED.intersection(rel.split("/")):
+            files[rel] = content
+            if (info.external_attr >> 16) & 0o111:
+                modes[rel] = 0o755
+    if "SKILL.md" not in files:
+        raise PackageError(f"SKILL.md not found in package '{name}'")
+    try:
+        declared = read_frontmatter(files["SKILL.md"].decode("utf-8")).get("name")
+    except (FrontmatterError, UnicodeDecodeError) as e:
+        raise PackageError(f"{name}: {e}") from None
+    if declared != name:
+        raise PackageError(
+            f"Skill directory '{name}' does not match its frontmatter name "
+            f"{declared!r}"
+        )
+    return name, files, modes
+
+
+def leaves(files: dict[str, bytes]) -> dict[str, str]:
+    """Per-file sha256 of package contents."""
+    return {rel: hashlib.sha256(content).hexdigest() for rel, content in files.items()}
+
+
+def make_release(data: bytes, version: str | None = None) -> Release:
+    """Describe a package, validating its SKILL.md frontmatter.
+
+    The version is `version`, else `metadata.version` from the frontmatter,
+    else the first 12 characters of the content hash.
+    """
+    name, files, _ = read_package(data)
+    try:
+        frontmatter = read_frontmatter(files["SKILL.md"].decode("utf-8"))
+    except (FrontmatterError, UnicodeDecodeError) as e:
+        raise PackageError(f"{name}: {e}") from None
+    issues = validate_frontmatter(frontmatter)
+    if issues:
+        raise PackageError(f"{name}: {issues[0]}")
+
+    digests = leaves(files)
+    content_hash = merkle_root(digests)
+    metadata = frontmatter.get("metadata")
+    if version is None and isinstance(metadata, dict) and metadata.get("version"):
+        version = str(metadata["version"])
+    description = frontmatter.get("description", "")
+    return Release(
+        name,
+        version or content_hash[:12],
+        content_hash,
+        len(data),
+        " ".join(description.split()) if isinstance(description, str) else "",
+        digests,
+    )
+
+
+def verify(data: bytes, release: Release) -> tuple[dict[str, bytes], dict[str, int]]:
+    """Package contents and modes, checked against the release's content hash."""
+    name, files, modes = read_package(data)
+    if name != release.name or merkle_root(leaves(files)) != release.hash:
+        raise PackageError(f"Package of {release.name}@{release.version} is corrupt")
+    return files, modes
+
+
+# ── Pull ─────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class PullResult:
+    """What a pull will write, and where packages come from."""
+
+    plan: Plan
+    up_to_date: list[tuple[str, Path]] = field(default_factory=list)
+    fetched: list[Release] = field(default_factory=list)  # copied from registry
+    cached: list[Release] = field(default_factory=list)  # found in .hefesto/objects
+    modified: list[Path] = field(default_factory=list)  # edited locally, kept
+
+
+async def plan_pull(
+    releases: list[Release],
+    skills_dirs: list[Path],
+    registry: Registry,
+    hefesto_dir: Path,
+    pool: IOPool,
+    force: bool = False,
+    dry_run: bool = False,
+) -> PullResult:
+    """Plan installing releases into every skills directory in one batch.
+
+    Installed copies are hashed first; a release whose files all match in
+    every target is neither fetched nor written. A file that differs from
+    the digest recorded at the last pull was edited locally: it is left
+    alone and reported (overwritten with `force`), as `upgrade` does.
+    Packages come from the project's object cache when present, else from
+    the registry (and are then cached, unless `dry_run`). Files a copy has
+    beyond the package are left alone.
+    """
+    targets = [(r, d / r.name) for r in releases for d in skills_dirs]
+    current = await pool.gather(
+        pool.gather([pool.run(_sha_or_none, skill_dir / rel) for rel in r.files])
+        for r, skill_dir in targets
+    )
+    pulled = load_pulled(hefesto_dir)
+    result = PullResult(Plan())
+    stale: list[tuple[Release, Path, list[str]]] = []
+    for (release, skill_dir), digests in zip(targets, current):
+        if digests == list(release.files.values()):
+            result.up_to_date.append((release.name, skill_dir))
+            continue
+        recorded = _pulled_files(pulled, release.name)
+        writes = []
+        for (rel, digest), found in zip(release.files.items(), digests):
+            if found == digest:
+                continue
+            if found is None or force or found == recorded.get(rel):
+                writes.append(rel)
+            else:
+                result.modified.append(skill_dir / rel)
+        if writes:
+            stale.append((release, skill_dir, writes))
+
+    needed = list({release.hash: release for release, _, _ in stale}.values())
+    cache_dir = hefesto_dir / OBJECTS_DIR
+
+    def load(release: Release) -> tuple[tuple[dict[str, bytes], dict[str, int]], bool]:
+        cached = cache_dir / f"{release.hash}{PACKAGE_SUFFIX}"
+        try:
+            return verify(cached.read_bytes(), release), True
+        except (OSError, PackageError):
+            pass
+        data = registry.fetch(release)
+        package = verify(data, release)
+        if hefesto_dir.is_dir() and not dry_run:
+            atomic_write(cached, data)
+        return package, False
+
+    loaded = await pool.gather(pool.run(load, release) for release in needed)
+    contents = {}
+    for release, (package, from_cache) in zip(needed, loaded):
+        contents[release.hash] = package
+        (result.cached if from_cache else result.fetched).append(release)
+
+    files: dict[Path, Path | bytes] = {}
+    modes: dict[Path, int] = {}
+    for release, skill_dir, writes in stale:
+        package_files, package_modes = contents[release.hash]
+        for rel in writes:
+            files[skill_dir / rel] = package_files[rel]
+            if rel in package_modes:
+                modes[skill_dir / rel] = package_modes[rel]
+    result.plan = await build_plan(
+        [skill_dir for _, skill_dir, _ in stale], files, pool, modes
+    )
+    return result
+
+
+def load_pulled(hefesto_dir: Path) -> dict[str, dict]:
+    """Skills recorded in .hefesto/packages.json ({} if missing or unreadable)."""
+    try:
+        skills = json.loads((hefesto_dir / LOCKFILE).read_bytes())["skills"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    return skills if isinstance(skills, dict) else {}
+
+
+def record_pull(hefesto_dir: Path, releases: list[Release], location: str) -> None:
+    """Note pulled releases in .hefesto/packages.json (kept for gc), with the
+    digest of every file so the next pull can tell local edits apart."""
+    if not hefesto_dir.is_dir():
+        return
+    skills = load_pulled(hefesto_dir)
+    for release in releases:
+        skills[release.name] = {
+            "version": release.version,
+            "hash": release.hash,
+            "registry": location,
+            "files": release.files,
+        }
+    payload = {"format": CATALOG_FORMAT, "skills": dict(sorted(skills.items()))}
+    atomic_write(hefesto_dir / LOCKFILE, json.dumps(payload, indent=2).encode())
+
+
+def _pulled_files(pulled: dict[str, dict], name: str) -> dict[str, str]:
+    """Per-file digests recorded when `name` was last pulled."""
+    entry = pulled.get(name)
+    files = entry.get("files") if isinstance(entry, dict) else None
+    return files if isinstance(files, dict) else {}
+
+
+def _sha_or_none(path: Path) -> str | None:
+    try:
+        with open(path, "rb") as fh:
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _safe_rel(rel: str) -> bool:
+    """A relative POSIX path that cannot leave the directory it is joined to."""
+    parts = rel.split("/")
+    return (
+        "\\" not in rel
+        and ":" not in parts[0]  # no Windows drive
+        and not {"", ".", ".."}.intersection(parts)  # also rejects "/abs"
+    )
+
+
+def _local_path(location: str) -> Path:
+    parsed = urlparse(location)
+    if parsed.scheme == "file":
+        if parsed.netloc not in ("", "localhost"):
+            raise PackageError(f"Remote file:// hosts are not supported: {location}")
+        return Path(url2pathname(unquote(parsed.path)))
+    if len(parsed.scheme) > 1:  # not a Windows drive letter
+        raise PackageError(
+            f"Only local registries are supported (path or file:// URL): {location}"
+        )
+    return Path(location)
+
+
+def _tar_prefix(names: list[str]) -> str:
+    """Directory inside a tarball that holds catalog.json ('' at the top)."""
+    candidates = [n for n in names if n == CATALOG or n.endswith(f"/{CATALOG}")]
+    if not candidates:
+        return ""
+    best = min(candidates, key=lambda n: n.count("/"))
+    return best[: -len(CATALOG)]
@@ -0,0 +1,204 @@
+"""Installer payload - one compressed, indexed archive for every CLI.
+
+The payload is exactly what `hefesto init` renders for every built-in CLI,
+so installing it and running `init` or `upgrade` afterwards agree file for
+file. Members are laid out by destination: `hefesto/<path>` lands in
+`.hefesto/<path>` and `clis/<cli id>/<path>` in that CLI's project folder.
+Their contents are stored once per distinct digest as `objects/<sha256>`,
+and an `index.json` member records the size and SHA-256 of every member,
+so targets that are already up to date are recognised without
+decompressing anything.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import re
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from .asyncfs import IOPool
+from .store import atomic_write
+from .templating import unrendered
+
+INDEX = "index.json"
+INDEX_FORMAT = 2
+OBJECTS = "objects"
+ARCHIVE_NAME = "payload.zip"  # next to installer/install.sh
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class PayloadError(ValueError):
+    """Raised when a payload archive is missing, malformed or corrupt."""
+
+
+@dataclass(frozen=True)
+class PayloadIndex:
+    """Version, CLI definitions and member digests of a payload archive."""
+
+    version: str
+    files: dict[str, tuple[int, str]]  # member -> (size, sha256)
+    # CLI id -> digest of the registry entry its files were rendered from
+    configs: dict[str, str]
+
+    def clis(self) -> list[str]:
+        """CLI ids the payload has files for, in archive order."""
+        return list(self.configs)
+
+    def targets(self, project_root: Path, targets: dict[str, Path]) -> dict[str, Path]:
+        """Destination of every member that applies to the target CLIs."""
+        found = {}
+        for member in self.files:
+            head, _, rest = member.partition("/")
+            if head == "hefesto":
+                found[member] = project_root / ".hefesto" / rest
+            elif head == "clis":
+                cli_id, _, rel = rest.partition("/")
+                if cli_id in targets:
+                    found[member] = targets[cli_id] / rel
+        return found
+
+
+def config_digest(context: dict) -> str:
+    """Digest of what a CLI's files are rendered from (its template context
+    and command format), to tell whether a payload fits a project's CLI."""
+    return hashlib.sha256(json.dumps(context, sort_keys=True).encode()).hexdigest()
+
+
+def build(
+    files: dict[str, bytes], configs: dict[str, str], version: str
+) -> tuple[PayloadIndex, bytes]:
+    """Index and archive bytes for rendered members.
+
+    Members are indexed in sorted order and each distinct content is
+    deflated once, with a fixed timestamp, so packing is reproducible.
+    """
+    if not files:
+        raise PayloadError("No payload files to pack")
+    for member, data in sorted(files.items()):
+        tags = unrendered(data.decode("utf-8", "replace"))
+        if tags:
+            raise PayloadError(f"Unrendered template tag {tags[0]} in {member}")
+    index = PayloadIndex(
+        version,
+        {
+            member: (len(data), hashlib.sha256(data).hexdigest())
+            for member, data in sorted(files.items())
+        },
+        dict(configs),
+    )
+    blobs = {index.files[member][1]: data for member, data in files.items()}
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(_info(INDEX), _dump_index(index), compresslevel=9)
+        for digest in sorted(blobs):
+            zf.writestr(_info(f"{OBJECTS}/{digest}"), blobs[digest], compresslevel=9)
+    return index, buffer.getvalue()
+
+
+def pack(
+    files: dict[str, bytes], configs: dict[str, str], archive: Path, version: str
+) -> PayloadIndex:
+    """Write the archive; it replaces any previous one atomically."""
+    index, data = build(files, configs, version)
+    atomic_write(archive, data)
+    return index
+
+
+def read_index(archive: Path) -> PayloadIndex:
+    """Read the index member of a payload archive."""
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            data = json.loads(zf.read(INDEX))
+    except FileNotFoundError:
+        raise PayloadError(f"Payload archive not found: {archive}") from None
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        raise PayloadError(f"Invalid payload archive {archive}: {e}") from None
+    if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+        raise PayloadError(f"Unsupported payload index format in {archive}")
+    try:
+        index = PayloadIndex(
+            str(data["version"]),
+            {m: (int(size), str(sha)) for m, (size, sha) in data["files"].items()},
+            {str(cli_id): str(d) for cli_id, d in data["clis"].items()},
+        )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        raise PayloadError(f"Malformed payload index in {archive}") from None
+    for member in index.files:
+        parts = member.split("/")
+        if member.startswith("/") or ".." in parts or "\\" in member:
+            raise PayloadError(f"Unsafe member path in {archive}: {member}")
+        if not _SHA256.match(index.files[member][1]):
+            raise PayloadError(f"Malformed digest in {archive}: {member}")
+    return index
+
+
+async def changed_members(
+    index: PayloadIndex, destinations: dict[str, Path], pool: IOPool
+) -> list[str]:
+    """Members whose destination is missing or differs from the archive.
+
+    Destinations are stat'ed concurrently; only those with the indexed size
+    are hashed, and nothing is decompressed.
+    """
+    members = list(destinations)
+    stats = await pool.stat_many(destinations[m] for m in members)
+    same_size = [
+        m
+        for m, st in zip(members, stats)
+        if st is not None and st.st_size == index.files[m][0]
+    ]
+    digests = await pool.gather(pool.run(_digest, destinations[m]) for m in same_size)
+    unchanged = {m for m, d in zip(same_size, digests) if d == index.files[m][1]}
+    return [m for m in members if m not in unchanged]
+
+
+async def read_objects(
+    archive: Path, digests: list[str], pool: IOPool
+) -> dict[str, bytes]:
+    """Decompress contents by digest concurrently, each checked on the way.
+
+    Each worker opens its own handle, so objects inflate in parallel.
+    """
+
+    def read(digest: str) -> bytes:
+        with zipfile.ZipFile(archive) as zf:
+            data = zf.read(f"{OBJECTS}/{digest}")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise PayloadError(f"Corrupt payload object: {digest}")
+        return data
+
+    try:
+        contents = await pool.gather([pool.run(read, d) for d in digests])
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        raise PayloadError(f"Cannot read payload archive {archive}: {e}") from None
+    return dict(zip(digests, contents))
+
+
+def _info(member: str) -> zipfile.ZipInfo:
+    # Fixed timestamp and permissions keep packing reproducible
+    info = zipfile.ZipInfo(member, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _dump_index(index: PayloadIndex) -> str:
+    return json.dumps(
+        {
+            "format": INDEX_FORMAT,
+            "version": index.version,
+            "clis": index.configs,
+            "files": {m: list(entry) for m, entry in index.files.items()},
+        },
+        indent=1,
+    )
+
+
+def _digest(path: Path) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
@@ -0,0 +1,196 @@
+"""Install planner - compute the delta against disk, then apply it atomically."""
+
+from __future__ import annotations
+
+import difflib
+import os
+import shutil
+import stat
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .asyncfs import IOPool
+
+MKDIR = "mkdir"
+CREATE = "create"
+UPDATE = "update"
+
+
+@dataclass(frozen=True)
+class Operation:
+    """A single change to the tree: create a directory or write a file."""
+
+    kind: str  # MKDIR, CREATE or UPDATE
+    target: Path
+    content: bytes | None = None  # new content (files only)
+    current: bytes | None = None  # content on disk (UPDATE only)
+    mode: int | None = None  # permission bits (None keeps the current ones)
+
+
+@dataclass
+class Plan:
+    """Ordered operations plus the files that are already up to date."""
+
+    operations: list[Operation] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.operations
+
+    def of_kind(self, kind: str) -> list[Operation]:
+        return [op for op in self.operations if op.kind == kind]
+
+
+async def build_plan(
+    directories: list[Path],
+    files: dict[Path, Path | bytes],
+    pool: IOPool,
+    modes: dict[Path, int] | None = None,
+) -> Plan:
+    """Compare the desired state with the disk and return only the delta.
+
+    `files` maps each target to its source file (a Path) or literal content
+    (bytes). Insertion order is kept, so callers control what is written
+    last (e.g. the version marker). `modes` sets permission bits on
+    written files (e.g. executable scripts); an update without one keeps
+    the permissions of the file it replaces.
+    """
+    modes = modes or {}
+    dir_present = await pool.exists_many(directories)
+    targets = list(files)
+    desired, current = await pool.gather(
+        [
+            pool.gather(_content(pool, files[t]) for t in targets),
+            pool.gather(pool.run(read_or_none, t) for t in targets),
+        ]
+    )
+
+    plan = Plan()
+    seen_dirs: set[Path] = set()
+    for directory, present in zip(directories, dir_present):
+        if not present and directory not in seen_dirs:
+            seen_dirs.add(directory)
+            plan.operations.append(Operation(MKDIR, directory))
+
+    for target, new, old in zip(targets, desired, current):
+        if old is None:
+            plan.operations.append(
+                Operation(CREATE, target, new, mode=modes.get(target))
+            )
+        elif old != new:
+            plan.operations.append(
+                Operation(UPDATE, target, new, old, mode=modes.get(target))
+            )
+        else:
+            plan.unchanged.append(target)
+    return plan
+
+
+def render_diff(op: Operation, root: Path) -> list[str]:
+    """Unified diff lines for an UPDATE operation."""
+    rel = op.target.relative_to(root).as_posix()
+    old = (op.current or b"").decode("utf-8", "replace").splitlines(keepends=True)
+    new = (op.content or b"").decode("utf-8", "replace").splitlines(keepends=True)
+    return [
+        line.rstrip("\n")
+        for line in difflib.unified_diff(old, new, f"a/{rel}", f"b/{rel}")
+    ]
+
+
+async def apply_plan(plan: Plan, root: Path, pool: IOPool) -> None:
+    """Apply a plan transactionally.
+
+    Every file is first written to a staging directory inside `root` (same
+    filesystem, so renames are atomic). Only when staging succeeds are the
+    files renamed into place, in plan order; if any rename fails, replaced
+    files are restored and created files/directories are removed.
+    """
+    if plan.is_empty:
+        return
+
+    staging = Path(tempfile.mkdtemp(prefix=".hefesto-stage-", dir=root))
+    try:
+        file_ops = [op for op in plan.operations if op.kind != MKDIR]
+        staged = [staging / f"{i}.new" for i in range(len(file_ops))]
+        await pool.gather(
+            pool.run(_write_bytes, path, op.content, op.mode, op.target)
+            for path, op in zip(staged, file_ops)
+        )
+        _commit(plan, dict(zip((op.target for op in file_ops), staged)), staging)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _commit(plan: Plan, staged: dict[Path, Path], staging: Path) -> None:
+    created_dirs: list[Path] = []
+    created_files: list[Path] = []
+    backups: list[tuple[Path, Path]] = []  # (backup, original target)
+
+    try:
+        for op in plan.operations:
+            if op.kind == MKDIR:
+                created_dirs.extend(_mkdirs(op.target))
+                continue
+
+            created_dirs.extend(_mkdirs(op.target.parent))
+            if op.kind == UPDATE and op.target.exists():
+                backup = staging / f"{len(backups)}.bak"
+                os.replace(op.target, backup)
+                backups.append((backup, op.target))
+            else:
+                created_files.append(op.target)
+            os.replace(staged[op.target], op.target)
+    except BaseException:
+        for path in reversed(created_files):
+            path.unlink(missing_ok=True)
+        for backup, target in reversed(backups):
+            os.replace(backup, target)
+        for directory in reversed(created_dirs):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        raise
+
+
+def _mkdirs(directory: Path) -> list[Path]:
+    """Create `directory` and missing parents; return what was created."""
+    missing = []
+    current = directory
+    while not current.exists():
+        missing.append(current)
+        current = current.parent
+    for path in reversed(missing):
+        path.mkdir(exist_ok=True)
+    return list(reversed(missing))
+
+
+async def _content(pool: IOPool, source: Path | bytes) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    return await pool.run(source.read_bytes)
+
+
+def read_or_none(path: Path) -> bytes | None:
+    """Read a file's bytes, or None if it does not exist."""
+    try:
+        return path.read_bytes()
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        return None
+
+
+def _write_bytes(
+    path: Path, content: bytes | None, mode: int | None, target: Path
+) -> None:
+    path.write_bytes(content or b"")
+    if mode is None:
+        # Without an explicit mode an update keeps the replaced file's
+        # permissions (e.g. the exec bit); the rename would otherwise
+        # install the staging file's default mode.
+        try:
+            mode = stat.S_IMODE(target.stat().st_mode)
+        except OSError:
+            return
+    path.chmod(mode)
@@ -0,0 +1,233 @@
+"""CLI registry - AI CLI definitions loaded from TOML and entry points."""
+
+from __future__ import annotations
+
+import hashlib
+import tomllib
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from pathlib import Path, PurePosixPath
+
+from .store import Store
+
+BUILTIN_REGISTRY = Path(__file__).parent / "clis.toml"
+PROJECT_REGISTRY = "clis.toml"  # inside .hefesto/
+ENTRY_POINT_GROUP = "hefesto_cli.clis"
+CACHE_NAME = "clis"  # .hefesto/cache/clis.json
+CACHE_FORMAT = 2
+DEFAULT_COMMAND_FORMAT = "markdown"
+
+# field -> (type, required)
+FIELDS: dict[str, tuple[type, bool]] = {
+    "name": (str, True),
+    "folder": (str, True),
+    "skills_dir": (str, True),
+    "commands_dir": (str, True),
+    "var_syntax": (str, True),
+    "requires_cli": (bool, True),
+    "detect": (list, False),
+    "command_format": (str, False),
+    "executable": (str, False),
+}
+
+
+class RegistryError(ValueError):
+    """Raised when a CLI definition is malformed."""
+
+
+@dataclass(frozen=True, slots=True)
+class CliRegistry:
+    """Validated CLI definitions compiled into lookup tables."""
+
+    config: dict[str, dict]
+    by_folder: dict[str, str]  # project folder -> cli id
+    # (cli id, detect paths) for CLIs not detected by a top-level folder
+    probes: tuple[tuple[str, tuple[str, ...]], ...]
+
+    def __getitem__(self, cli_id: str) -> dict:
+        return self.config[cli_id]
+
+    def __contains__(self, cli_id: object) -> bool:
+        return cli_id in self.config
+
+    def cli_for_path(self, rel_path: str | PurePosixPath) -> str | None:
+        """CLI owning a project-relative path (longest matching folder)."""
+        parts = PurePosixPath(rel_path).parts
+        for end in range(len(parts), 0, -1):
+            cli_id = self.by_folder.get("/".join(parts[:end]))
+            if cli_id is not None:
+                return cli_id
+        return None
+
+
+def compile_registry(config: dict[str, dict]) -> CliRegistry:
+    """Build lookup tables from already validated definitions.
+
+    A CLI detected by nothing but a top-level folder is found through
+    `by_folder` in a listing of the project root; only the others need
+    their detection paths probed.
+    """
+    by_folder = {
+        PurePosixPath(entry["folder"]).as_posix(): cli_id
+        for cli_id, entry in config.items()
+    }
+    return CliRegistry(
+        config=config,
+        by_folder=by_folder,
+        probes=tuple(
+            (cli_id, tuple(entry["detect"]))
+            for cli_id, entry in config.items()
+            if not _top_level_only(entry)
+        ),
+    )
+
+
+def _top_level_only(entry: dict) -> bool:
+    folder = PurePosixPath(entry["folder"])
+    return len(folder.parts) == 1 and [
+        PurePosixPath(rel) for rel in entry["detect"]
+    ] == [folder]
+
+
+def validate_entry(cli_id: str, entry: object, source: str) -> dict:
+    """Check one CLI definition and fill in defaults."""
+    where = f"{source}: CLI '{cli_id}'"
+    if not isinstance(entry, dict):
+        raise RegistryError(f"{where} must be a table")
+
+    unknown = set(entry) - set(FIELDS)
+    if unknown:
+        raise RegistryError(f"{where} has unknown key(s): {', '.join(sorted(unknown))}")
+
+    for key, (expected, required) in FIELDS.items():
+        if key not in entry:
+            if required:
+                raise RegistryError(f"{where} is missing '{key}'")
+            continue
+        if not isinstance(entry[key], expected):
+            raise RegistryError(f"{where}: '{key}' must be a {expected.__name__}")
+
+    entry = dict(entry)
+    entry.setdefault("detect", [entry["folder"]])
+    entry.setdefault("command_format", DEFAULT_COMMAND_FORMAT)
+    for rel in [entry["folder"], entry["skills_dir"], entry["commands_dir"]]:
+        _check_relative(rel, where)
+    for rel in entry["detect"]:
+        if not isinstance(rel, str):
+            raise RegistryError(f"{where}: 'detect' entries must be strings")
+        _check_relative(rel, where)
+    return entry
+
+
+def validate_registry(config: dict[str, dict]) -> None:
+    """Cross-entry checks: every project folder belongs to one CLI."""
+    owners: dict[str, str] = {}
+    for cli_id, entry in config.items():
+        other = owners.setdefault(entry["folder"], cli_id)
+        if other != cli_id:
+            raise RegistryError(
+                f"CLIs '{other}' and '{cli_id}' both use folder '{entry['folder']}'"
+            )
+
+
+def load_registry(project_root: Path | None = None) -> CliRegistry:
+    """Load built-in, entry point and project CLI definitions.
+
+    Later sources override earlier ones by CLI id. When the project has a
+    `.hefesto/` directory the validated result is cached there, keyed by
+    the sources' fingerprints, so repeated runs skip parsing and loading
+    entry point modules.
+    """
+    hefesto_dir = project_root / ".hefesto" if project_root else None
+    project_file = hefesto_dir / PROJECT_REGISTRY if hefesto_dir else None
+    plugins = sorted(entry_points(group=ENTRY_POINT_GROUP), key=lambda ep: ep.name)
+
+    key = _fingerprint(
+        [BUILTIN_REGISTRY, project_file],
+        [f"{ep.name}={ep.value}@{_distribution(ep)}" for ep in plugins],
+    )
+    cache = Store(hefesto_dir) if hefesto_dir else None
+    cached = cache.load(CACHE_NAME, CACHE_FORMAT) if cache else None
+    if cached is not None and cached.get("key") == key:
+        return compile_registry(cached["clis"])
+
+    config: dict[str, dict] = {}
+    config.update(_load_toml(BUILTIN_REGISTRY))
+    for ep in plugins:
+        config.update(_load_entry_point(ep))
+    if project_file is not None and project_file.exists():
+        config.update(_load_toml(project_file))
+    validate_registry(config)
+
+    if cache is not None:
+        cache.publish(CACHE_NAME, CACHE_FORMAT, {"key": key, "clis": config})
+    return compile_registry(config)
+
+
+def builtin_registry() -> CliRegistry:
+    """Only the CLIs Hefesto ships with, whatever plugins are installed."""
+    config = _load_toml(BUILTIN_REGISTRY)
+    validate_registry(config)
+    return compile_registry(config)
+
+
+# ── Sources ──────────────────────────────────────────────────────────────────
+
+
+def _load_toml(path: Path) -> dict[str, dict]:
+    try:
+        with path.open("rb") as fh:
+            data = tomllib.load(fh)
+    except (tomllib.TOMLDecodeError, UnicodeDecodeError, OSError) as e:
+        raise RegistryError(f"{path}: {e}") from e
+    return {
+        cli_id: validate_entry(cli_id, entry, str(path))
+        for cli_id, entry in data.items()
+    }
+
+
+def _load_entry_point(ep) -> dict[str, dict]:
+    """Entry points resolve to a mapping of CLI definitions, or a callable
+    returning one."""
+    try:
+        data = ep.load()
+        if callable(data):
+            data = data()
+    except Exception as e:  # a broken plugin must not take down every command
+        raise RegistryError(f"entry point '{ep.name}' failed to load: {e}") from e
+    if not isinstance(data, dict):
+        raise RegistryError(f"entry point '{ep.name}' must provide a dict")
+    source = f"entry point '{ep.name}'"
+    return {
+        cli_id: validate_entry(cli_id, entry, source) for cli_id, entry in data.items()
+    }
+
+
+def _check_relative(rel: str, where: str) -> None:
+    path = PurePosixPath(rel)
+    if not rel or path.is_absolute() or ".." in path.parts:
+        raise RegistryError(f"{where}: '{rel}' must be a relative path")
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+
+def _fingerprint(files: list[Path | None], extra: list[str]) -> str:
+    h = hashlib.sha256(f"{CACHE_FORMAT}".encode())
+    for path in files:
+        try:
+            st = path.stat() if path else None
+        except FileNotFoundError:
+            st = None
+        stamp = f"{st.st_mtime_ns}:{st.st_size}" if st else "-"
+        h.update(f"|{path}:{stamp}".encode())
+    for item in extra:
+        h.update(f"|{item}".encode())
+    return h.hexdigest()
+
+
+def _distribution(ep) -> str:
+    """`name==version` of the package providing an entry point, so upgrading
+    a plugin invalidates the cached registry."""
+    dist = ep.dist
+    return f"{dist.name}=={dist.version}" if dist is not None else "-"
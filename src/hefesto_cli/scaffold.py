@@ -0,0 +1,216 @@
+"""Bulk skill scaffolding - render many skills from a manifest in one pass."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import planner
+from .asyncfs import IOPool
+from .store import atomic_write
+from .templating import Template, TemplateEngine
+
+SKILL_TEMPLATES = Path(__file__).parent / "skill_template"
+JOURNAL_FILE = "scaffold.journal.json"  # inside .hefesto/
+BATCH_SIZE = 50  # skills applied (atomically) per batch
+RESOURCES = ("scripts", "references", "assets")
+DEFAULT_DESCRIPTION = (
+    "[TODO: Complete and informative explanation of what the skill does and "
+    "when to use it. Include WHEN to use this skill - specific scenarios, file "
+    "types, or tasks that trigger it.]"
+)
+
+_SKILL_NAME = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+
+
+class ScaffoldError(ValueError):
+    """Raised when a scaffold manifest is invalid."""
+
+
+# The skill templates ship with the package and are the only copy:
+# skill-creator's init_skill.py renders skills through render_skill(). They
+# use the templating engine's `{= name =}` fields; the description is a
+# YAML block so it may contain colons. Compiled once at import, nothing to
+# cache on disk.
+_ENGINE = TemplateEngine([SKILL_TEMPLATES])
+
+# Resource directory -> (example file, template, mode)
+EXAMPLES: dict[str, tuple[str, Template, int | None]] = {
+    "scripts": ("example.py", _ENGINE.get("example.py.tmpl"), 0o755),
+    "references": ("api_reference.md", _ENGINE.get("api_reference.md"), None),
+    "assets": ("example_asset.txt", _ENGINE.get("example_asset.txt"), None),
+}
+SKILL = _ENGINE.get("SKILL.md")
+
+
+@dataclass(frozen=True)
+class SkillSpec:
+    """One skill to create, as declared in the manifest."""
+
+    name: str
+    description: str = DEFAULT_DESCRIPTION
+    resources: tuple[str, ...] = RESOURCES
+
+
+def title_case_skill_name(skill_name: str) -> str:
+    """Convert hyphenated skill name to Title Case for display."""
+    return " ".join(word.capitalize() for word in skill_name.split("-"))
+
+
+def load_manifest(path: Path) -> list[SkillSpec]:
+    """Parse a scaffold manifest.
+
+    ```toml
+    [defaults]
+    resources = ["scripts", "references", "assets"]
+
+    [[skill]]
+    name = "my-skill"
+    description = "What it does. Use when: ..."
+    resources = ["references"]   # optional, overrides defaults
+    ```
+    """
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ScaffoldError(f"{path}: {e}") from e
+
+    defaults = data.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise ScaffoldError(f"{path}: [defaults] must be a table")
+    default_resources = defaults.get("resources", list(RESOURCES))
+    entries = data.get("skill", [])
+    if not isinstance(entries, list):
+        raise ScaffoldError(f"{path}: skills must be [[skill]] tables")
+    specs: list[SkillSpec] = []
+    seen: set[str] = set()
+
+    for i, entry in enumerate(entries):
+        where = f"{path}: skill #{i + 1}"
+        if not isinstance(entry, dict):
+            raise ScaffoldError(f"{where}: must be a [[skill]] table")
+        name = entry.get("name")
+        if not isinstance(name, str) or not _SKILL_NAME.match(name):
+            raise ScaffoldError(f"{where}: name must be kebab-case, got {name!r}")
+        if len(name) > 64:
+            raise ScaffoldError(f"{where}: name '{name}' exceeds 64 characters")
+        if name in seen:
+            raise ScaffoldError(f"{where}: duplicate skill '{name}'")
+        seen.add(name)
+
+        resources = entry.get("resources", default_resources)
+        if not isinstance(resources, list) or not all(
+            isinstance(r, str) for r in resources
+        ):
+            raise ScaffoldError(f"{where}: resources must be a list of strings")
+        unknown = set(resources) - set(RESOURCES)
+        if unknown:
+            raise ScaffoldError(
+                f"{where}: unknown resource(s) {', '.join(sorted(unknown))}"
+            )
+        description = entry.get("description", DEFAULT_DESCRIPTION)
+        if not isinstance(description, str) or not description.strip():
+            raise ScaffoldError(f"{where}: description must be a non-empty string")
+
+        specs.append(SkillSpec(name, description.strip(), tuple(resources)))
+
+    if not specs:
+        raise ScaffoldError(f"{path}: no [[skill]] entries")
+    return specs
+
+
+def render_skill(spec: SkillSpec) -> dict[str, tuple[bytes, int | None]]:
+    """Render a skill's files: relative path -> (content, mode)."""
+    skill_title = title_case_skill_name(spec.name)
+    description = "\n".join(
+        f"  {line}" if line else "" for line in spec.description.splitlines()
+    )
+    files = {
+        "SKILL.md": (
+            SKILL.render(
+                skill_name=spec.name,
+                skill_title=skill_title,
+                description=description,
+            ).encode(),
+            None,
+        )
+    }
+    for resource in spec.resources:
+        filename, template, mode = EXAMPLES[resource]
+        content = template.render(skill_name=spec.name, skill_title=skill_title)
+        files[f"{resource}/{filename}"] = (content.encode(), mode)
+    return files
+
+
+@dataclass
+class BatchResult:
+    """Plan for one batch plus the (skill, skills dir) pairs skipped."""
+
+    plan: planner.Plan
+    skipped: list[tuple[str, Path]] = field(default_factory=list)
+
+
+async def plan_batch(
+    specs: list[SkillSpec], skills_dirs: list[Path], pool: IOPool
+) -> BatchResult:
+    """Plan a batch of skills for every target skills directory.
+
+    Each skill is rendered once and fanned out to all targets; skills that
+    already exist in a target are skipped, never overwritten.
+    """
+    pairs = [(spec, skills_dir) for spec in specs for skills_dir in skills_dirs]
+    exists = await pool.exists_many(d / spec.name for spec, d in pairs)
+
+    rendered = {spec.name: render_skill(spec) for spec in specs}
+    files: dict[Path, Path | bytes] = {}
+    modes: dict[Path, int] = {}
+    result = BatchResult(planner.Plan())
+    for (spec, skills_dir), present in zip(pairs, exists):
+        if present:
+            result.skipped.append((spec.name, skills_dir))
+            continue
+        for rel, (content, mode) in rendered[spec.name].items():
+            target = skills_dir / spec.name / rel
+            files[target] = content
+            if mode is not None:
+                modes[target] = mode
+
+    result.plan = await planner.build_plan([], files, pool, modes)
+    return result
+
+
+class Journal:
+    """Records finished skills so an interrupted scaffold can resume."""
+
+    def __init__(self, path: Path, manifest_digest: str):
+        self.path = path
+        self.manifest_digest = manifest_digest
+        self.done: set[str] = set()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        # A journal for a different manifest does not apply
+        if data.get("manifest") == manifest_digest:
+            self.done = set(data.get("done", []))
+
+    @classmethod
+    def for_manifest(cls, hefesto_dir: Path, manifest: Path) -> Journal:
+        digest = hashlib.sha256(manifest.read_bytes()).hexdigest()
+        return cls(hefesto_dir / JOURNAL_FILE, digest)
+
+    def mark(self, names: list[str]) -> None:
+        self.done.update(names)
+        atomic_write(
+            self.path,
+            json.dumps(
+                {"manifest": self.manifest_digest, "done": sorted(self.done)}
+            ).encode(),
+        )
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,156 @@
+"""Storage layer for .hefesto/ - atomic snapshots shared by parallel runs.
+
+Readers never lock: every file is published by writing a temp file in the
+same directory and renaming it over the old one, so a reader sees either
+the previous snapshot or the next one, never a torn write. Writers of the
+same cache serialise on a per-cache lock file; a writer that finds the
+lock taken skips publishing, because the holder is storing an equivalent
+snapshot and caches are best-effort.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+STORE_FORMAT = 1  # version of the snapshot envelope
+CACHE_DIR = "cache"  # inside .hefesto/
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(fh) -> bool:
+        fh.seek(0)
+        try:
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fh) -> None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(fh) -> bool:
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fh) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Publish `data` at `path` in one step (unique temp file, then rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per process and thread; "x" mode honours the umask, unlike
+    # mkstemp's 0600, so caches stay shareable between CI users
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:12]}.tmp")
+    try:
+        with open(tmp, "xb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def try_lock(path: Path) -> Iterator[bool]:
+    """Hold an exclusive lock on `path` if it is free.
+
+    Yields False, without waiting, when another process holds it.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        locked = _lock(fh)
+        try:
+            yield locked
+        finally:
+            if locked:
+                _unlock(fh)
+
+
+class Store:
+    """Versioned JSON snapshots under `.hefesto/cache/`.
+
+    Each snapshot is wrapped in an envelope carrying the store format and
+    the caller's own format version; a mismatch on either reads as a miss,
+    so older and newer Hefesto versions never misread each other's caches.
+    """
+
+    def __init__(self, hefesto_dir: Path):
+        self.hefesto_dir = hefesto_dir
+        self.cache_dir = hefesto_dir / CACHE_DIR
+
+    def load(self, name: str, version: int) -> dict | None:
+        """Current snapshot of a cache, or None if missing or incompatible."""
+        try:
+            envelope = json.loads((self.cache_dir / f"{name}.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(envelope, dict)
+            or envelope.get("store") != STORE_FORMAT
+            or envelope.get("version") != version
+        ):
+            return None
+        return envelope.get("data")
+
+    def publish(
+        self,
+        name: str,
+        version: int,
+        data: dict | None = None,
+        merge: Callable[[dict | None], dict] | None = None,
+    ) -> bool:
+        """Atomically replace a cache snapshot; True if it was written.
+
+        With `merge`, the snapshot is re-read under the lock and passed to
+        `merge` to build the new one, so a run that only saw part of the
+        project does not drop what parallel runs stored. Nothing is written
+        when the project has no `.hefesto/` or another writer holds the
+        lock.
+        """
+        if not self.hefesto_dir.is_dir():
+            return False
+        try:
+            with try_lock(self.cache_dir / f"{name}.lock") as locked:
+                if not locked:
+                    return False
+                if merge is not None:
+                    data = merge(self.load(name, version))
+                envelope = {"store": STORE_FORMAT, "version": version, "data": data}
+                atomic_write(
+                    self.cache_dir / f"{name}.json", json.dumps(envelope).encode()
+                )
+        except OSError:
+            return False  # Cache is best-effort
+        return True
+
+    def drop(self, name: str) -> bool:
+        """Delete a cache snapshot; False if a writer holds it.
+
+        The lock file stays: unlinking it would let a process that already
+        opened it and one that recreates it both "hold" the lock.
+        """
+        try:
+            with try_lock(self.cache_dir / f"{name}.lock") as locked:
+                if not locked:
+                    return False
+                (self.cache_dir / f"{name}.json").unlink(missing_ok=True)
+        except OSError:
+            return False
+        return True
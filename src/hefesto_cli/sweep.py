@@ -0,0 +1,355 @@
+"""Garbage collection - stale commands, empty skill dirs, objects and caches.
+
+Everything is found in one concurrent scan of the CLI folders and
+`.hefesto/`, then removed item by item. Caches are kept under a size budget
+by evicting the least recently used entries first.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import drift, export, footprint, lint, overlap, registry, scaffold
+from .asyncfs import IOPool
+from .packages import LOCKFILE, OBJECTS_DIR, PACKAGE_SUFFIX
+from .registry import CliRegistry
+from .store import CACHE_DIR, Store
+from .upgrade import MANIFEST_FILE
+
+ORPHAN_COMMAND = "command"
+SKILL_DIR = "skill"
+OBJECT = "object"
+CACHE = "cache"
+LEFTOVER = "leftover"
+
+# Snapshot caches this version reads, with their formats
+KNOWN_CACHES = {
+    module.CACHE_NAME: module.CACHE_FORMAT
+    for module in (registry, lint, drift, footprint, overlap)
+}
+TEMPLATE_CACHE = "templates"  # .hefesto/cache/templates/<sha>.json
+DEFAULT_CACHE_BUDGET = 64 * 1024 * 1024
+STALE_AFTER = 3600  # seconds before a temp file or staging dir counts as left over
+
+
+@dataclass(frozen=True)
+class Garbage:
+    """Something `gc` removes, and why."""
+
+    kind: str
+    path: Path
+    size: int
+    reason: str
+    removable: bool = True  # False: reported only, never deleted
+
+
+@dataclass
+class CacheEntry:
+    path: Path
+    size: int
+    last_used: float  # max(atime, mtime): atime alone may be disabled
+
+
+async def scan(
+    project_root: Path,
+    detected_clis: dict[str, Path],
+    clis: CliRegistry,
+    expected_commands: set[str],
+    pool: IOPool,
+    cache_budget: int = DEFAULT_CACHE_BUDGET,
+) -> list[Garbage]:
+    """Find garbage in the project, in removal order.
+
+    Command files count as orphaned when their command is no longer
+    shipped, or when a Markdown copy was replaced by the CLI's native
+    format; skill directories without SKILL.md are listed too (the skill
+    catalog skips them on every scan). A skill directory holding anything
+    besides unmodified scaffold examples is reported but not removable.
+    Besides the detected CLIs, every CLI whose folder is present in the
+    project root is scanned.
+    """
+    hefesto_dir = project_root / ".hefesto"
+    cache_dir = hefesto_dir / CACHE_DIR
+    # A CLI folder left behind after its detection paths went away can
+    # still hold Hefesto commands and skills
+    root_entries = await pool.scandir(project_root)
+    detected_clis = dict(detected_clis)
+    for name, is_dir in root_entries:
+        cli_id = clis.by_folder.get(name) if is_dir else None
+        if cli_id is not None:
+            detected_clis.setdefault(cli_id, project_root / name)
+    cli_ids = list(detected_clis)
+    commands_dirs = [detected_clis[c] / clis[c]["commands_dir"] for c in cli_ids]
+    skills_dirs = [detected_clis[c] / clis[c]["skills_dir"] for c in cli_ids]
+    (
+        commands,
+        skill_entries,
+        objects,
+        cache_files,
+        templates,
+        hefesto_files,
+    ) = await pool.gather(
+        [
+            pool.gather([pool.scandir(d) for d in commands_dirs]),
+            pool.gather([pool.scandir(d) for d in skills_dirs]),
+            pool.scandir(hefesto_dir / OBJECTS_DIR),
+            pool.scandir(cache_dir),
+            pool.scandir(cache_dir / TEMPLATE_CACHE),
+            pool.scandir(hefesto_dir),
+        ]
+    )
+    now = time.time()
+    found: list[Garbage] = []
+
+    # Commands and skill directories
+    orphans: list[tuple[Path, str]] = []
+    for cli_id, directory, entries in zip(cli_ids, commands_dirs, commands):
+        present = {name for name, is_dir in entries if not is_dir}
+        for name in sorted(present):
+            command = lint.command_name(name)
+            if not command:
+                continue
+            # Only the native file and the plain Markdown one earlier
+            # versions wrote are ours; other suffixes (e.g. Copilot's
+            # `.agent.md` in a Markdown CLI) belong to the user
+            native = export.command_file(clis[cli_id], command)
+            fallback = f"{command}.md"
+            if name not in (native, fallback):
+                continue
+            if command not in expected_commands:
+                orphans.append((directory / name, "no longer shipped"))
+            elif name != native and native in present:
+                orphans.append((directory / name, f"replaced by {native}"))
+    candidates = [
+        directory / name
+        for directory, entries in zip(skills_dirs, skill_entries)
+        for name, is_dir in entries
+        if is_dir and not name.startswith(".")
+    ]
+    has_skill_md, orphan_stats = await pool.gather(
+        [
+            pool.exists_many(path / "SKILL.md" for path in candidates),
+            pool.stat_many(path for path, _ in orphans),
+        ]
+    )
+    empty = [path for path, ok in zip(candidates, has_skill_md) if not ok]
+    empty_sizes, generated = await pool.gather(
+        [
+            pool.gather([pool.run(_tree_size, path) for path in empty]),
+            pool.gather([pool.run(generated_only, path) for path in empty]),
+        ]
+    )
+    for (path, reason), st in zip(orphans, orphan_stats):
+        if st is not None:
+            found.append(Garbage(ORPHAN_COMMAND, path, st.st_size, reason))
+    for path, size, ours in zip(empty, empty_sizes, generated):
+        if ours:
+            found.append(Garbage(SKILL_DIR, path, size, "no SKILL.md"))
+        else:
+            reason = "no SKILL.md, has files Hefesto did not generate"
+            found.append(Garbage(SKILL_DIR, path, size, reason, removable=False))
+
+    # Objects neither the upgrade manifest nor a pull refers to
+    referenced = _referenced_objects(hefesto_dir)
+    object_files = [
+        hefesto_dir / OBJECTS_DIR / name
+        for name, is_dir in objects
+        if referenced is not None
+        and not is_dir
+        and not name.startswith(".")
+        and name not in referenced
+    ]
+    for path, st in zip(object_files, await pool.stat_many(object_files)):
+        if st is not None:
+            found.append(Garbage(OBJECT, path, st.st_size, "not referenced"))
+
+    # Caches: snapshots this version cannot use go first, the rest by LRU
+    store = Store(hefesto_dir)
+    names = sorted(
+        name for name, is_dir in cache_files if not is_dir and not name.startswith(".")
+    )
+    snapshots = [n.removesuffix(".json") for n in names if n.endswith(".json")]
+    known = [stem for stem in snapshots if stem in KNOWN_CACHES]
+    loaded = await pool.gather(
+        [pool.run(store.load, stem, KNOWN_CACHES[stem]) for stem in known]
+    )
+    usable = {stem for stem, data in zip(known, loaded) if data is not None}
+    stale: list[tuple[Path, str]] = []
+    for stem in snapshots:
+        if stem not in KNOWN_CACHES:
+            stale.append((cache_dir / f"{stem}.json", "not used by this version"))
+        elif stem not in usable:
+            stale.append((cache_dir / f"{stem}.json", "incompatible or corrupt"))
+    # Locks of caches this version uses stay, even without a snapshot, since
+    # a writer may be about to take them; only other versions' locks go
+    for name in names:
+        stem = name.removesuffix(".lock")
+        if name.endswith(".lock") and stem not in snapshots:
+            if stem not in KNOWN_CACHES:
+                stale.append((cache_dir / name, "lock without cache"))
+    entries = [cache_dir / f"{stem}.json" for stem in sorted(usable)] + [
+        cache_dir / TEMPLATE_CACHE / name
+        for name, is_dir in templates
+        if not is_dir and name.endswith(".json") and not name.startswith(".")
+    ]
+
+    # Temp files of interrupted writes and staging dirs of interrupted installs
+    leftovers = [
+        directory / name
+        for directory, listing in (
+            (hefesto_dir, hefesto_files),
+            (hefesto_dir / OBJECTS_DIR, objects),
+            (cache_dir, cache_files),
+            (cache_dir / TEMPLATE_CACHE, templates),
+        )
+        for name, is_dir in listing
+        if not is_dir and name.startswith(".") and name.endswith(".tmp")
+    ] + [
+        project_root / name
+        for name, is_dir in root_entries
+        if is_dir and name.startswith(".hefesto-stage-")
+    ]
+
+    stale_stats, entry_stats, leftover_stats = await pool.gather(
+        [
+            pool.stat_many(path for path, _ in stale),
+            pool.stat_many(entries),
+            pool.stat_many(leftovers),
+        ]
+    )
+    for (path, reason), st in zip(stale, stale_stats):
+        if st is not None:
+            found.append(Garbage(CACHE, path, st.st_size, reason))
+
+    cached = [
+        CacheEntry(path, st.st_size, max(st.st_atime, st.st_mtime))
+        for path, st in zip(entries, entry_stats)
+        if st is not None
+    ]
+    for entry in evict(cached, cache_budget):
+        found.append(Garbage(CACHE, entry.path, entry.size, "least recently used"))
+
+    old = [
+        path
+        for path, st in zip(leftovers, leftover_stats)
+        if st is not None and now - st.st_mtime > STALE_AFTER
+    ]
+    for path, size in zip(
+        old, await pool.gather([pool.run(_tree_size, p) for p in old])
+    ):
+        found.append(Garbage(LEFTOVER, path, size, "interrupted write"))
+    return found
+
+
+def evict(entries: list[CacheEntry], budget: int) -> list[CacheEntry]:
+    """Entries to drop so the rest fit in `budget` bytes, oldest use first."""
+    kept = 0
+    dropped = []
+    for entry in sorted(entries, key=lambda e: e.last_used, reverse=True):
+        if kept + entry.size <= budget:
+            kept += entry.size
+        else:
+            dropped.append(entry)
+    return dropped
+
+
+def remove(garbage: Garbage, hefesto_dir: Path) -> bool:
+    """Delete one item; False if it is in use or changed since the scan."""
+    path = garbage.path
+    if not garbage.removable:
+        return False
+    try:
+        if garbage.kind == SKILL_DIR:
+            if not generated_only(path):
+                return False  # became a skill or gained files since the scan
+            shutil.rmtree(path)
+        elif (
+            garbage.kind == CACHE
+            and path.parent == hefesto_dir / CACHE_DIR
+            and path.suffix == ".json"
+        ):
+            return Store(hefesto_dir).drop(path.stem)
+        elif path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _referenced_objects(hefesto_dir: Path) -> set[str] | None:
+    """Object names in use, or None if a reference file cannot be read.
+
+    Upgrade base copies are named by the digests in manifest.json and
+    pulled packages by the hashes in packages.json.
+    """
+    referenced: set[str] = set()
+    try:
+        manifest = _read_json(hefesto_dir / MANIFEST_FILE)
+        if manifest is not None:
+            referenced.update(manifest["files"].values())
+        pulled = _read_json(hefesto_dir / LOCKFILE)
+        if pulled is not None:
+            referenced.update(
+                f"{entry['hash']}{PACKAGE_SUFFIX}"
+                for entry in pulled["skills"].values()
+            )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None  # never guess which objects are unused
+    return referenced
+
+
+def _read_json(path: Path) -> object:
+    try:
+        return json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def generated_only(skill_dir: Path) -> bool:
+    """True if a skill directory has no SKILL.md and nothing but unmodified
+    scaffold examples (and editor or interpreter litter)."""
+    spec = scaffold.SkillSpec(
+        skill_dir.name, scaffold.DEFAULT_DESCRIPTION, scaffold.RESOURCES
+    )
+    examples = {
+        rel: content
+        for rel, (content, _) in scaffold.render_skill(spec).items()
+        if rel != "SKILL.md"
+    }
+    for dirpath, dirnames, filenames in os.walk(skill_dir):
+        dirnames[:] = [d for d in dirnames if d not in drift.IGNORED]
+        rel_dir = Path(dirpath).relative_to(skill_dir)
+        for filename in filenames:
+            if filename in drift.IGNORED:
+                continue
+            rel = (rel_dir / filename).as_posix()
+            try:
+                if rel not in examples or (
+                    Path(dirpath, filename).read_bytes() != examples[rel]
+                ):
+                    return False
+            except OSError:
+                return False
+    return True
+
+
+def _tree_size(path: Path) -> int:
+    if not path.is_dir():
+        return path.stat().st_size
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,324 @@
+"""Template engine - parse once, cache the compiled form, render many times.
+
+Syntax (chosen not to collide with `$ARGUMENTS` / `{{args}}` in Markdown):
+
+    {= name =}                          variable
+    {% if cli == "gemini" %}...{% elif not requires_cli %}...{% else %}...{% endif %}
+    {% include "partials/header.md" %}  partial, resolved on the search path
+    {# comment #}
+
+Conditions support `==`, `!=`, `not`, `and`, `or` over context variables and
+quoted strings. A block tag alone on its line consumes the whole line.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from .store import atomic_write
+
+ENGINE_VERSION = 1
+MAX_INCLUDE_DEPTH = 16
+
+_TAG = re.compile(r"\{=\s*(.*?)\s*=\}|\{%\s*(.*?)\s*%\}|\{#.*?#\}", re.S)
+_IDENT = re.compile(r"^[A-Za-z_]\w*$")
+_EXPR_TOKEN = re.compile(r"\"[^\"]*\"|'[^']*'|==|!=|\w+|\S")
+
+
+class TemplateError(ValueError):
+    """Raised for template syntax errors and undefined variables."""
+
+
+# ── Parsing ──────────────────────────────────────────────────────────────────
+#
+# Compiled nodes are plain lists so they can be cached as JSON:
+#   ["text", str] | ["var", name] | ["include", name]
+#   ["if", [[condition, body], ...], else_body]
+# Conditions: ["var", name] | ["eq"|"ne", name, literal] | ["not", c]
+#             | ["and"|"or", c, c]
+
+
+def parse(source: str, name: str = "<string>") -> list:
+    """Parse template source into a compiled node list."""
+    body, _ = _parse_block(_tokenize(source), 0, name, closers=())
+    return body
+
+
+def unrendered(text: str) -> list[str]:
+    """Template tags left in text that should have been rendered."""
+    return [match.group(0) for match in _TAG.finditer(text)]
+
+
+def _tokenize(source: str) -> list[tuple[str, str, int]]:
+    """Split into (kind, value, line) tokens, dropping standalone tag lines."""
+    tokens = []
+    pos = 0
+    for match in _TAG.finditer(source):
+        start, end = match.span()
+        kind = "var" if match.group(1) is not None else "tag"
+        if match.group(1) is None and match.group(2) is None:
+            kind = "comment"
+
+        # A block tag or comment alone on its line takes the line with it
+        if kind != "var":
+            line_start = source.rfind("\n", 0, start) + 1
+            line_end = source.find("\n", end)
+            line_end = len(source) if line_end == -1 else line_end + 1
+            if (
+                line_start >= pos
+                and not source[line_start:start].strip()
+                and not source[end:line_end].strip()
+            ):
+                start, end = line_start, line_end
+
+        if start > pos:
+            tokens.append(("text", source[pos:start], 0))
+        line = source.count("\n", 0, match.start()) + 1
+        if kind != "comment":
+            tokens.append((kind, (match.group(1) or match.group(2)).strip(), line))
+        pos = end
+    if pos < len(source):
+        tokens.append(("text", source[pos:], 0))
+    return tokens
+
+
+def _parse_block(tokens, i, name, closers):
+    """Parse nodes until a tag whose keyword is in `closers`."""
+    body: list = []
+    while i < len(tokens):
+        kind, value, line = tokens[i]
+        where = f"{name}:{line}"
+        if kind == "text":
+            body.append(["text", value])
+        elif kind == "var":
+            if not _IDENT.match(value):
+                raise TemplateError(f"{where}: invalid variable '{value}'")
+            body.append(["var", value])
+        else:
+            keyword, _, rest = value.partition(" ")
+            if keyword in closers:
+                return body, (i, value)
+            if keyword == "if":
+                node, i = _parse_if(tokens, i, name)
+                body.append(node)
+            elif keyword == "include":
+                body.append(["include", _string_literal(rest.strip(), where)])
+            elif keyword in ("elif", "else", "endif"):
+                raise TemplateError(f"{where}: unexpected '{keyword}'")
+            else:
+                raise TemplateError(f"{where}: unknown tag '{keyword}'")
+        i += 1
+    if closers:
+        raise TemplateError(f"{name}: missing '{{% {closers[-1]} %}}'")
+    return body, None
+
+
+def _parse_if(tokens, i, name):
+    branches = []
+    else_body: list = []
+    _, value, line = tokens[i]
+    condition = _parse_condition(value[2:].strip(), f"{name}:{line}")
+    while True:
+        body, (i, closer) = _parse_block(
+            tokens, i + 1, name, closers=("elif", "else", "endif")
+        )
+        branches.append([condition, body])
+        keyword, _, rest = closer.partition(" ")
+        if keyword == "elif":
+            condition = _parse_condition(rest.strip(), f"{name}:{tokens[i][2]}")
+        elif keyword == "else":
+            else_body, (i, closer) = _parse_block(
+                tokens, i + 1, name, closers=("endif",)
+            )
+            return ["if", branches, else_body], i
+        else:
+            return ["if", branches, else_body], i
+
+
+def _parse_condition(expr: str, where: str) -> list:
+    tokens = _EXPR_TOKEN.findall(expr)
+    if not tokens:
+        raise TemplateError(f"{where}: empty condition")
+    node, rest = _parse_or(tokens, where)
+    if rest:
+        raise TemplateError(f"{where}: unexpected '{rest[0]}' in condition")
+    return node
+
+
+def _parse_or(tokens, where):
+    left, tokens = _parse_and(tokens, where)
+    while tokens and tokens[0] == "or":
+        right, tokens = _parse_and(tokens[1:], where)
+        left = ["or", left, right]
+    return left, tokens
+
+
+def _parse_and(tokens, where):
+    left, tokens = _parse_not(tokens, where)
+    while tokens and tokens[0] == "and":
+        right, tokens = _parse_not(tokens[1:], where)
+        left = ["and", left, right]
+    return left, tokens
+
+
+def _parse_not(tokens, where):
+    if tokens and tokens[0] == "not":
+        operand, tokens = _parse_not(tokens[1:], where)
+        return ["not", operand], tokens
+    if not tokens or not _IDENT.match(tokens[0]):
+        raise TemplateError(f"{where}: expected a variable name in condition")
+    name, tokens = tokens[0], tokens[1:]
+    if tokens and tokens[0] in ("==", "!="):
+        if len(tokens) < 2:
+            raise TemplateError(f"{where}: missing value after '{tokens[0]}'")
+        op = "eq" if tokens[0] == "==" else "ne"
+        return [op, name, _string_literal(tokens[1], where)], tokens[2:]
+    return ["var", name], tokens
+
+
+def _string_literal(token: str, where: str) -> str:
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in "\"'":
+        return token[1:-1]
+    raise TemplateError(f"{where}: expected a quoted string, got '{token}'")
+
+
+# ── Rendering ────────────────────────────────────────────────────────────────
+
+
+class Template:
+    """A compiled template bound to the engine that resolves its partials."""
+
+    __slots__ = ("name", "nodes", "engine")
+
+    def __init__(self, name: str, nodes: list, engine: TemplateEngine | None):
+        self.name = name
+        self.nodes = nodes
+        self.engine = engine
+
+    def render(self, context: dict | None = None, **values) -> str:
+        ctx = {**(context or {}), **values}
+        out: list[str] = []
+        self._render(self.nodes, ctx, out, 0)
+        return "".join(out)
+
+    def _render(self, nodes: list, ctx: dict, out: list[str], depth: int) -> None:
+        for node in nodes:
+            kind = node[0]
+            if kind == "text":
+                out.append(node[1])
+            elif kind == "var":
+                try:
+                    out.append(str(ctx[node[1]]))
+                except KeyError:
+                    raise TemplateError(
+                        f"{self.name}: undefined variable '{node[1]}'"
+                    ) from None
+            elif kind == "if":
+                for condition, body in node[1]:
+                    if _evaluate(condition, ctx):
+                        self._render(body, ctx, out, depth)
+                        break
+                else:
+                    self._render(node[2], ctx, out, depth)
+            elif kind == "include":
+                if self.engine is None:
+                    raise TemplateError(f"{self.name}: include needs an engine")
+                if depth >= MAX_INCLUDE_DEPTH:
+                    raise TemplateError(f"{self.name}: includes nested too deeply")
+                partial = self.engine.get(node[1])
+                partial._render(partial.nodes, ctx, out, depth + 1)
+
+
+def _evaluate(condition: list, ctx: dict) -> bool:
+    op = condition[0]
+    if op == "var":
+        return bool(ctx.get(condition[1]))
+    if op == "eq":
+        return str(ctx.get(condition[1])) == condition[2]
+    if op == "ne":
+        return str(ctx.get(condition[1])) != condition[2]
+    if op == "not":
+        return not _evaluate(condition[1], ctx)
+    if op == "and":
+        return _evaluate(condition[1], ctx) and _evaluate(condition[2], ctx)
+    return _evaluate(condition[1], ctx) or _evaluate(condition[2], ctx)
+
+
+# ── Engine ───────────────────────────────────────────────────────────────────
+
+
+class TemplateEngine:
+    """Loads templates from a search path, compiling each source once.
+
+    Compiled forms are memoised in memory and, when `cache_dir` is given,
+    stored on disk keyed by the source hash, so later runs skip parsing.
+    """
+
+    def __init__(self, search_path: list[Path], cache_dir: Path | None = None):
+        self.search_path = search_path
+        self.cache_dir = cache_dir
+        self._by_name: dict[str, Template] = {}
+        self._by_hash: dict[str, list] = {}
+
+    def get(self, name: str) -> Template:
+        """Template for a path relative to the search path (memoised)."""
+        template = self._by_name.get(name)
+        if template is None:
+            for directory in self.search_path:
+                path = directory / name
+                if path.is_file():
+                    source = path.read_text(encoding="utf-8")
+                    break
+            else:
+                raise TemplateError(f"template not found: {name}")
+            template = self.from_string(source, name)
+            self._by_name[name] = template
+        return template
+
+    def from_string(self, source: str, name: str = "<string>") -> Template:
+        """Compile template source (or fetch its cached compiled form)."""
+        digest = hashlib.sha256(
+            f"{ENGINE_VERSION}\0{source}".encode("utf-8")
+        ).hexdigest()
+        nodes = self._by_hash.get(digest)
+        if nodes is None:
+            nodes = self._load_compiled(digest)
+            if nodes is None:
+                nodes = parse(source, name)
+                self._store_compiled(digest, nodes)
+            self._by_hash[digest] = nodes
+        return Template(name, nodes, self)
+
+    def _load_compiled(self, digest: str) -> list | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            return json.loads((self.cache_dir / f"{digest}.json").read_text("utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _store_compiled(self, digest: str, nodes: list) -> None:
+        # Content-addressed: parallel writers publish identical bytes, so an
+        # atomic rename is enough and no lock is taken
+        if self.cache_dir is None:
+            return
+        try:
+            atomic_write(self.cache_dir / f"{digest}.json", json.dumps(nodes).encode())
+        except OSError:
+            pass  # Cache is best-effort
+
+
+def cli_context(cli_id: str, cli: dict) -> dict:
+    """Template variables describing one CLI from the registry."""
+    return {
+        "cli": cli_id,
+        "cli_name": cli["name"],
+        "folder": cli["folder"],
+        "skills_dir": cli["skills_dir"],
+        "commands_dir": cli["commands_dir"],
+        "var_syntax": cli["var_syntax"],
+        "requires_cli": cli["requires_cli"],
+    }
@@ -0,0 +1,201 @@
+"""Version-aware upgrades - manifest of installed files and three-way merge."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from . import planner
+from .asyncfs import IOPool
+
+MANIFEST_FILE = "manifest.json"
+OBJECTS_DIR = "objects"
+MANIFEST_FORMAT = 1
+
+
+def sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def load_manifest(hefesto_dir: Path) -> dict:
+    """Read `.hefesto/manifest.json` (empty manifest if missing/corrupt)."""
+    try:
+        data = json.loads((hefesto_dir / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"format": MANIFEST_FORMAT, "version": None, "files": {}}
+    data.setdefault("files", {})
+    return data
+
+
+def manifest_entries(
+    files: dict[Path, bytes],
+    project_root: Path,
+    hefesto_dir: Path,
+    version: str,
+) -> dict[Path, bytes]:
+    """Manifest plus content-addressed base copies for the installed files.
+
+    The base copies are what upgrades merge against; identical command
+    files installed into many CLIs share one object.
+    """
+    digests = {
+        target.relative_to(project_root).as_posix(): sha256(content)
+        for target, content in files.items()
+    }
+    entries: dict[Path, bytes] = {}
+    for target, content in files.items():
+        entries[hefesto_dir / OBJECTS_DIR / sha256(content)] = content
+    entries[hefesto_dir / MANIFEST_FILE] = dump_manifest(digests, version)
+    return entries
+
+
+def dump_manifest(digests: dict[str, str], version: str) -> bytes:
+    """manifest.json content for project-relative paths and their digests."""
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": version,
+        "files": dict(sorted(digests.items())),
+    }
+    return (json.dumps(manifest, indent=2) + "\n").encode()
+
+
+# ── Three-way merge ──────────────────────────────────────────────────────────
+
+
+def merge3(
+    base: list[str], ours: list[str], theirs: list[str]
+) -> tuple[list[str], bool]:
+    """Line-based three-way merge.
+
+    Regions where only one side changed take that side; regions changed
+    identically on both sides merge cleanly. Returns the merged lines and
+    whether any region conflicted (conflicts are wrapped in markers).
+    """
+    syncs = []
+    ours_blocks = SequenceMatcher(
+        None, base, ours, autojunk=False
+    ).get_matching_blocks()
+    theirs_blocks = SequenceMatcher(
+        None, base, theirs, autojunk=False
+    ).get_matching_blocks()
+
+    i = j = 0
+    while i < len(ours_blocks) and j < len(theirs_blocks):
+        b1, o1, n1 = ours_blocks[i]
+        b2, t1, n2 = theirs_blocks[j]
+        lo, hi = max(b1, b2), min(b1 + n1, b2 + n2)
+        if lo < hi:
+            syncs.append(
+                (lo, hi, o1 + lo - b1, o1 + hi - b1, t1 + lo - b2, t1 + hi - b2)
+            )
+        if b1 + n1 < b2 + n2:
+            i += 1
+        else:
+            j += 1
+    syncs.append((len(base), len(base), len(ours), len(ours), len(theirs), len(theirs)))
+
+    merged: list[str] = []
+    conflict = False
+    base_at = ours_at = theirs_at = 0
+    for base_start, base_end, ours_start, ours_end, theirs_start, theirs_end in syncs:
+        base_chunk = base[base_at:base_start]
+        ours_chunk = ours[ours_at:ours_start]
+        theirs_chunk = theirs[theirs_at:theirs_start]
+
+        if ours_chunk == theirs_chunk or theirs_chunk == base_chunk:
+            merged += ours_chunk
+        elif ours_chunk == base_chunk:
+            merged += theirs_chunk
+        else:
+            conflict = True
+            merged += ["<<<<<<< local\n", *ours_chunk, "=======\n"]
+            merged += [*theirs_chunk, ">>>>>>> upstream\n"]
+
+        merged += base[base_start:base_end]
+        base_at, ours_at, theirs_at = base_end, ours_end, theirs_end
+    return merged, conflict
+
+
+# ── Upgrade planning ─────────────────────────────────────────────────────────
+
+
+@dataclass
+class UpgradeResult:
+    """Upgrade plan plus per-file outcomes for reporting."""
+
+    plan: planner.Plan
+    merged: list[Path] = field(default_factory=list)
+    conflicts: list[Path] = field(default_factory=list)
+
+
+async def plan_upgrade(
+    project_root: Path,
+    hefesto_dir: Path,
+    files: dict[Path, bytes],
+    version: str,
+    pool: IOPool,
+    force: bool = False,
+) -> UpgradeResult:
+    """Plan an upgrade from the installed manifest to the packaged `files`.
+
+    For each file: untouched locally -> replaced by the packaged version;
+    modified locally -> three-way merged against the recorded base; merge
+    conflict or no recorded base -> left alone and reported (overwritten
+    with `force`).
+    """
+    manifest = load_manifest(hefesto_dir)
+    recorded = manifest["files"]
+    targets = list(files)
+
+    current = await pool.gather(pool.run(planner.read_or_none, t) for t in targets)
+    base_digests = [
+        recorded.get(t.relative_to(project_root).as_posix()) for t in targets
+    ]
+    bases = await pool.gather(
+        (
+            pool.run(planner.read_or_none, hefesto_dir / OBJECTS_DIR / digest)
+            if digest
+            else _none()
+        )
+        for digest in base_digests
+    )
+
+    result = UpgradeResult(planner.Plan())
+    resolved: dict[Path, bytes] = {}
+    desired = dict(files)
+    for target, new, old, base in zip(targets, files.values(), current, bases):
+        if old is None or old == new or force or old == base:
+            resolved[target] = new
+            continue
+        if base is None:
+            # Installed before manifests existed, or added by the user:
+            # record no base so the next upgrade reports it again.
+            result.conflicts.append(target)
+            del desired[target]
+            continue
+
+        merged, conflict = merge3(_lines(base), _lines(old), _lines(new))
+        if conflict:
+            # Keep the old base so the next upgrade merges again
+            result.conflicts.append(target)
+            desired[target] = base
+        else:
+            resolved[target] = "".join(merged).encode()
+            result.merged.append(target)
+
+    resolved.update(manifest_entries(desired, project_root, hefesto_dir, version))
+    resolved[hefesto_dir / "version"] = version.encode()
+
+    result.plan = await planner.build_plan([], resolved, pool)
+    return result
+
+
+def _lines(content: bytes) -> list[str]:
+    return content.decode("utf-8", "replace").splitlines(keepends=True)
+
+
+async def _none() -> None:
+    return None
@@ -0,0 +1,231 @@
+"""Skill validation - SKILL.md frontmatter checks without a YAML dependency.
+
+The rules mirror .agents/skills/skill-creator/scripts/quick_validate.py.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+from .asyncfs import IOPool
+
+ALLOWED_PROPERTIES = frozenset(
+    {"name", "description", "license", "allowed-tools", "metadata", "compatibility"}
+)
+MAX_NAME_LENGTH = 64
+MAX_DESCRIPTION_LENGTH = 1024
+MAX_COMPATIBILITY_LENGTH = 500
+
+_FRONTMATTER = re.compile(r"\A---\r?\n(.*?)\r?\n---", re.S)
+_KEY = re.compile(r"^([\w][\w.-]*)\s*:(?:\s+(.*?))?\s*$")
+_KEBAB = re.compile(r"^[a-z0-9-]+$")
+_INT = re.compile(r"^[-+]?\d+$")
+
+
+class FrontmatterError(ValueError):
+    """Raised when SKILL.md frontmatter is missing or malformed."""
+
+
+# ── Frontmatter ──────────────────────────────────────────────────────────────
+
+
+def read_frontmatter(text: str) -> dict:
+    """Parse the frontmatter of a SKILL.md document."""
+    if not text.startswith("---"):
+        raise FrontmatterError("No YAML frontmatter found")
+    match = _FRONTMATTER.match(text)
+    if not match:
+        raise FrontmatterError("Invalid frontmatter format")
+    data = parse_frontmatter(match.group(1))
+    if not isinstance(data, dict):
+        raise FrontmatterError("Frontmatter must be a YAML dictionary")
+    return data
+
+
+def parse_frontmatter(block: str) -> dict:
+    """Parse the YAML subset skills use.
+
+    Supported: `key: value` scalars (plain, quoted, booleans, integers),
+    `|` / `>` block scalars, flow lists, and nested block mappings or
+    `- item` lists. Anything else raises FrontmatterError.
+    """
+    lines = block.splitlines()
+    data: dict = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip() or line.lstrip().startswith("#"):
+            i += 1
+            continue
+        if line[0] in " \t":
+            raise FrontmatterError(f"Invalid YAML in frontmatter: line {i + 1}")
+        match = _KEY.match(line)
+        if not match:
+            raise FrontmatterError(
+                f"Invalid YAML in frontmatter: expected 'key: value' on line {i + 1}"
+            )
+        end = i + 1
+        while end < len(lines) and (not lines[end].strip() or lines[end][0] in " \t"):
+            end += 1
+        # YAML clips a block scalar's final newline only where one follows
+        at_end = end == len(lines) and not block.endswith("\n")
+        try:
+            data[match.group(1)] = _value(match.group(2) or "", lines[i + 1 : end])
+        except FrontmatterError as e:
+            raise FrontmatterError(f"{e} (line {i + 1})") from None
+        if at_end and isinstance(data[match.group(1)], str):
+            data[match.group(1)] = data[match.group(1)].removesuffix("\n")
+        i = end
+    return data
+
+
+def _value(raw: str, block: list[str]) -> object:
+    content = [line for line in block if line.strip()]
+    if raw[:1] in ("|", ">"):
+        return _block_scalar(raw, block)
+    if raw:
+        if content:  # scalar continued on indented lines
+            raw = " ".join([raw, *(line.strip() for line in content)])
+        if raw[:1] not in ("'", '"', "[") and ": " in raw:
+            raise FrontmatterError(
+                "Invalid YAML in frontmatter: mapping values are not allowed in "
+                "plain scalars (quote the value or use a '|' block)"
+            )
+        return _scalar(raw)
+    items = [line for line in content if not line.lstrip().startswith("#")]
+    if not items:
+        return None
+    if all(line.lstrip().startswith("-") for line in items):
+        return [_scalar(line.lstrip()[1:].strip()) for line in items]
+    indent = min(len(line) - len(line.lstrip()) for line in items)
+    return parse_frontmatter("\n".join(line[indent:] for line in block))
+
+
+def _block_scalar(indicator: str, block: list[str]) -> str:
+    content = [line for line in block if line.strip()]
+    indent = min((len(line) - len(line.lstrip()) for line in content), default=0)
+    lines = [line[indent:] for line in block]
+    while lines and not lines[-1].strip():
+        lines.pop()
+
+    if indicator.startswith("|"):
+        text = "\n".join(lines)
+    else:  # folded: single newlines become spaces, blank lines stay breaks
+        text = ""
+        for line in lines:
+            if not line.strip():
+                text += "\n"
+            elif text and not text.endswith("\n"):
+                text += " " + line
+            else:
+                text += line
+    return text if "-" in indicator else text + "\n"
+
+
+def _scalar(raw: str) -> object:
+    if raw[:1] == '"':
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return raw.strip('"')
+    if raw[:1] == "'":
+        return raw[1:-1].replace("''", "'") if raw.endswith("'") else raw[1:]
+    if raw[:1] == "[" and raw.endswith("]"):
+        return [_scalar(item.strip()) for item in raw[1:-1].split(",") if item.strip()]
+
+    raw = re.sub(r"\s+#.*$", "", raw)
+    lowered = raw.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("", "~", "null"):
+        return None
+    if _INT.match(raw):
+        return int(raw)
+    return raw
+
+
+# ── Rules ────────────────────────────────────────────────────────────────────
+
+
+def validate_frontmatter(frontmatter: dict) -> list[str]:
+    """Check parsed frontmatter; returns every problem found."""
+    issues = []
+    unexpected = set(frontmatter) - ALLOWED_PROPERTIES
+    if unexpected:
+        issues.append(
+            f"Unexpected key(s) in SKILL.md frontmatter: "
+            f"{', '.join(sorted(unexpected))}. "
+            f"Allowed properties are: {', '.join(sorted(ALLOWED_PROPERTIES))}"
+        )
+
+    for key in ("name", "description"):
+        if key not in frontmatter:
+            issues.append(f"Missing '{key}' in frontmatter")
+
+    name = frontmatter.get("name", "")
+    if not isinstance(name, str):
+        issues.append(f"Name must be a string, got {type(name).__name__}")
+    elif name := name.strip():
+        if not _KEBAB.match(name):
+            issues.append(
+                f"Name '{name}' should be kebab-case "
+                "(lowercase letters, digits, and hyphens only)"
+            )
+        elif name.startswith("-") or name.endswith("-") or "--" in name:
+            issues.append(
+                f"Name '{name}' cannot start/end with hyphen "
+                "or contain consecutive hyphens"
+            )
+        if len(name) > MAX_NAME_LENGTH:
+            issues.append(
+                f"Name is too long ({len(name)} characters). "
+                f"Maximum is {MAX_NAME_LENGTH} characters."
+            )
+
+    description = frontmatter.get("description", "")
+    if not isinstance(description, str):
+        issues.append(f"Description must be a string, got {type(description).__name__}")
+    elif description := description.strip():
+        if "<" in description or ">" in description:
+            issues.append("Description cannot contain angle brackets (< or >)")
+        if len(description) > MAX_DESCRIPTION_LENGTH:
+            issues.append(
+                f"Description is too long ({len(description)} characters). "
+                f"Maximum is {MAX_DESCRIPTION_LENGTH} characters."
+            )
+
+    compatibility = frontmatter.get("compatibility", "")
+    if compatibility:
+        if not isinstance(compatibility, str):
+            issues.append(
+                f"Compatibility must be a string, got {type(compatibility).__name__}"
+            )
+        elif len(compatibility) > MAX_COMPATIBILITY_LENGTH:
+            issues.append(
+                f"Compatibility is too long ({len(compatibility)} characters). "
+                f"Maximum is {MAX_COMPATIBILITY_LENGTH} characters."
+            )
+    return issues
+
+
+def validate_skill(skill_path: Path) -> list[str]:
+    """Validate one skill directory; an empty list means it is valid."""
+    try:
+        text = (skill_path / "SKILL.md").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ["SKILL.md not found"]
+    except UnicodeDecodeError as e:
+        return [f"SKILL.md is not valid UTF-8: {e.reason} at byte {e.start}"]
+    except OSError as e:
+        return [f"SKILL.md could not be read: {e.strerror or e}"]
+    try:
+        return validate_frontmatter(read_frontmatter(text))
+    except FrontmatterError as e:
+        return [str(e)]
+
+
+async def validate_many(paths: list[Path], pool: IOPool) -> list[list[str]]:
+    """Validate many skill directories concurrently, preserving order."""
+    return await pool.gather(pool.run(validate_skill, path) for path in paths)
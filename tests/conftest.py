@@ -0,0 +1,21 @@
+"""Shared fixtures for the Hefesto CLI tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hefesto_cli.asyncfs import IOPool
+
+
+@pytest.fixture
+def pool() -> IOPool:
+    return IOPool()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """An empty project root (a git repo, so the root is not searched for)."""
+    (tmp_path / ".git").mkdir()
+    return tmp_path
@@ -0,0 +1,58 @@
+"""Command export formats."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hefesto_cli import asyncfs, export
+from hefesto_cli.registry import builtin_registry
+from hefesto_cli.templating import TemplateEngine
+
+SOURCE = "---\ndescription: List skills\n---\n\n# /hefesto.list\n\nBody\n"
+
+
+def _export(tmp_path: Path, cli_id: str, pool) -> dict[Path, bytes]:
+    source = tmp_path / "hefesto.list.md"
+    source.write_text(SOURCE, encoding="utf-8")
+    templates = {source.name: TemplateEngine([tmp_path]).get(source.name)}
+    clis = builtin_registry()
+    folder = tmp_path / clis[cli_id]["folder"]
+    return asyncfs.run(export.export_commands(templates, {cli_id: folder}, clis, pool))
+
+
+def test_copilot_writes_agent_and_prompt(tmp_path: Path, pool):
+    files = _export(tmp_path, "copilot", pool)
+    agent = tmp_path / ".github" / "agents" / "hefesto.list.agent.md"
+    prompt = tmp_path / ".github" / "prompts" / "hefesto.list.prompt.md"
+
+    assert set(files) == {agent, prompt}
+    assert files[agent].decode() == SOURCE
+    text = files[prompt].decode()
+    assert text.startswith("---\nagent: hefesto.list\n---\n")
+    assert "`.github/agents/hefesto.list.agent.md`" in text
+
+
+def test_markdown_has_no_companions(tmp_path: Path, pool):
+    files = _export(tmp_path, "claude", pool)
+    assert list(files) == [tmp_path / ".claude" / "commands" / "hefesto.list.md"]
+
+
+class _BrokenEntryPoint:
+    name = "broken"
+
+    def load(self):
+        raise ImportError("no module named 'broken_plugin'")
+
+
+def test_broken_emitter_entry_point_warns(monkeypatch):
+    monkeypatch.setattr(export, "entry_points", lambda **kwargs: [_BrokenEntryPoint()])
+    export.emitter.cache_clear()
+    try:
+        with pytest.warns(RuntimeWarning, match="failed to load"):
+            with pytest.raises(export.ExportError, match="broken_plugin"):
+                export.emitter("broken")
+        assert export.emitter("markdown").extension == ".md"
+    finally:
+        export.emitter.cache_clear()
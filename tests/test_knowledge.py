@@ -0,0 +1,45 @@
+"""`hefesto knowledge` commands."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from hefesto_cli import app
+
+runner = CliRunner()
+
+
+def _corpus(tmp_path: Path) -> Path:
+    corpus = tmp_path / "knowledge"
+    corpus.mkdir()
+    (corpus / "naming.md").write_text(
+        "# Naming [rules]\n\nSkill names are kebab-case descriptions.\n",
+        encoding="utf-8",
+    )
+    return corpus
+
+
+def test_query_without_match_escapes_markup(tmp_path: Path):
+    corpus = _corpus(tmp_path)
+    result = runner.invoke(app, ["knowledge", "query", "zzzqqq [/x]", "--dir", corpus])
+    assert result.exit_code == 1
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+    assert "zzzqqq [/x]" in result.output
+
+
+def test_query_list_escapes_headings(tmp_path: Path):
+    corpus = _corpus(tmp_path)
+    result = runner.invoke(
+        app, ["knowledge", "query", "kebab names", "--dir", corpus, "--list"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "[rules]" in result.output
+
+
+def test_missing_directory_escapes_path(tmp_path: Path):
+    missing = tmp_path / "[red]gone"
+    result = runner.invoke(app, ["knowledge", "query", "x", "--dir", missing])
+    assert result.exit_code == 1
+    assert "[red]gone" in result.output
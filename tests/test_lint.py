@@ -0,0 +1,26 @@
+"""Command linting across detected CLIs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from hefesto_cli import asyncfs
+from hefesto_cli.lint import lint_clis
+from hefesto_cli.registry import builtin_registry
+
+
+def test_unreadable_command_is_reported(project: Path, pool):
+    clis = builtin_registry()
+    commands = project / ".claude" / "commands"
+    commands.mkdir(parents=True)
+    # A directory matches the glob but cannot be read as a file.
+    (commands / "hefesto.create.md").mkdir()
+
+    health = asyncfs.run(
+        lint_clis(
+            project, {"claude": project / ".claude"}, clis, ["hefesto.create"], pool
+        )
+    )
+
+    issues = health["claude"].issues
+    assert any("hefesto.create.md: could not be read" in i for i in issues), issues
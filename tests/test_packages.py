@@ -0,0 +1,102 @@
+"""Skill packages and pull planning."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hefesto_cli import asyncfs, packages, planner
+
+SKILL_MD = """---
+name: demo-skill
+description: Demo skill used to test pulling packages from a registry.
+---
+
+# Demo
+"""
+
+
+@pytest.fixture
+def registry(tmp_path: Path) -> packages.Registry:
+    source = tmp_path / "src" / "demo-skill"
+    (source / "scripts").mkdir(parents=True)
+    (source / "SKILL.md").write_text(SKILL_MD, encoding="utf-8")
+    (source / "scripts" / "run.py").write_text("print('v1')\n", encoding="utf-8")
+    registry = packages.Registry(str(tmp_path / "registry"))
+    data = packages.build_package(source)
+    registry.publish([(packages.make_release(data), data)])
+    return registry
+
+
+def _pull(project: Path, registry, pool, **kwargs) -> packages.PullResult:
+    release = registry.catalog().resolve("demo-skill")
+    skills = project / ".claude" / "skills"
+    result = asyncfs.run(
+        packages.plan_pull(
+            [release], [skills], registry, project / ".hefesto", pool, **kwargs
+        )
+    )
+    if not kwargs.get("dry_run"):
+        asyncfs.run(planner.apply_plan(result.plan, project, pool))
+        packages.record_pull(project / ".hefesto", [release], "test")
+    return result
+
+
+def test_dry_run_does_not_cache_packages(project: Path, registry, pool):
+    (project / ".hefesto").mkdir()
+
+    result = _pull(project, registry, pool, dry_run=True)
+
+    assert result.fetched
+    assert not (project / ".hefesto" / packages.OBJECTS_DIR).exists()
+    assert not (project / ".claude").exists()
+
+
+def test_local_edits_are_kept_unless_forced(project: Path, registry, pool):
+    (project / ".hefesto").mkdir()
+    _pull(project, registry, pool)
+    script = project / ".claude" / "skills" / "demo-skill" / "scripts" / "run.py"
+    skill_md = script.parent.parent / "SKILL.md"
+    script.write_text("print('mine')\n", encoding="utf-8")
+    skill_md.unlink()
+
+    result = _pull(project, registry, pool)
+
+    assert result.modified == [script]
+    assert script.read_text(encoding="utf-8") == "print('mine')\n"
+    assert skill_md.read_text(encoding="utf-8") == SKILL_MD  # missing: restored
+
+    result = _pull(project, registry, pool, force=True)
+
+    assert result.modified == []
+    assert script.read_text(encoding="utf-8") == "print('v1')\n"
+
+
+def test_untouched_files_follow_new_releases(project: Path, registry, pool):
+    (project / ".hefesto").mkdir()
+    _pull(project, registry, pool)
+    installed = project / ".claude" / "skills" / "demo-skill" / "scripts" / "run.py"
+
+    source = project / "src" / "demo-skill"  # the registry fixture's source
+    (source / "scripts" / "run.py").write_text("print('v2')\n", encoding="utf-8")
+    data = packages.build_package(source)
+    registry.publish([(packages.make_release(data, "2.0.0"), data)])
+
+    result = _pull(project, registry, pool)
+
+    assert result.modified == []
+    assert installed.read_text(encoding="utf-8") == "print('v2')\n"
+
+
+def test_unrecorded_differing_files_are_kept(project: Path, registry, pool):
+    skill = project / ".claude" / "skills" / "demo-skill"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("# someone else's skill\n", encoding="utf-8")
+
+    result = _pull(project, registry, pool, dry_run=True)
+
+    assert result.modified == [skill / "SKILL.md"]
+    assert [op.target for op in result.plan.operations] == [
+        skill / "scripts" / "run.py"
+    ]
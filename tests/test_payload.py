@@ -0,0 +1,52 @@
+"""Installer payload packing and installation."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+import hefesto_cli
+from hefesto_cli import app, payload
+
+runner = CliRunner()
+
+
+def test_shipped_payload_has_copilot_prompts():
+    index = payload.read_index(hefesto_cli.get_installer_dir() / payload.ARCHIVE_NAME)
+    agents = {m for m in index.files if m.startswith("clis/copilot/agents/")}
+    prompts = {m for m in index.files if m.startswith("clis/copilot/prompts/")}
+    assert agents and all(m.endswith(".agent.md") for m in agents)
+    assert {m.replace("/agents/", "/prompts/") for m in agents} == {
+        m.replace(".prompt.md", ".agent.md") for m in prompts
+    }
+
+
+def test_check_rejects_archive_without_companions(tmp_path: Path):
+    archive = tmp_path / payload.ARCHIVE_NAME
+    members, configs = hefesto_cli.asyncfs.run(
+        hefesto_cli._payload_files_async(
+            hefesto_cli.get_templates_dir(),
+            hefesto_cli.builtin_registry(),
+            hefesto_cli.IOPool(),
+        )
+    )
+    kept = {m: data for m, data in members.items() if "/prompts/" not in m}
+    payload.pack(kept, configs, archive, hefesto_cli.__version__)
+
+    result = runner.invoke(app, ["pack-payload", "--check", "--output", archive])
+
+    assert result.exit_code == 1
+    assert "lacks companion files" in result.output
+    assert "clis/copilot/prompts/hefesto.create.prompt.md" in result.output
+
+
+def test_install_builds_payload_when_none_is_shipped(project: Path, monkeypatch):
+    monkeypatch.setattr(hefesto_cli, "get_payload_archive", lambda: None)
+    (project / ".claude").mkdir()
+
+    result = runner.invoke(app, ["install-payload", str(project), "--ai", "claude"])
+
+    assert result.exit_code == 0, result.output
+    assert (project / ".claude" / "commands" / "hefesto.create.md").is_file()
+    assert (project / ".hefesto" / "version").read_text() == hefesto_cli.__version__
@@ -0,0 +1,57 @@
+"""Install planning and transactional apply."""
+
+from __future__ import annotations
+
+import stat
+from pathlib import Path
+
+from hefesto_cli import asyncfs, planner
+
+
+def _mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def _apply(root: Path, files: dict, pool, modes=None) -> planner.Plan:
+    plan = asyncfs.run(planner.build_plan([], files, pool, modes))
+    asyncfs.run(planner.apply_plan(plan, root, pool))
+    return plan
+
+
+def test_create_sets_requested_mode(tmp_path: Path, pool):
+    script = tmp_path / "run.sh"
+    _apply(tmp_path, {script: b"#!/bin/sh\n"}, pool, {script: 0o755})
+    assert _mode(script) == 0o755
+
+
+def test_update_applies_requested_mode(tmp_path: Path, pool):
+    script = tmp_path / "run.sh"
+    script.write_bytes(b"old\n")
+    script.chmod(0o644)
+
+    plan = _apply(tmp_path, {script: b"new\n"}, pool, {script: 0o755})
+
+    assert [op.kind for op in plan.operations] == [planner.UPDATE]
+    assert script.read_bytes() == b"new\n"
+    assert _mode(script) == 0o755
+
+
+def test_update_without_mode_keeps_exec_bit(tmp_path: Path, pool):
+    script = tmp_path / "run.sh"
+    script.write_bytes(b"old\n")
+    script.chmod(0o750)
+
+    _apply(tmp_path, {script: b"new\n"}, pool)
+
+    assert script.read_bytes() == b"new\n"
+    assert _mode(script) == 0o750
+
+
+def test_unchanged_file_is_not_rewritten(tmp_path: Path, pool):
+    target = tmp_path / "same.md"
+    target.write_bytes(b"same\n")
+
+    plan = asyncfs.run(planner.build_plan([], {target: b"same\n"}, pool))
+
+    assert plan.is_empty
+    assert plan.unchanged == [target]
@@ -0,0 +1,49 @@
+"""CLI registry lookups."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from hefesto_cli import asyncfs, detect_clis_async
+from hefesto_cli.registry import builtin_registry, compile_registry, validate_entry
+
+
+def _entry(cli_id: str, folder: str, **extra) -> dict:
+    entry = {
+        "name": cli_id,
+        "folder": folder,
+        "skills_dir": "skills",
+        "commands_dir": "commands",
+        "var_syntax": "$ARGUMENTS",
+        "requires_cli": False,
+        **extra,
+    }
+    return validate_entry(cli_id, entry, "test")
+
+
+def test_cli_for_path_uses_longest_folder():
+    clis = compile_registry(
+        {"outer": _entry("outer", ".tools"), "inner": _entry("inner", ".tools/ai")}
+    )
+    assert clis.cli_for_path(".tools/ai/commands/x.md") == "inner"
+    assert clis.cli_for_path(".tools/other.md") == "outer"
+    assert clis.cli_for_path("src/main.py") is None
+
+
+def test_only_custom_detection_is_probed():
+    clis = builtin_registry()
+    probed = dict(clis.probes)
+    assert "claude" not in probed
+    assert probed["copilot"] == (".github/copilot-instructions.md", ".github/agents")
+    assert clis.by_folder[".claude"] == "claude"
+
+
+def test_detect_by_folder_and_probe(project: Path, pool):
+    (project / ".claude").mkdir()
+    (project / ".github").mkdir()  # not enough for Copilot
+    detected = asyncfs.run(detect_clis_async(project, pool))
+    assert detected == {"claude": project / ".claude"}
+
+    (project / ".github" / "copilot-instructions.md").write_text("x")
+    detected = asyncfs.run(detect_clis_async(project, pool))
+    assert set(detected) == {"copilot", "claude"}
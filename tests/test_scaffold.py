@@ -0,0 +1,47 @@
+"""Skill scaffolding templates."""
+
+from __future__ import annotations
+
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+from hefesto_cli import scaffold
+
+INIT_SKILL = (
+    Path(__file__).parent.parent
+    / ".agents"
+    / "skills"
+    / "skill-creator"
+    / "scripts"
+    / "init_skill.py"
+)
+
+
+def test_init_skill_renders_the_scaffold_templates(tmp_path: Path):
+    subprocess.run(
+        [sys.executable, INIT_SKILL, "demo-skill", "--path", tmp_path],
+        check=True,
+        capture_output=True,
+    )
+    skill_dir = tmp_path / "demo-skill"
+
+    expected = scaffold.render_skill(scaffold.SkillSpec("demo-skill"))
+    written = {
+        path.relative_to(skill_dir).as_posix(): path
+        for path in skill_dir.rglob("*")
+        if path.is_file()
+    }
+    assert set(written) == set(expected)
+    for rel, (content, mode) in expected.items():
+        assert written[rel].read_bytes() == content
+        if mode is not None:
+            assert stat.S_IMODE(written[rel].stat().st_mode) == mode
+
+
+def test_description_is_a_yaml_block():
+    spec = scaffold.SkillSpec("demo-skill", "Does things: well.\nTwo lines.")
+    skill_md = scaffold.render_skill(spec)["SKILL.md"][0].decode()
+    assert "description: |\n  Does things: well.\n  Two lines.\n---" in skill_md
+    assert "# Demo Skill" in skill_md
@@ -0,0 +1,59 @@
+"""Garbage collection scan."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from hefesto_cli import asyncfs, sweep
+from hefesto_cli.registry import builtin_registry
+
+EXPECTED = {"hefesto.create", "hefesto.list"}
+
+
+def _scan(project: Path, detected: dict[str, Path], pool) -> dict[str, str]:
+    found = asyncfs.run(
+        sweep.scan(project, detected, builtin_registry(), EXPECTED, pool)
+    )
+    return {
+        garbage.path.relative_to(project).as_posix(): garbage.reason
+        for garbage in found
+        if garbage.kind == sweep.ORPHAN_COMMAND
+    }
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x\n", encoding="utf-8")
+
+
+def test_copilot_dual_files_are_not_flagged(project: Path, pool):
+    github = project / ".github"
+    _touch(github / "agents" / "hefesto.create.agent.md")
+    _touch(github / "prompts" / "hefesto.create.prompt.md")
+
+    assert _scan(project, {"copilot": github}, pool) == {}
+
+
+def test_markdown_fallback_replaced_by_native(project: Path, pool):
+    github = project / ".github"
+    _touch(github / "agents" / "hefesto.create.agent.md")
+    _touch(github / "agents" / "hefesto.create.md")
+    gemini = project / ".gemini"
+    _touch(gemini / "commands" / "hefesto.list.toml")
+    _touch(gemini / "commands" / "hefesto.list.md")
+
+    assert _scan(project, {"copilot": github, "gemini": gemini}, pool) == {
+        ".github/agents/hefesto.create.md": "replaced by hefesto.create.agent.md",
+        ".gemini/commands/hefesto.list.md": "replaced by hefesto.list.toml",
+    }
+
+
+def test_markdown_cli_keeps_foreign_suffixes(project: Path, pool):
+    claude = project / ".claude"
+    _touch(claude / "commands" / "hefesto.create.md")
+    _touch(claude / "commands" / "hefesto.create.agent.md")
+    _touch(claude / "commands" / "hefesto.removed.md")
+
+    assert _scan(project, {"claude": claude}, pool) == {
+        ".claude/commands/hefesto.removed.md": "no longer shipped",
+    }